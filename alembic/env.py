@@ -20,6 +20,11 @@ from app.models import (  # noqa: F401
     po,
     emailmsg,
     invoice,
+    rollup,
+    watermark,
+    archive,
+    outbox,
+    webhook,
 )
 
 config = context.config
@@ -0,0 +1,68 @@
+"""batched myDATA submissions
+
+Revision ID: 0000a
+Revises:
+Create Date: 2026-10-19 08:00:00.000000
+
+One submission row per invoice from now on. Where retries left several
+rows for the same invoice, only the newest is kept before the unique index
+is built.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0000a"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("mydata_submissions", sa.Column("batch_id", sa.String(36)))
+    op.add_column("mydata_submissions", sa.Column("submission_uid", sa.String(80)))
+    op.add_column(
+        "mydata_submissions",
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default=sa.text("0")),
+    )
+    op.create_index("ix_mydata_submissions_batch_id", "mydata_submissions", ["batch_id"])
+    op.create_index(
+        "ix_mydata_submissions_submission_uid", "mydata_submissions", ["submission_uid"]
+    )
+    op.create_index("ix_mydata_submissions_status", "mydata_submissions", ["status"])
+
+    op.execute(
+        """
+        DELETE FROM mydata_submissions
+        WHERE EXISTS (
+            SELECT 1 FROM mydata_submissions AS newer
+            WHERE newer.invoice_id = mydata_submissions.invoice_id
+              AND (newer.created_at > mydata_submissions.created_at
+                   OR (newer.created_at = mydata_submissions.created_at
+                       AND newer.id > mydata_submissions.id))
+        )
+        """
+    )
+    op.drop_index("ix_mydata_submissions_invoice_id", table_name="mydata_submissions")
+    op.create_index(
+        "ix_mydata_submissions_invoice_id", "mydata_submissions", ["invoice_id"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_mydata_submissions_invoice_id", table_name="mydata_submissions")
+    op.create_index(
+        "ix_mydata_submissions_invoice_id", "mydata_submissions", ["invoice_id"]
+    )
+    op.drop_index("ix_mydata_submissions_status", table_name="mydata_submissions")
+    op.drop_index("ix_mydata_submissions_submission_uid", table_name="mydata_submissions")
+    op.drop_index("ix_mydata_submissions_batch_id", table_name="mydata_submissions")
+    with op.batch_alter_table("mydata_submissions") as batch:
+        batch.drop_column("attempts")
+        batch.drop_column("submission_uid")
+        batch.drop_column("batch_id")
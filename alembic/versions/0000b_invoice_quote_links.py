@@ -0,0 +1,92 @@
+"""quote line items and invoice net/VAT split
+
+Revision ID: 0000b
+Revises: 0000a
+Create Date: 2026-10-19 08:30:00.000000
+
+Existing invoices get net_total / vat_total recomputed from their lines,
+and total set to their sum.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0000b"
+down_revision: Union[str, None] = "0000a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _backfill() -> None:
+    inv = sa.table(
+        "invoices",
+        sa.column("id"),
+        sa.column("net_total"),
+        sa.column("vat_total"),
+        sa.column("total"),
+    )
+    line = sa.table(
+        "invoice_lines",
+        sa.column("invoice_id"),
+        sa.column("qty"),
+        sa.column("unit_price"),
+        sa.column("vat_rate"),
+    )
+    net = line.c.qty * line.c.unit_price
+    vat = net * sa.func.coalesce(line.c.vat_rate, 0) / 100
+    net_sum = (
+        sa.select(sa.func.coalesce(sa.func.sum(net), 0))
+        .where(line.c.invoice_id == inv.c.id)
+        .scalar_subquery()
+    )
+    vat_sum = (
+        sa.select(sa.func.coalesce(sa.func.sum(vat), 0))
+        .where(line.c.invoice_id == inv.c.id)
+        .scalar_subquery()
+    )
+    op.get_bind().execute(
+        sa.update(inv).values(net_total=net_sum, vat_total=vat_sum, total=net_sum + vat_sum)
+    )
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("quote_lines") as batch:
+        batch.add_column(
+            sa.Column(
+                "item_id", sa.String(36),
+                sa.ForeignKey("items.id", name="fk_quote_lines_item_id"),
+            )
+        )
+        batch.create_index("ix_quote_lines_item_id", ["item_id"])
+    with op.batch_alter_table("invoices") as batch:
+        batch.add_column(
+            sa.Column(
+                "quote_id", sa.String(36),
+                sa.ForeignKey("quotes.id", name="fk_invoices_quote_id"),
+            )
+        )
+        for col in ("net_total", "vat_total"):
+            batch.add_column(
+                sa.Column(
+                    col, sa.Numeric(14, 4), nullable=False, server_default=sa.text("0")
+                )
+            )
+        batch.create_index("ix_invoices_quote_id", ["quote_id"])
+    _backfill()
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("invoices") as batch:
+        batch.drop_index("ix_invoices_quote_id")
+        batch.drop_constraint("fk_invoices_quote_id", type_="foreignkey")
+        batch.drop_column("vat_total")
+        batch.drop_column("net_total")
+        batch.drop_column("quote_id")
+    with op.batch_alter_table("quote_lines") as batch:
+        batch.drop_index("ix_quote_lines_item_id")
+        batch.drop_constraint("fk_quote_lines_item_id", type_="foreignkey")
+        batch.drop_column("item_id")
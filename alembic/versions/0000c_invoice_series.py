@@ -0,0 +1,103 @@
+"""per-tenant invoice number counters
+
+Revision ID: 0000c
+Revises: 0000b
+Create Date: 2026-10-19 08:45:00.000000
+
+Invoice numbers used to be COUNT(*) + 1, so concurrent conversions or
+deletes could issue a number twice. Any duplicates are renamed (the later
+invoices get a ``/2``, ``/3`` ... suffix) before (tenant_id,
+invoice_number) is made unique. Counters are seeded from the highest
+number already issued in each ``<series>-<n>`` series.
+
+"""
+from collections import defaultdict
+from typing import Sequence, Union
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0000c"
+down_revision: Union[str, None] = "0000b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+invoices = sa.table(
+    "invoices",
+    sa.column("id"),
+    sa.column("tenant_id"),
+    sa.column("invoice_number"),
+    sa.column("created_at"),
+)
+
+
+def _dedupe(bind) -> None:
+    seen: dict[tuple[str, str], int] = defaultdict(int)
+    rows = bind.execute(
+        sa.select(invoices.c.id, invoices.c.tenant_id, invoices.c.invoice_number)
+        .order_by(invoices.c.created_at, invoices.c.id)
+    )
+    renames = []
+    for inv_id, tenant_id, number in rows:
+        seen[(tenant_id, number)] += 1
+        if seen[(tenant_id, number)] > 1:
+            renames.append({"b_id": inv_id, "b_number": f"{number}/{seen[(tenant_id, number)]}"})
+    if renames:
+        bind.execute(
+            sa.update(invoices)
+            .where(invoices.c.id == sa.bindparam("b_id"))
+            .values(invoice_number=sa.bindparam("b_number")),
+            renames,
+        )
+
+
+def _seed(bind) -> None:
+    last: dict[tuple[str, str], int] = {}
+    for tenant_id, number in bind.execute(
+        sa.select(invoices.c.tenant_id, invoices.c.invoice_number)
+    ):
+        series, _, n = number.rpartition("-")
+        if series and n.isdigit():
+            key = (tenant_id, series)
+            last[key] = max(last.get(key, 0), int(n))
+    if last:
+        op.bulk_insert(
+            sa.table(
+                "invoice_series",
+                sa.column("id"),
+                sa.column("tenant_id"),
+                sa.column("series"),
+                sa.column("last_number"),
+            ),
+            [
+                {"id": str(uuid.uuid4()), "tenant_id": t, "series": s, "last_number": n}
+                for (t, s), n in last.items()
+            ],
+        )
+
+
+def upgrade() -> None:
+    op.create_table(
+        "invoice_series",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("tenant_id", sa.String(36), sa.ForeignKey("tenants.id"), nullable=False),
+        sa.Column("series", sa.String(20), nullable=False),
+        sa.Column("last_number", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.UniqueConstraint("tenant_id", "series", name="uq_invoice_series_tenant_series"),
+    )
+    bind = op.get_bind()
+    _dedupe(bind)
+    _seed(bind)
+    with op.batch_alter_table("invoices") as batch:
+        batch.create_unique_constraint(
+            "uq_invoices_tenant_number", ["tenant_id", "invoice_number"]
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("invoices") as batch:
+        batch.drop_constraint("uq_invoices_tenant_number", type_="unique")
+    op.drop_table("invoice_series")
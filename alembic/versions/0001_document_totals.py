@@ -0,0 +1,103 @@
+"""document totals on quotes and purchase orders
+
+Revision ID: 0001
+Revises: 0000c
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = "0000c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_CHUNK = 1000
+
+# (header table, line table, line FK column)
+DOCS = [
+    ("quotes", "quote_lines", "quote_id"),
+    ("purchase_orders", "purchase_order_lines", "po_id"),
+]
+
+
+def _backfill(doc: str, lines: str, fk: str) -> None:
+    """Recompute totals of existing documents, BACKFILL_CHUNK ids per UPDATE."""
+    bind = op.get_bind()
+    doc_t = sa.table(
+        doc,
+        sa.column("id"),
+        sa.column("subtotal"),
+        sa.column("vat_total"),
+        sa.column("grand_total"),
+    )
+    line_t = sa.table(
+        lines,
+        sa.column(fk),
+        sa.column("qty"),
+        sa.column("unit_price"),
+        sa.column("vat_rate"),
+    )
+    net = line_t.c.qty * line_t.c.unit_price
+    vat = net * sa.func.coalesce(line_t.c.vat_rate, 0) / 100
+    sub = (
+        sa.select(sa.func.coalesce(sa.func.sum(net), 0))
+        .where(line_t.c[fk] == doc_t.c.id)
+        .scalar_subquery()
+    )
+    vat_sum = (
+        sa.select(sa.func.coalesce(sa.func.sum(vat), 0))
+        .where(line_t.c[fk] == doc_t.c.id)
+        .scalar_subquery()
+    )
+
+    last_id = ""
+    while True:
+        ids = [
+            r[0]
+            for r in bind.execute(
+                sa.select(doc_t.c.id)
+                .where(doc_t.c.id > last_id)
+                .order_by(doc_t.c.id)
+                .limit(BACKFILL_CHUNK)
+            )
+        ]
+        if not ids:
+            break
+        bind.execute(
+            sa.update(doc_t)
+            .where(doc_t.c.id.in_(ids))
+            .values(subtotal=sub, vat_total=vat_sum, grand_total=sub + vat_sum)
+        )
+        last_id = ids[-1]
+
+
+def upgrade() -> None:
+    for doc, lines, _fk in DOCS:
+        op.add_column(lines, sa.Column("vat_rate", sa.Numeric(6, 3), nullable=True))
+        for col in ("subtotal", "vat_total", "grand_total"):
+            op.add_column(
+                doc,
+                sa.Column(
+                    col, sa.Numeric(14, 4), nullable=False, server_default=sa.text("0")
+                ),
+            )
+        op.create_index(f"ix_{doc}_tenant_grand_total", doc, ["tenant_id", "grand_total"])
+
+    for doc, lines, fk in DOCS:
+        _backfill(doc, lines, fk)
+
+
+def downgrade() -> None:
+    for doc, lines, _fk in DOCS:
+        op.drop_index(f"ix_{doc}_tenant_grand_total", table_name=doc)
+        with op.batch_alter_table(doc) as batch:
+            for col in ("grand_total", "vat_total", "subtotal"):
+                batch.drop_column(col)
+        with op.batch_alter_table(lines) as batch:
+            batch.drop_column("vat_rate")
@@ -0,0 +1,72 @@
+"""daily rollups, job watermarks and deal close dates
+
+Revision ID: 0001a
+Revises: 0001
+Create Date: 2026-10-19 09:30:00.000000
+
+Won/lost deals get closed_at from their last update, which is the best
+available guess at when they closed. daily_rollups starts empty; the first
+rollup_refresh_task run (no watermark yet) builds every tenant-day. Its
+(tenant_id, metric, day) index is created by 0002.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001a"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _timestamps() -> list[sa.Column]:
+    return [
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "daily_rollups",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("tenant_id", sa.String(36), sa.ForeignKey("tenants.id"), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("metric", sa.String(30), nullable=False),
+        sa.Column("partner_id", sa.String(60)),
+        sa.Column("currency", sa.String(3)),
+        sa.Column("count", sa.Integer()),
+        sa.Column("value", sa.Numeric(16, 4)),
+        *_timestamps(),
+        sa.UniqueConstraint(
+            "tenant_id", "day", "metric", "partner_id", "currency",
+            name="uq_daily_rollups_key",
+        ),
+    )
+    op.create_index("ix_daily_rollups_tenant_id", "daily_rollups", ["tenant_id"])
+    op.create_table(
+        "watermarks",
+        sa.Column("key", sa.String(120), primary_key=True),
+        sa.Column("value", sa.DateTime(timezone=True)),
+        *_timestamps(),
+    )
+
+    op.add_column("deals", sa.Column("closed_at", sa.DateTime(timezone=True)))
+    deals = sa.table("deals", sa.column("stage"), sa.column("closed_at"), sa.column("updated_at"))
+    op.execute(
+        deals.update()
+        .where(deals.c.stage.in_(["won", "lost"]))
+        .values(closed_at=deals.c.updated_at)
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("deals") as batch:
+        batch.drop_column("closed_at")
+    op.drop_table("watermarks")
+    op.drop_index("ix_daily_rollups_tenant_id", table_name="daily_rollups")
+    op.drop_table("daily_rollups")
@@ -0,0 +1,55 @@
+"""tenant-scoped composite indexes
+
+Revision ID: 0002
+Revises: 0001a
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns) — every list query filters on tenant first,
+# then sorts or filters on the trailing columns (see python -m app.index_advisor)
+INDEXES = [
+    ("ix_companies_tenant_created", "companies", ["tenant_id", "created_at"]),
+    ("ix_contacts_tenant_created", "contacts", ["tenant_id", "created_at"]),
+    ("ix_deals_tenant_created", "deals", ["tenant_id", "created_at"]),
+    ("ix_quotes_tenant_created", "quotes", ["tenant_id", "created_at"]),
+    ("ix_purchase_orders_tenant_created", "purchase_orders", ["tenant_id", "created_at"]),
+    ("ix_invoices_tenant_created", "invoices", ["tenant_id", "created_at"]),
+    ("ix_items_tenant_name", "items", ["tenant_id", "name"]),
+    ("ix_pricelists_tenant_name", "pricelists", ["tenant_id", "name"]),
+    ("ix_pricelist_lines_tenant_pricelist", "pricelist_lines", ["tenant_id", "pricelist_id"]),
+    ("ix_activities_tenant_assignee_due", "activities", ["tenant_id", "assigned_to", "due_at"]),
+    ("ix_activities_tenant_entity", "activities", ["tenant_id", "entity_type", "entity_id"]),
+    ("ix_email_messages_tenant_created", "email_messages", ["tenant_id", "created_at"]),
+    ("ix_email_messages_tenant_entity", "email_messages", ["tenant_id", "entity_type", "entity_id"]),
+    ("ix_daily_rollups_tenant_metric_day", "daily_rollups", ["tenant_id", "metric", "day"]),
+]
+
+
+def upgrade() -> None:
+    # build without blocking writes on Postgres (needs to run outside a transaction)
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for name, table, cols in INDEXES:
+                op.create_index(
+                    name, table, cols,
+                    postgresql_concurrently=True, if_not_exists=True,
+                )
+    else:
+        for name, table, cols in INDEXES:
+            op.create_index(name, table, cols, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _cols in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
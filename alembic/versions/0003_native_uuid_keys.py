@@ -0,0 +1,101 @@
+"""native uuid primary and foreign keys on Postgres
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 11:00:00.000000
+
+Ids were stored as varchar(36) text; on Postgres they become the 16-byte
+``uuid`` type, which shrinks every PK/FK index by more than half and makes
+comparisons fixed-width. Foreign keys are dropped around the type change and
+re-created afterwards. SQLite has no native uuid type and keeps the text
+column, so this is a no-op there.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = [
+    "tenants",
+    "users",
+    "companies",
+    "contacts",
+    "deals",
+    "activities",
+    "items",
+    "pricelists",
+    "pricelist_lines",
+    "quotes",
+    "quote_lines",
+    "purchase_orders",
+    "purchase_order_lines",
+    "email_messages",
+    "invoices",
+    "invoice_lines",
+    "mydata_submissions",
+    "invoice_series",
+    "daily_rollups",
+]
+
+# id-valued columns that are not foreign keys
+EXTRA_COLUMNS = {"mydata_submissions": ["batch_id"]}
+
+
+def _foreign_keys(bind) -> list[tuple[str, dict]]:
+    insp = sa.inspect(bind)
+    existing = set(insp.get_table_names())
+    return [
+        (table, fk)
+        for table in TABLES
+        if table in existing
+        for fk in insp.get_foreign_keys(table)
+        if fk["referred_table"] in TABLES
+    ]
+
+
+def _convert(to_type: str, using: str) -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    fks = _foreign_keys(bind)
+    for table, fk in fks:
+        op.drop_constraint(fk["name"], table, type_="foreignkey")
+
+    existing = set(sa.inspect(bind).get_table_names())
+    fk_columns: dict[str, set[str]] = {}
+    for table, fk in fks:
+        fk_columns.setdefault(table, set()).update(fk["constrained_columns"])
+    for table in TABLES:
+        if table not in existing:
+            continue
+        columns = ["id", *sorted(fk_columns.get(table, ())), *EXTRA_COLUMNS.get(table, [])]
+        clauses = ", ".join(
+            f"ALTER COLUMN {c} TYPE {to_type} USING {c}::{using}" for c in columns
+        )
+        op.execute(f"ALTER TABLE {table} {clauses}")
+
+    for table, fk in fks:
+        op.create_foreign_key(
+            fk["name"],
+            table,
+            fk["referred_table"],
+            fk["constrained_columns"],
+            fk["referred_columns"],
+            ondelete=fk.get("options", {}).get("ondelete"),
+        )
+
+
+def upgrade() -> None:
+    _convert("uuid", "uuid")
+
+
+def downgrade() -> None:
+    _convert("varchar(36)", "text")
@@ -0,0 +1,80 @@
+"""archive tables for email messages and activities
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.base import GUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _common() -> list[sa.Column]:
+    return [
+        sa.Column("id", GUID(), primary_key=True),
+        sa.Column("created_at", sa.DateTime(timezone=True)),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+        sa.Column(
+            "archived_at", sa.DateTime(timezone=True), server_default=sa.func.now()
+        ),
+        sa.Column("tenant_id", GUID(), sa.ForeignKey("tenants.id"), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "email_messages_archive",
+        *_common(),
+        sa.Column("direction", sa.String(10)),
+        sa.Column("subject", sa.String(500)),
+        sa.Column("sender", sa.String(255)),
+        sa.Column("recipients", sa.String(2000)),
+        sa.Column("cc", sa.String(2000)),
+        sa.Column("provider_msg_id", sa.String(255)),
+        sa.Column("thread_id", sa.String(255)),
+        sa.Column("sent_at", sa.DateTime(timezone=True)),
+        sa.Column("body_text", sa.Text()),
+        sa.Column("body_html", sa.Text()),
+        sa.Column("entity_type", sa.String(30)),
+        sa.Column("entity_id", sa.String(60)),
+    )
+    op.create_index(
+        "ix_email_messages_archive_tenant_created",
+        "email_messages_archive", ["tenant_id", "created_at"],
+    )
+    op.create_index(
+        "ix_email_messages_archive_provider_msg_id",
+        "email_messages_archive", ["provider_msg_id"],
+    )
+    op.create_table(
+        "activities_archive",
+        *_common(),
+        sa.Column("assigned_to", GUID()),
+        sa.Column("activity_type", sa.String(30)),
+        sa.Column("subject", sa.String(300), nullable=False),
+        sa.Column("description", sa.Text()),
+        sa.Column("due_at", sa.DateTime(timezone=True)),
+        sa.Column("completed_at", sa.DateTime(timezone=True)),
+        sa.Column("entity_type", sa.String(30)),
+        sa.Column("entity_id", sa.String(60)),
+    )
+    op.create_index(
+        "ix_activities_archive_tenant_completed",
+        "activities_archive", ["tenant_id", "completed_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("activities_archive")
+    op.drop_table("email_messages_archive")
@@ -0,0 +1,39 @@
+"""partial index on due_at of open activities
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN = sa.text("completed_at IS NULL")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(
+                "ix_activities_open_due", "activities", ["due_at"],
+                postgresql_where=OPEN, postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+    else:
+        op.create_index(
+            "ix_activities_open_due", "activities", ["due_at"],
+            sqlite_where=OPEN, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_activities_open_due", table_name="activities", if_exists=True)
@@ -0,0 +1,30 @@
+"""due date each activity reminder was queued for
+
+Revision ID: 0005a
+Revises: 0005
+Create Date: 2026-10-19 13:30:00.000000
+
+Starts empty: activities edited within the current lead window may be
+reminded once more right after the upgrade.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005a"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("activities", sa.Column("reminded_due_at", sa.DateTime(timezone=True)))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("activities") as batch:
+        batch.drop_column("reminded_due_at")
@@ -0,0 +1,87 @@
+"""deal stage events
+
+Revision ID: 0006
+Revises: 0005a
+Create Date: 2026-10-19 14:00:00.000000
+
+Existing deals get one event each (created straight into their current
+stage, at created_at) so history-based reports start from a complete set.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.base import GUID, uuid7
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_CHUNK = 1000
+
+
+def upgrade() -> None:
+    events = op.create_table(
+        "deal_stage_events",
+        sa.Column("id", GUID(), primary_key=True),
+        sa.Column("tenant_id", GUID(), sa.ForeignKey("tenants.id"), nullable=False),
+        sa.Column("deal_id", GUID(), nullable=False),
+        sa.Column("from_stage", sa.String(60)),
+        sa.Column("to_stage", sa.String(60), nullable=False),
+        sa.Column("assigned_to", GUID()),
+        sa.Column("value", sa.Numeric(14, 4)),
+        sa.Column(
+            "changed_at", sa.DateTime(timezone=True),
+            server_default=sa.func.now(), nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_deal_stage_events_tenant_changed", "deal_stage_events",
+        ["tenant_id", "changed_at"],
+    )
+    op.create_index(
+        "ix_deal_stage_events_deal_changed", "deal_stage_events",
+        ["deal_id", "changed_at"],
+    )
+
+    bind = op.get_bind()
+    deals = sa.table(
+        "deals",
+        sa.column("id"), sa.column("tenant_id"), sa.column("stage"),
+        sa.column("assigned_to"), sa.column("value"),
+        sa.column("created_at", sa.DateTime(timezone=True)),
+    )
+    last_id = None
+    while True:
+        q = sa.select(deals).order_by(deals.c.id).limit(BACKFILL_CHUNK)
+        if last_id is not None:
+            q = q.where(deals.c.id > last_id)
+        rows = bind.execute(q).all()
+        if not rows:
+            break
+        op.bulk_insert(
+            events,
+            [
+                {
+                    "id": uuid7(),
+                    "tenant_id": r.tenant_id,
+                    "deal_id": r.id,
+                    "from_stage": None,
+                    "to_stage": r.stage or "lead",
+                    "assigned_to": r.assigned_to,
+                    "value": r.value,
+                    "changed_at": r.created_at,
+                }
+                for r in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    op.drop_table("deal_stage_events")
@@ -0,0 +1,51 @@
+"""deal funnel counters and time in stage
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 15:00:00.000000
+
+The counters start empty; the first funnel_refresh_task run (no watermark
+yet) folds in the whole stage history.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.base import GUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("deal_stage_events", sa.Column("days_in_stage", sa.Float()))
+    op.create_index(
+        "ix_deal_stage_events_changed", "deal_stage_events", ["changed_at"]
+    )
+    op.create_table(
+        "deal_funnel_stats",
+        sa.Column("id", GUID(), primary_key=True),
+        sa.Column("tenant_id", GUID(), sa.ForeignKey("tenants.id"), nullable=False),
+        sa.Column("metric", sa.String(20), nullable=False),
+        sa.Column("stage", sa.String(60)),
+        sa.Column("assigned_to", GUID()),
+        sa.Column("days", sa.Integer()),
+        sa.Column("count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+    )
+    op.create_index(
+        "ix_deal_funnel_stats_tenant_metric", "deal_funnel_stats",
+        ["tenant_id", "metric"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("deal_funnel_stats")
+    op.drop_index("ix_deal_stage_events_changed", table_name="deal_stage_events")
+    with op.batch_alter_table("deal_stage_events") as batch:
+        batch.drop_column("days_in_stage")
@@ -0,0 +1,34 @@
+"""stored deal win probabilities
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 16:00:00.000000
+
+Existing deals start unscored; the first deal_scoring_task run (no
+watermark yet) scores every open deal.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("deals", sa.Column("win_probability", sa.Float()))
+    op.add_column("deals", sa.Column("scored_at", sa.DateTime(timezone=True)))
+    op.create_index("ix_deals_updated", "deals", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_deals_updated", table_name="deals")
+    with op.batch_alter_table("deals") as batch:
+        batch.drop_column("scored_at")
+        batch.drop_column("win_probability")
@@ -0,0 +1,56 @@
+"""transactional outbox and consumer offsets
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 17:00:00.000000
+
+The feed starts empty at upgrade time; consumers that need existing rows
+backfill from the tables themselves.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.base import GUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "outbox_events",
+        sa.Column(
+            "seq", sa.BigInteger().with_variant(sa.Integer(), "sqlite"),
+            primary_key=True, autoincrement=True,
+        ),
+        sa.Column("tenant_id", GUID()),
+        sa.Column("table_name", sa.String(60), nullable=False),
+        sa.Column("op", sa.String(10), nullable=False),
+        sa.Column("row_id", sa.String(60)),
+        sa.Column("data", sa.JSON()),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True),
+            server_default=sa.func.now(), nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_outbox_events_tenant_seq", "outbox_events", ["tenant_id", "seq"]
+    )
+    op.create_table(
+        "outbox_offsets",
+        sa.Column("consumer", sa.String(120), primary_key=True),
+        sa.Column("seq", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("outbox_offsets")
+    op.drop_index("ix_outbox_events_tenant_seq", table_name="outbox_events")
+    op.drop_table("outbox_events")
@@ -0,0 +1,78 @@
+"""webhook subscriptions and deliveries
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.base import GUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _timestamps() -> list[sa.Column]:
+    return [
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "webhook_subscriptions",
+        sa.Column("id", GUID(), primary_key=True),
+        sa.Column("tenant_id", GUID(), sa.ForeignKey("tenants.id"), nullable=False),
+        sa.Column("url", sa.String(500), nullable=False),
+        sa.Column("secret", sa.String(100), nullable=False),
+        sa.Column("topics", sa.JSON(), nullable=False),
+        sa.Column("active", sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column("failures", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("retry_at", sa.DateTime(timezone=True)),
+        *_timestamps(),
+    )
+    op.create_index(
+        "ix_webhook_subscriptions_tenant_id", "webhook_subscriptions", ["tenant_id"]
+    )
+    op.create_table(
+        "webhook_deliveries",
+        sa.Column("id", GUID(), primary_key=True),
+        sa.Column("tenant_id", GUID(), sa.ForeignKey("tenants.id"), nullable=False),
+        sa.Column(
+            "subscription_id", GUID(),
+            sa.ForeignKey("webhook_subscriptions.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("event_seq", sa.BigInteger(), nullable=False),
+        sa.Column("event_json", sa.Text(), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False, server_default="queued"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("error", sa.Text()),
+        sa.Column("batch_id", GUID()),
+        sa.Column("delivered_at", sa.DateTime(timezone=True)),
+        *_timestamps(),
+        sa.UniqueConstraint(
+            "subscription_id", "event_seq", name="uq_webhook_deliveries_event"
+        ),
+    )
+    op.create_index(
+        "ix_webhook_deliveries_sub_status", "webhook_deliveries",
+        ["subscription_id", "status", "event_seq"],
+    )
+    op.create_index("ix_webhook_deliveries_tenant_id", "webhook_deliveries", ["tenant_id"])
+    op.create_index("ix_webhook_deliveries_status", "webhook_deliveries", ["status"])
+    op.create_index("ix_webhook_deliveries_batch_id", "webhook_deliveries", ["batch_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("webhook_deliveries")
+    op.drop_table("webhook_subscriptions")
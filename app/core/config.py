@@ -3,6 +3,12 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite:///./crm.db"
+    # optional read replica for GET endpoints and report jobs
+    DATABASE_READ_URL: str | None = None
+    # keep a tenant's reads on the primary this long after it writes
+    READ_STICKY_SECONDS: int = 5
+    # shared state (sticky reads, ...); unset = per-process only
+    REDIS_URL: str | None = None
     JWT_SECRET: str = "CHANGE_ME_SUPER_LONG"
     JWT_ALG: str = "HS256"
     ACCESS_TOKEN_MINUTES: int = 60 * 12
@@ -21,5 +27,58 @@ class Settings(BaseSettings):
     IMAP_PASS: str = "pass"
     IMAP_FOLDER: str = "INBOX"
 
+    # myDATA (ΑΑΔΕ) invoicing — point at app.services.mydata_fake for offline runs
+    MYDATA_BASE_URL: str = "http://127.0.0.1:8765"
+    MYDATA_USER_ID: str = "user"
+    MYDATA_SUBSCRIPTION_KEY: str = "key"
+    MYDATA_TIMEOUT: int = 30
+    MYDATA_BATCH_SIZE: int = 100
+    MYDATA_MAX_INFLIGHT_PER_TENANT: int = 2
+    MYDATA_MAX_ATTEMPTS: int = 10  # failed sends before a row goes to "error"
+
+    # archival of old emails / completed activities (app.services.archive)
+    ARCHIVE_EMAILS_AFTER_DAYS: int = 365
+    ARCHIVE_ACTIVITIES_AFTER_DAYS: int = 180
+    ARCHIVE_BATCH_SIZE: int = 1000
+
+    # activity due-date reminders (app.services.reminders)
+    REMINDER_LEAD_MINUTES: int = 15
+    REMINDER_BUCKET_MINUTES: int = 5
+
+    # response cache for reference lists (app.services.response_cache)
+    RESPONSE_CACHE_SIZE: int = 512
+    RESPONSE_CACHE_TTL: int = 3600
+
+    # live change events over SSE (app.services.live_events)
+    LIVE_HEARTBEAT_SECONDS: int = 15
+    LIVE_QUEUE_SIZE: int = 1000
+
+    # transactional outbox / change feed (app.services.outbox)
+    OUTBOX_BATCH_SIZE: int = 500
+    OUTBOX_GAP_TIMEOUT_SECONDS: int = 10
+    OUTBOX_STREAM_MAXLEN: int = 100_000
+    OUTBOX_RETENTION_DAYS: int = 7
+
+    # outbound webhooks (app.services.webhooks)
+    WEBHOOK_BATCH_SIZE: int = 100
+    WEBHOOK_TIMEOUT: int = 10
+    WEBHOOK_POOL_SIZE: int = 20
+    WEBHOOK_BACKOFF_SECONDS: int = 30
+    WEBHOOK_BACKOFF_MAX_SECONDS: int = 3600
+    WEBHOOK_MAX_ATTEMPTS: int = 10
+    WEBHOOK_RETENTION_DAYS: int = 7
+    # allow URLs on private/loopback addresses (local receiver, tests only)
+    WEBHOOK_ALLOW_PRIVATE: bool = False
+
+    # per-tenant rate limiting and admission control (app.core.ratelimit)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_TENANT_PER_SEC: float = 50.0  # all routes of one tenant
+    RATE_LIMIT_TENANT_BURST: int = 200
+    RATE_LIMIT_ROUTE_PER_SEC: float = 10.0  # one route of one tenant
+    RATE_LIMIT_ROUTE_BURST: int = 40
+    # requests of one tenant allowed to run at once on expensive routes
+    RATE_LIMIT_PDF_CONCURRENCY: int = 2
+    RATE_LIMIT_BULK_CONCURRENCY: int = 1
+
 
 settings = Settings()
@@ -1,7 +1,14 @@
+import logging
+import time
+
 from sqlalchemy import create_engine, event
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql import Delete, Insert, Update
 
 from app.core.config import settings
+from app.core.redis_client import get_redis
+
+log = logging.getLogger(__name__)
 
 _is_sqlite = settings.DATABASE_URL.startswith("sqlite")
 
@@ -20,4 +27,121 @@ if _is_sqlite:
         cursor.execute("PRAGMA foreign_keys=ON")
         cursor.close()
 
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+# Optional read replica; without DATABASE_READ_URL everything uses the primary
+read_engine = (
+    create_engine(settings.DATABASE_READ_URL, pool_pre_ping=True)
+    if settings.DATABASE_READ_URL
+    else engine
+)
+
+
+class RoutingSession(Session):
+    """Sends plain SELECTs of read-only sessions to the replica.
+
+    A session is read-only when ``info["read_only"]`` is set (see
+    ``app.core.deps.get_db``); flushes and DML always go to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            self.info.get("read_only")
+            and not self._flushing
+            and not isinstance(clause, (Insert, Update, Delete))
+        ):
+            return read_engine
+        return engine
+
+
+SessionLocal = sessionmaker(
+    class_=RoutingSession, bind=engine, autoflush=False, autocommit=False
+)
+
+
+def read_only_session() -> Session:
+    """Session for report jobs that only read."""
+    db = SessionLocal()
+    db.info["read_only"] = True
+    return db
+
+
+# ── Read-your-writes stickiness ──────────────────────────────
+# After a tenant commits a write, its reads stay on the primary for
+# READ_STICKY_SECONDS so they never see replica lag. Shared via Redis when
+# REDIS_URL is set, otherwise per process. If Redis is unreachable the
+# write still stands (the mark runs after commit) and reads use the primary.
+_last_write: dict[str, float] = {}
+
+
+def mark_tenant_write(tenant_id: str) -> None:
+    r = get_redis()
+    if r is not None:
+        try:
+            r.set(f"db:sticky:{tenant_id}", 1, ex=settings.READ_STICKY_SECONDS)
+        except Exception:
+            log.warning("could not mark tenant %s as sticky", tenant_id, exc_info=True)
+    else:
+        _last_write[tenant_id] = time.monotonic()
+
+
+def tenant_recently_wrote(tenant_id: str) -> bool:
+    r = get_redis()
+    if r is not None:
+        try:
+            return bool(r.exists(f"db:sticky:{tenant_id}"))
+        except Exception:
+            log.warning("sticky check failed; reading from the primary", exc_info=True)
+            return True
+    ts = _last_write.get(tenant_id)
+    return ts is not None and time.monotonic() - ts < settings.READ_STICKY_SECONDS
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _note_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _note_dml(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _forget_write(session):
+    session.info.pop("wrote", None)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _sticky_after_commit(session):
+    if session.info.pop("wrote", False) and session.info.get("tenant_id"):
+        if read_engine is not engine:
+            mark_tenant_write(session.info["tenant_id"])
+
+
+# keep denormalized quote/PO totals in step with their lines
+from app.services import agenda, doc_totals, live_events, outbox, pipeline, response_cache  # noqa: E402
+
+event.listen(SessionLocal, "after_flush", doc_totals.after_flush)
+
+# deal stage history
+event.listen(SessionLocal, "after_flush", pipeline.after_flush)
+
+# per-user agenda sets (Redis only)
+event.listen(SessionLocal, "after_flush", agenda.after_flush)
+event.listen(SessionLocal, "after_commit", agenda.after_commit)
+event.listen(SessionLocal, "after_rollback", agenda.after_rollback)
+
+# tenant-aware response cache invalidation
+event.listen(SessionLocal, "after_flush", response_cache.after_flush)
+event.listen(SessionLocal, "do_orm_execute", response_cache.on_execute)
+event.listen(SessionLocal, "after_commit", response_cache.after_commit)
+event.listen(SessionLocal, "after_rollback", response_cache.after_rollback)
+
+# live change events for SSE subscribers
+event.listen(SessionLocal, "after_flush", live_events.after_flush)
+event.listen(SessionLocal, "after_commit", live_events.after_commit)
+event.listen(SessionLocal, "after_rollback", live_events.after_rollback)
+
+# transactional outbox (ordered change feed)
+event.listen(SessionLocal, "after_flush", outbox.after_flush)
+event.listen(SessionLocal, "do_orm_execute", outbox.on_execute)
@@ -1,15 +1,34 @@
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
-from app.core.db import SessionLocal
+from app.core.db import SessionLocal, engine, read_engine, tenant_recently_wrote
 from app.core.security import decode_token
 
 oauth2 = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+READ_METHODS = {"GET", "HEAD"}
 
-def get_db():
+
+def request_tenant(request: Request) -> str | None:
+    auth = request.headers.get("authorization", "")
+    if not auth.lower().startswith("bearer "):
+        return None
+    try:
+        return decode_token(auth[7:]).get("tenant_id")
+    except Exception:
+        return None
+
+
+def get_db(request: Request):
     db = SessionLocal()
+    if read_engine is not engine:
+        tenant_id = request_tenant(request)
+        db.info["tenant_id"] = tenant_id
+        if request.method in READ_METHODS and not (
+            tenant_id and tenant_recently_wrote(tenant_id)
+        ):
+            db.info["read_only"] = True
     try:
         yield db
     finally:
@@ -0,0 +1,234 @@
+"""Per-tenant rate limiting and admission control for the API.
+
+Install on the FastAPI app with ``app.add_middleware(RateLimitMiddleware)``.
+Every request is keyed by the ``tenant_id`` in its bearer token (see
+``deps.request_tenant``). Requests without a token, such as login, are
+keyed by client IP. Each request takes a token from two buckets:
+
+* the tenant bucket (``RATE_LIMIT_TENANT_PER_SEC``, burst
+  ``RATE_LIMIT_TENANT_BURST``), shared by all of the tenant's routes;
+* the route bucket (``RATE_LIMIT_ROUTE_PER_SEC`` / ``..._BURST``), per
+  tenant and route. Ids in the path are folded, so ``GET /quotes/{id}`` is
+  one route.
+
+A token is only taken when both buckets have one. Expensive routes (PDF
+rendering, ``:batch`` / ``:from-quotes`` bulk creates, ``/export`` and
+``/import``) also need a concurrency slot, capped per tenant. Rejected
+requests get a 429 with ``Retry-After``.
+
+With ``REDIS_URL`` set, buckets and slots live in Redis (atomic Lua
+scripts), so the limits hold across API processes. Without Redis they
+are per process. If Redis is unreachable, requests are let through rather
+than failing.
+"""
+
+import logging
+import math
+import re
+import time
+from collections import OrderedDict
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+from app.core.deps import request_tenant
+
+log = logging.getLogger(__name__)
+
+EXEMPT_PATHS = {"/health"}
+# concurrency slots are dropped after this long if a process dies holding one
+SLOT_TTL_SECONDS = 300
+BUSY_RETRY_AFTER = 2
+
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F]{32}|[0-9a-fA-F-]{36})$")
+
+
+def route_key(method: str, path: str) -> str:
+    """``GET /quotes/{id}/pdf`` for ``GET /quotes/0192…/pdf``."""
+    segments = ["{id}" if _ID_SEGMENT.match(s) else s for s in path.split("/")]
+    return f"{method} {'/'.join(segments)}"
+
+
+def expensive(path: str) -> tuple[str, int] | None:
+    """``(kind, per-tenant concurrency cap)`` for routes that need a slot."""
+    if path.endswith("/pdf"):
+        return "pdf", settings.RATE_LIMIT_PDF_CONCURRENCY
+    if path.endswith((":batch", ":from-quotes", "/export", "/import")):
+        return "bulk", settings.RATE_LIMIT_BULK_CONCURRENCY
+    return None
+
+
+# ── Backends ─────────────────────────────────────────────────
+class MemoryBackend:
+    """Buckets and slots in this process; limits apply per API worker.
+
+    Nothing here awaits, so each call is atomic on the event loop.
+    """
+
+    def __init__(self, max_keys: int = 10_000):
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._slots: dict[str, int] = {}
+        self._max_keys = max_keys
+
+    async def take(self, limits: list[tuple[str, float, int]]) -> float:
+        """Take a token from every ``(key, rate, burst)``; 0 or seconds to wait."""
+        now = time.monotonic()
+        levels = []
+        wait = 0.0
+        for key, rate, burst in limits:
+            tokens, ts = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - ts) * rate)
+            levels.append((key, tokens))
+            if tokens < 1:
+                wait = max(wait, (1 - tokens) / rate)
+        for key, tokens in levels:
+            self._buckets[key] = (tokens if wait else tokens - 1, now)
+            self._buckets.move_to_end(key)
+        while len(self._buckets) > self._max_keys:
+            self._buckets.popitem(last=False)  # idle buckets refill to full anyway
+        return wait
+
+    async def acquire(self, key: str, cap: int) -> bool:
+        n = self._slots.get(key, 0)
+        if n >= cap:
+            return False
+        self._slots[key] = n + 1
+        return True
+
+    async def release(self, key: str) -> None:
+        n = self._slots.get(key, 1) - 1
+        if n > 0:
+            self._slots[key] = n
+        else:
+            self._slots.pop(key, None)
+
+
+_TAKE = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local levels, wait = {}, 0
+for i = 1, #KEYS do
+  local rate, burst = tonumber(ARGV[2 * i - 1]), tonumber(ARGV[2 * i])
+  local b = redis.call('HMGET', KEYS[i], 'tokens', 'ts')
+  local v = tonumber(b[1]) or burst
+  local ts = tonumber(b[2]) or now
+  v = math.min(burst, v + (now - ts) * rate)
+  levels[i] = v
+  if v < 1 then wait = math.max(wait, (1 - v) / rate) end
+end
+for i = 1, #KEYS do
+  local rate, burst = tonumber(ARGV[2 * i - 1]), tonumber(ARGV[2 * i])
+  local v = levels[i]
+  if wait == 0 then v = v - 1 end
+  redis.call('HSET', KEYS[i], 'tokens', v, 'ts', now)
+  redis.call('EXPIRE', KEYS[i], math.ceil(burst / rate) + 1)
+end
+return tostring(wait)
+"""
+
+_ACQUIRE = """
+local n = redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+if n > tonumber(ARGV[1]) then
+  redis.call('DECR', KEYS[1])
+  return 0
+end
+return 1
+"""
+
+_RELEASE = """
+if redis.call('DECR', KEYS[1]) <= 0 then redis.call('DEL', KEYS[1]) end
+"""
+
+
+class RedisBackend:
+    """Buckets and slots shared by every API process, using Redis server time."""
+
+    def __init__(self, url: str):
+        import redis.asyncio as aioredis
+
+        self._redis = aioredis.from_url(url)
+        self._take = self._redis.register_script(_TAKE)
+        self._acquire = self._redis.register_script(_ACQUIRE)
+        self._release = self._redis.register_script(_RELEASE)
+
+    async def take(self, limits: list[tuple[str, float, int]]) -> float:
+        args = [x for _, rate, burst in limits for x in (rate, burst)]
+        try:
+            return float(await self._take(keys=[k for k, _, _ in limits], args=args))
+        except Exception:
+            log.warning("rate limit check failed; letting the request through", exc_info=True)
+            return 0.0
+
+    async def acquire(self, key: str, cap: int) -> bool:
+        try:
+            return bool(await self._acquire(keys=[key], args=[cap, SLOT_TTL_SECONDS]))
+        except Exception:
+            log.warning("concurrency slot check failed; letting the request through", exc_info=True)
+            return True
+
+    async def release(self, key: str) -> None:
+        try:
+            await self._release(keys=[key])
+        except Exception:
+            log.warning("could not release concurrency slot %s", key, exc_info=True)
+
+
+# ── Middleware ───────────────────────────────────────────────
+def _too_many(detail: str, retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        {"detail": detail},
+        status_code=429,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+class RateLimitMiddleware:
+    """Pure ASGI, so streamed responses (PDFs, ``/events``) pass untouched."""
+
+    def __init__(self, app, backend=None):
+        self.app = app
+        self.backend = backend or (
+            RedisBackend(settings.REDIS_URL) if settings.REDIS_URL else MemoryBackend()
+        )
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not settings.RATE_LIMIT_ENABLED
+            or scope["path"] in EXEMPT_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        tenant_id = request_tenant(request)
+        who = f"t:{tenant_id}" if tenant_id else f"ip:{request.client.host if request.client else '-'}"
+        wait = await self.backend.take(
+            [
+                (f"rl:{who}", settings.RATE_LIMIT_TENANT_PER_SEC,
+                 settings.RATE_LIMIT_TENANT_BURST),
+                (f"rl:{who}:{route_key(scope['method'], scope['path'])}",
+                 settings.RATE_LIMIT_ROUTE_PER_SEC, settings.RATE_LIMIT_ROUTE_BURST),
+            ]
+        )
+        if wait:
+            await _too_many("Rate limit exceeded", wait)(scope, receive, send)
+            return
+
+        cap = expensive(scope["path"])
+        if cap is None:
+            await self.app(scope, receive, send)
+            return
+        kind, limit = cap
+        slot = f"busy:{who}:{kind}"
+        if not await self.backend.acquire(slot, limit):
+            await _too_many(
+                f"Too many concurrent {kind} requests", BUSY_RETRY_AFTER
+            )(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            await self.backend.release(slot)
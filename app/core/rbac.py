@@ -5,6 +5,7 @@ ROLE_PERMS: dict[str, set[str]] = {
     "admin": {
         "companies:*", "contacts:*", "items:*", "pricelists:*",
         "quotes:*", "po:*", "emails:*", "deals:*", "activities:*",
+        "invoices:*", "reports:*", "webhooks:*",
     },
     "sales": {
         "companies:read", "contacts:*", "deals:*", "activities:*",
@@ -16,7 +17,8 @@ ROLE_PERMS: dict[str, set[str]] = {
     },
     "viewer": {
         "companies:read", "contacts:read", "items:read",
-        "pricelists:read", "quotes:read", "po:read",
+        "pricelists:read", "quotes:read", "po:read", "invoices:read",
+        "reports:read",
     },
 }
 
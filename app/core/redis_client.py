@@ -0,0 +1,13 @@
+from app.core.config import settings
+
+_redis = None
+
+
+def get_redis():
+    """Shared Redis client, or None when REDIS_URL is not set."""
+    global _redis
+    if _redis is None and settings.REDIS_URL:
+        import redis
+
+        _redis = redis.Redis.from_url(settings.REDIS_URL)
+    return _redis
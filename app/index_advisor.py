@@ -0,0 +1,121 @@
+"""
+Index advisor: run the read endpoints of app/routers against the configured
+database, EXPLAIN every statement they emit and flag sequential scans and
+sorts that no index serves.
+
+    python -m app.index_advisor            # exits 1 if anything is flagged
+
+On Postgres the plans are taken with ``enable_seqscan = off`` so a
+``Seq Scan`` only shows up when no usable index exists, even on small tables.
+"""
+
+import sys
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.core.db import SessionLocal, engine
+from app.routers import (
+    activities,
+    companies,
+    contacts,
+    deals,
+    emails,
+    invoices,
+    items,
+    pricelists,
+    purchase_orders,
+    quotes,
+    reports,
+)
+
+# placeholder ids; valid UUIDs so native uuid columns accept them
+T = "00000000-0000-7000-8000-000000000001"
+X = "00000000-0000-7000-8000-000000000002"
+
+# (label, endpoint, kwargs) — filters are set so every index path is exercised
+CASES = [
+    ("list_companies", companies.list_companies,
+     {"request": None, "is_customer": True, "is_supplier": None}),
+    ("list_contacts", contacts.list_contacts, {"company_id": X}),
+    ("list_deals", deals.list_deals, {"stage": "lead", "company_id": None}),
+    ("list_activities", activities.list_activities,
+     {"entity_type": None, "entity_id": None, "assigned_to": X}),
+    ("list_activities(entity)", activities.list_activities,
+     {"entity_type": "deal", "entity_id": X, "assigned_to": None}),
+    ("list_items", items.list_items, {"request": None, "category": None}),
+    ("list_pricelists", pricelists.list_pricelists, {"request": None}),
+    ("list_pricelist_lines", pricelists.list_pricelist_lines,
+     {"request": None, "pricelist_id": X}),
+    ("list_quotes", quotes.list_quotes, {"min_total": None, "max_total": None, "sort": "created_at"}),
+    ("list_quotes(by value)", quotes.list_quotes, {"min_total": 1000, "max_total": None, "sort": "grand_total"}),
+    ("list_pos", purchase_orders.list_pos, {"min_total": None, "max_total": None, "sort": "created_at"}),
+    ("list_invoices", invoices.list_invoices, {"status": None, "customer_id": None}),
+    ("list_emails", emails.list_emails, {"direction": None, "entity_type": "deal", "entity_id": X}),
+    ("revenue_report", reports.revenue_report,
+     {"grain": "month", "date_from": None, "date_to": None, "by_customer": False}),
+]
+
+
+@contextmanager
+def _capture():
+    stmts: list[tuple[str, object]] = []
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            stmts.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _before)
+    try:
+        yield stmts
+    finally:
+        event.remove(engine, "before_cursor_execute", _before)
+
+
+def _explain(conn, statement: str, parameters) -> list[str]:
+    if engine.dialect.name == "postgresql":
+        conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        rows = conn.exec_driver_sql("EXPLAIN " + statement, parameters).all()
+        return [r[0] for r in rows]
+    rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+    return [r[-1] for r in rows]
+
+
+def _problems(plan: list[str]) -> list[str]:
+    out = []
+    for line in plan:
+        text = line.strip()
+        if "Seq Scan" in text:
+            out.append(text)
+        elif text.startswith("SCAN ") and "USING" not in text:
+            out.append(text)  # SQLite full table scan
+        elif "TEMP B-TREE FOR ORDER BY" in text:
+            out.append(text)  # SQLite sort without an index
+    return out
+
+
+def main() -> int:
+    ctx = {"tenant_id": T, "role": "owner", "sub": X}
+    flagged = 0
+    for label, fn, kwargs in CASES:
+        db = SessionLocal()
+        try:
+            with _capture() as stmts:
+                fn(db=db, ctx=ctx, **kwargs)
+            conn = db.connection()
+            for statement, parameters in stmts:
+                problems = _problems(_explain(conn, statement, parameters))
+                status = "FLAG" if problems else "ok"
+                print(f"[{status:4}] {label}")
+                for p in problems:
+                    print(f"         {p}")
+                flagged += bool(problems)
+        finally:
+            db.rollback()
+            db.close()
+    print(f"\n{flagged} statement(s) flagged")
+    return 1 if flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,19 +2,29 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, text
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.models.base import Base, UUIDMixin, TimestampMixin
+from app.models.base import Base, GUID, UUIDMixin, TimestampMixin
 
 
 class Activity(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "activities"
+    __table_args__ = (
+        Index("ix_activities_tenant_assignee_due", "tenant_id", "assigned_to", "due_at"),
+        Index("ix_activities_tenant_entity", "tenant_id", "entity_type", "entity_id"),
+        # open activities by due date, for the reminder scan
+        Index(
+            "ix_activities_open_due", "due_at",
+            postgresql_where=text("completed_at IS NULL"),
+            sqlite_where=text("completed_at IS NULL"),
+        ),
+    )
     tenant_id: Mapped[str] = mapped_column(
-        ForeignKey("tenants.id"), index=True, nullable=False
+        GUID(), ForeignKey("tenants.id"), index=True, nullable=False
     )
     assigned_to: Mapped[str | None] = mapped_column(
-        ForeignKey("users.id"), index=True
+        GUID(), ForeignKey("users.id"), index=True
     )
 
     activity_type: Mapped[str] = mapped_column(
@@ -25,6 +35,8 @@ class Activity(Base, UUIDMixin, TimestampMixin):
 
     due_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # due_at a reminder was last queued for (app.services.reminders); not archived
+    reminded_due_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
     # polymorphic link
     entity_type: Mapped[str | None] = mapped_column(
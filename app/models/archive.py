@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, GUID
+
+# Cold copies of email_messages / activities, written by app.services.archive.
+# Columns mirror the hot tables one to one (rows are copied column by column),
+# plus archived_at. assigned_to carries no FK so archived rows survive user
+# deletes.
+
+
+class ArchivedEmailMessage(Base):
+    __tablename__ = "email_messages_archive"
+    __table_args__ = (
+        Index("ix_email_messages_archive_tenant_created", "tenant_id", "created_at"),
+    )
+    id: Mapped[str] = mapped_column(GUID(), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    tenant_id: Mapped[str] = mapped_column(
+        GUID(), ForeignKey("tenants.id"), nullable=False
+    )
+
+    direction: Mapped[str] = mapped_column(String(10))
+    subject: Mapped[str | None] = mapped_column(String(500))
+    sender: Mapped[str | None] = mapped_column(String(255))
+    recipients: Mapped[str | None] = mapped_column(String(2000))
+    cc: Mapped[str | None] = mapped_column(String(2000))
+
+    provider_msg_id: Mapped[str | None] = mapped_column(String(255), index=True)
+    thread_id: Mapped[str | None] = mapped_column(String(255))
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+    body_text: Mapped[str | None] = mapped_column(Text)
+    body_html: Mapped[str | None] = mapped_column(Text)
+
+    entity_type: Mapped[str | None] = mapped_column(String(30))
+    entity_id: Mapped[str | None] = mapped_column(String(60))
+
+
+class ArchivedActivity(Base):
+    __tablename__ = "activities_archive"
+    __table_args__ = (
+        Index("ix_activities_archive_tenant_completed", "tenant_id", "completed_at"),
+    )
+    id: Mapped[str] = mapped_column(GUID(), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    tenant_id: Mapped[str] = mapped_column(
+        GUID(), ForeignKey("tenants.id"), nullable=False
+    )
+    assigned_to: Mapped[str | None] = mapped_column(GUID())
+
+    activity_type: Mapped[str] = mapped_column(String(30))
+    subject: Mapped[str] = mapped_column(String(300), nullable=False)
+    description: Mapped[str | None] = mapped_column(Text)
+
+    due_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+    entity_type: Mapped[str | None] = mapped_column(String(30))
+    entity_id: Mapped[str | None] = mapped_column(String(60))
@@ -1,20 +1,56 @@
 from __future__ import annotations
 
+import os
+import time
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, func
+from sqlalchemy import DateTime, String, func
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.types import TypeDecorator
 
 
 class Base(DeclarativeBase):
     pass
 
 
-class UUIDMixin:
-    id: Mapped[str] = mapped_column(
-        primary_key=True, default=lambda: str(uuid.uuid4())
+class GUID(TypeDecorator):
+    """UUID column: native 16-byte ``uuid`` on Postgres, 36-char text elsewhere.
+
+    Values are plain ``str`` on the Python side either way.
+    """
+
+    impl = String(36)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=False))
+        return dialect.type_descriptor(String(36))
+
+
+def uuid7() -> str:
+    """Time-ordered UUID (RFC 9562 version 7).
+
+    The leading 48 bits are the Unix time in milliseconds, so new rows land
+    at the right edge of primary-key and foreign-key B-trees instead of on
+    random pages.
+    """
+    ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    value = (
+        (ms & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76
+        | ((rand >> 62) & 0xFFF) << 64
+        | 0b10 << 62
+        | rand & ((1 << 62) - 1)
     )
+    return str(uuid.UUID(int=value))
+
+
+class UUIDMixin:
+    id: Mapped[str] = mapped_column(GUID(), primary_key=True, default=uuid7)
 
 
 class TimestampMixin:
@@ -1,13 +1,16 @@
-from sqlalchemy import Boolean, ForeignKey, String
+from sqlalchemy import Boolean, ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.models.base import Base, UUIDMixin, TimestampMixin
+from app.models.base import Base, GUID, UUIDMixin, TimestampMixin
 
 
 class Company(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "companies"
+    __table_args__ = (
+        Index("ix_companies_tenant_created", "tenant_id", "created_at"),
+    )
     tenant_id: Mapped[str] = mapped_column(
-        ForeignKey("tenants.id"), index=True, nullable=False
+        GUID(), ForeignKey("tenants.id"), index=True, nullable=False
     )
 
     name: Mapped[str] = mapped_column(String(250), index=True, nullable=False)
@@ -1,16 +1,19 @@
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.models.base import Base, UUIDMixin, TimestampMixin
+from app.models.base import Base, GUID, UUIDMixin, TimestampMixin
 
 
 class Contact(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "contacts"
+    __table_args__ = (
+        Index("ix_contacts_tenant_created", "tenant_id", "created_at"),
+    )
     tenant_id: Mapped[str] = mapped_column(
-        ForeignKey("tenants.id"), index=True, nullable=False
+        GUID(), ForeignKey("tenants.id"), index=True, nullable=False
     )
     company_id: Mapped[str] = mapped_column(
-        ForeignKey("companies.id"), index=True, nullable=False
+        GUID(), ForeignKey("companies.id"), index=True, nullable=False
     )
 
     first_name: Mapped[str | None] = mapped_column(String(120))
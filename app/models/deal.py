@@ -1,26 +1,32 @@
 from __future__ import annotations
 
-from datetime import date
+from datetime import date, datetime
 
-from sqlalchemy import Date, ForeignKey, Numeric, String
+from sqlalchemy import (
+    Date, DateTime, Float, ForeignKey, Index, Integer, Numeric, String, func,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.models.base import Base, UUIDMixin, TimestampMixin
+from app.models.base import Base, GUID, UUIDMixin, TimestampMixin
 
 
 class Deal(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "deals"
+    __table_args__ = (
+        Index("ix_deals_tenant_created", "tenant_id", "created_at"),
+        Index("ix_deals_updated", "updated_at"),
+    )
     tenant_id: Mapped[str] = mapped_column(
-        ForeignKey("tenants.id"), index=True, nullable=False
+        GUID(), ForeignKey("tenants.id"), index=True, nullable=False
     )
     company_id: Mapped[str] = mapped_column(
-        ForeignKey("companies.id"), index=True, nullable=False
+        GUID(), ForeignKey("companies.id"), index=True, nullable=False
     )
     contact_id: Mapped[str | None] = mapped_column(
-        ForeignKey("contacts.id"), index=True
+        GUID(), ForeignKey("contacts.id"), index=True
     )
     assigned_to: Mapped[str | None] = mapped_column(
-        ForeignKey("users.id"), index=True
+        GUID(), ForeignKey("users.id"), index=True
     )
 
     title: Mapped[str] = mapped_column(String(300), nullable=False)
@@ -30,3 +36,56 @@ class Deal(Base, UUIDMixin, TimestampMixin):
     currency: Mapped[str] = mapped_column(String(3), default="EUR")
     expected_close: Mapped[date | None] = mapped_column(Date)
     notes: Mapped[str | None] = mapped_column(String(2000))
+    # set when the deal enters won/lost, cleared if it is reopened
+    closed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # written by the scoring job (app.services.deal_scoring), read-only elsewhere
+    win_probability: Mapped[float | None] = mapped_column(Float)
+    scored_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+
+class DealStageEvent(Base, UUIDMixin):
+    """Append-only log of deal stage changes (app.services.pipeline)."""
+
+    __tablename__ = "deal_stage_events"
+    __table_args__ = (
+        Index("ix_deal_stage_events_tenant_changed", "tenant_id", "changed_at"),
+        Index("ix_deal_stage_events_deal_changed", "deal_id", "changed_at"),
+        Index("ix_deal_stage_events_changed", "changed_at"),
+    )
+    tenant_id: Mapped[str] = mapped_column(
+        GUID(), ForeignKey("tenants.id"), nullable=False
+    )
+    # no FK so history survives deal deletes
+    deal_id: Mapped[str] = mapped_column(GUID(), nullable=False)
+    from_stage: Mapped[str | None] = mapped_column(String(60))  # None = created
+    to_stage: Mapped[str] = mapped_column(String(60), nullable=False)
+    # snapshot at the time of the change
+    assigned_to: Mapped[str | None] = mapped_column(GUID())
+    value: Mapped[float | None] = mapped_column(Numeric(14, 4))
+    changed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    # time spent in from_stage, filled in when the event is written
+    days_in_stage: Mapped[float | None] = mapped_column(Float)
+
+
+class DealFunnelStat(Base, UUIDMixin):
+    """Running counters over deal_stage_events, per tenant.
+
+    metric ``entered``: deals entering *stage*; ``days``: deals that left
+    *stage* after *days* whole days; ``won`` / ``lost``: closes per
+    *assigned_to*. Maintained incrementally by app.services.pipeline.
+    """
+
+    __tablename__ = "deal_funnel_stats"
+    __table_args__ = (
+        Index("ix_deal_funnel_stats_tenant_metric", "tenant_id", "metric"),
+    )
+    tenant_id: Mapped[str] = mapped_column(
+        GUID(), ForeignKey("tenants.id"), nullable=False
+    )
+    metric: Mapped[str] = mapped_column(String(20), nullable=False)
+    stage: Mapped[str | None] = mapped_column(String(60))
+    assigned_to: Mapped[str | None] = mapped_column(GUID())
+    days: Mapped[int | None] = mapped_column(Integer)
+    count: Mapped[int] = mapped_column(Integer, default=0)
@@ -2,16 +2,20 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.models.base import Base, UUIDMixin, TimestampMixin
+from app.models.base import Base, GUID, UUIDMixin, TimestampMixin
 
 
 class EmailMessage(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "email_messages"
+    __table_args__ = (
+        Index("ix_email_messages_tenant_created", "tenant_id", "created_at"),
+        Index("ix_email_messages_tenant_entity", "tenant_id", "entity_type", "entity_id"),
+    )
     tenant_id: Mapped[str] = mapped_column(
-        ForeignKey("tenants.id"), index=True, nullable=False
+        GUID(), ForeignKey("tenants.id"), index=True, nullable=False
     )
 
     direction: Mapped[str] = mapped_column(
@@ -2,26 +2,37 @@ from __future__ import annotations
 
 from datetime import date as date_type
 
-from sqlalchemy import Date, ForeignKey, Numeric, String, Text
+from sqlalchemy import (
+    Date, ForeignKey, Index, Integer, Numeric, String, Text, UniqueConstraint,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.base import Base, UUIDMixin, TimestampMixin
+from app.models.base import Base, GUID, UUIDMixin, TimestampMixin
 
 
 class Invoice(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "invoices"
+    __table_args__ = (
+        Index("ix_invoices_tenant_created", "tenant_id", "created_at"),
+        UniqueConstraint("tenant_id", "invoice_number", name="uq_invoices_tenant_number"),
+    )
     tenant_id: Mapped[str] = mapped_column(
-        ForeignKey("tenants.id"), index=True, nullable=False
+        GUID(), ForeignKey("tenants.id"), index=True, nullable=False
     )
     customer_id: Mapped[str] = mapped_column(
-        ForeignKey("companies.id"), index=True, nullable=False
+        GUID(), ForeignKey("companies.id"), index=True, nullable=False
+    )
+    quote_id: Mapped[str | None] = mapped_column(
+        GUID(), ForeignKey("quotes.id"), index=True
     )
     invoice_number: Mapped[str] = mapped_column(
         String(50), index=True, nullable=False
     )
     invoice_date: Mapped[date_type] = mapped_column(Date, nullable=False)
     currency: Mapped[str] = mapped_column(String(3), default="EUR")
-    total: Mapped[float] = mapped_column(Numeric(14, 4), default=0)
+    net_total: Mapped[float] = mapped_column(Numeric(14, 4), default=0)
+    vat_total: Mapped[float] = mapped_column(Numeric(14, 4), default=0)
+    total: Mapped[float] = mapped_column(Numeric(14, 4), default=0)  # gross
     status: Mapped[str] = mapped_column(
         String(30), default="draft"
     )  # draft / submitted / accepted / rejected
@@ -36,10 +47,10 @@ class Invoice(Base, UUIDMixin, TimestampMixin):
 class InvoiceLine(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "invoice_lines"
     tenant_id: Mapped[str] = mapped_column(
-        ForeignKey("tenants.id"), index=True, nullable=False
+        GUID(), ForeignKey("tenants.id"), index=True, nullable=False
     )
     invoice_id: Mapped[str] = mapped_column(
-        ForeignKey("invoices.id"), index=True, nullable=False
+        GUID(), ForeignKey("invoices.id"), index=True, nullable=False
     )
 
     description: Mapped[str] = mapped_column(String(500), nullable=False)
@@ -51,17 +62,37 @@ class InvoiceLine(Base, UUIDMixin, TimestampMixin):
     invoice = relationship("Invoice", back_populates="lines")
 
 
+class InvoiceSeries(Base, UUIDMixin):
+    """Last number issued per tenant and series (app.services.invoicing)."""
+
+    __tablename__ = "invoice_series"
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "series", name="uq_invoice_series_tenant_series"),
+    )
+    tenant_id: Mapped[str] = mapped_column(
+        GUID(), ForeignKey("tenants.id"), nullable=False
+    )
+    series: Mapped[str] = mapped_column(String(20), nullable=False)
+    last_number: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
 class MyDataSubmission(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "mydata_submissions"
     tenant_id: Mapped[str] = mapped_column(
-        ForeignKey("tenants.id"), index=True, nullable=False
+        GUID(), ForeignKey("tenants.id"), index=True, nullable=False
     )
+    # one submission row per invoice: retries reuse it (idempotency key)
     invoice_id: Mapped[str] = mapped_column(
-        ForeignKey("invoices.id"), index=True, nullable=False
+        GUID(), ForeignKey("invoices.id"), index=True, unique=True, nullable=False
     )
     request_json: Mapped[str] = mapped_column(Text)
     response_json: Mapped[str | None] = mapped_column(Text)
     status: Mapped[str] = mapped_column(
-        String(30), default="queued"
-    )  # queued / submitted / accepted / rejected / error
+        String(30), default="queued", index=True
+    )  # queued / sending / submitted / accepted / rejected / error
     error: Mapped[str | None] = mapped_column(Text)
+
+    # batch this row was claimed into, and the provider's id for that batch
+    batch_id: Mapped[str | None] = mapped_column(GUID(), index=True)
+    submission_uid: Mapped[str | None] = mapped_column(String(80), index=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
@@ -1,13 +1,16 @@
-from sqlalchemy import ForeignKey, Numeric, String
+from sqlalchemy import ForeignKey, Index, Numeric, String
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.models.base import Base, UUIDMixin, TimestampMixin
+from app.models.base import Base, GUID, UUIDMixin, TimestampMixin
 
 
 class Item(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "items"
+    __table_args__ = (
+        Index("ix_items_tenant_name", "tenant_id", "name"),
+    )
     tenant_id: Mapped[str] = mapped_column(
-        ForeignKey("tenants.id"), index=True, nullable=False
+        GUID(), ForeignKey("tenants.id"), index=True, nullable=False
     )
 
     sku: Mapped[str | None] = mapped_column(String(60), index=True)
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import JSON, BigInteger, DateTime, Index, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, GUID
+
+# SQLite only autoincrements an INTEGER PRIMARY KEY
+SEQ = BigInteger().with_variant(Integer, "sqlite")
+
+
+class OutboxEvent(Base):
+    """One row change, written in the same transaction (app.services.outbox)."""
+
+    __tablename__ = "outbox_events"
+    __table_args__ = (Index("ix_outbox_events_tenant_seq", "tenant_id", "seq"),)
+
+    seq: Mapped[int] = mapped_column(SEQ, primary_key=True, autoincrement=True)
+    tenant_id: Mapped[str | None] = mapped_column(GUID())  # None = not tenant-scoped / unknown
+    table_name: Mapped[str] = mapped_column(String(60), nullable=False)
+    op: Mapped[str] = mapped_column(String(10), nullable=False)  # insert / update / delete / bulk
+    row_id: Mapped[str | None] = mapped_column(String(60))  # None for bulk statements
+    data: Mapped[dict | None] = mapped_column(JSON)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
+class OutboxOffset(Base):
+    """Last event seq a consumer of the outbox has processed."""
+
+    __tablename__ = "outbox_offsets"
+    consumer: Mapped[str] = mapped_column(String(120), primary_key=True)
+    seq: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
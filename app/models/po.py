@@ -2,19 +2,23 @@ from __future__ import annotations
 
 from datetime import date as date_type
 
-from sqlalchemy import Date, ForeignKey, Numeric, String
+from sqlalchemy import Date, ForeignKey, Index, Numeric, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.base import Base, UUIDMixin, TimestampMixin
+from app.models.base import Base, GUID, UUIDMixin, TimestampMixin
 
 
 class PurchaseOrder(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "purchase_orders"
+    __table_args__ = (
+        Index("ix_purchase_orders_tenant_grand_total", "tenant_id", "grand_total"),
+        Index("ix_purchase_orders_tenant_created", "tenant_id", "created_at"),
+    )
     tenant_id: Mapped[str] = mapped_column(
-        ForeignKey("tenants.id"), index=True, nullable=False
+        GUID(), ForeignKey("tenants.id"), index=True, nullable=False
     )
     supplier_id: Mapped[str] = mapped_column(
-        ForeignKey("companies.id"), index=True, nullable=False
+        GUID(), ForeignKey("companies.id"), index=True, nullable=False
     )
 
     po_number: Mapped[str] = mapped_column(
@@ -24,6 +28,12 @@ class PurchaseOrder(Base, UUIDMixin, TimestampMixin):
     currency: Mapped[str] = mapped_column(String(3), default="EUR")
     status: Mapped[str] = mapped_column(String(30), default="draft")
     notes: Mapped[str | None] = mapped_column(String(2000))
+
+    # denormalized from the lines on every flush (app.services.doc_totals)
+    subtotal: Mapped[float] = mapped_column(Numeric(14, 4), default=0)
+    vat_total: Mapped[float] = mapped_column(Numeric(14, 4), default=0)
+    grand_total: Mapped[float] = mapped_column(Numeric(14, 4), default=0)
+
     lines = relationship(
         "PurchaseOrderLine", back_populates="po", cascade="all, delete-orphan"
     )
@@ -32,15 +42,16 @@ class PurchaseOrder(Base, UUIDMixin, TimestampMixin):
 class PurchaseOrderLine(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "purchase_order_lines"
     tenant_id: Mapped[str] = mapped_column(
-        ForeignKey("tenants.id"), index=True, nullable=False
+        GUID(), ForeignKey("tenants.id"), index=True, nullable=False
     )
     po_id: Mapped[str] = mapped_column(
-        ForeignKey("purchase_orders.id"), index=True, nullable=False
+        GUID(), ForeignKey("purchase_orders.id"), index=True, nullable=False
     )
 
     description: Mapped[str] = mapped_column(String(500), nullable=False)
     qty: Mapped[float] = mapped_column(Numeric(12, 3), nullable=False)
     unit: Mapped[str] = mapped_column(String(30), default="pcs")
     unit_price: Mapped[float] = mapped_column(Numeric(12, 4), nullable=False)
+    vat_rate: Mapped[float | None] = mapped_column(Numeric(6, 3))
 
     po = relationship("PurchaseOrder", back_populates="lines")
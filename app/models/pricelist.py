@@ -1,13 +1,14 @@
-from sqlalchemy import ForeignKey, Numeric, String
+from sqlalchemy import ForeignKey, Index, Numeric, String
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.models.base import Base, UUIDMixin, TimestampMixin
+from app.models.base import Base, GUID, UUIDMixin, TimestampMixin
 
 
 class PriceList(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "pricelists"
+    __table_args__ = (Index("ix_pricelists_tenant_name", "tenant_id", "name"),)
     tenant_id: Mapped[str] = mapped_column(
-        ForeignKey("tenants.id"), index=True, nullable=False
+        GUID(), ForeignKey("tenants.id"), index=True, nullable=False
     )
     name: Mapped[str] = mapped_column(String(200), nullable=False)
     currency: Mapped[str] = mapped_column(String(3), default="EUR")
@@ -15,14 +16,17 @@ class PriceList(Base, UUIDMixin, TimestampMixin):
 
 class PriceListLine(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "pricelist_lines"
+    __table_args__ = (
+        Index("ix_pricelist_lines_tenant_pricelist", "tenant_id", "pricelist_id"),
+    )
     tenant_id: Mapped[str] = mapped_column(
-        ForeignKey("tenants.id"), index=True, nullable=False
+        GUID(), ForeignKey("tenants.id"), index=True, nullable=False
     )
     pricelist_id: Mapped[str] = mapped_column(
-        ForeignKey("pricelists.id"), index=True, nullable=False
+        GUID(), ForeignKey("pricelists.id"), index=True, nullable=False
     )
     item_id: Mapped[str] = mapped_column(
-        ForeignKey("items.id"), index=True, nullable=False
+        GUID(), ForeignKey("items.id"), index=True, nullable=False
     )
 
     price: Mapped[float] = mapped_column(Numeric(12, 4), nullable=False)
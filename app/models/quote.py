@@ -2,19 +2,23 @@ from __future__ import annotations
 
 from datetime import date as date_type
 
-from sqlalchemy import Date, ForeignKey, Numeric, String
+from sqlalchemy import Date, ForeignKey, Index, Numeric, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.base import Base, UUIDMixin, TimestampMixin
+from app.models.base import Base, GUID, UUIDMixin, TimestampMixin
 
 
 class Quote(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "quotes"
+    __table_args__ = (
+        Index("ix_quotes_tenant_grand_total", "tenant_id", "grand_total"),
+        Index("ix_quotes_tenant_created", "tenant_id", "created_at"),
+    )
     tenant_id: Mapped[str] = mapped_column(
-        ForeignKey("tenants.id"), index=True, nullable=False
+        GUID(), ForeignKey("tenants.id"), index=True, nullable=False
     )
     customer_id: Mapped[str] = mapped_column(
-        ForeignKey("companies.id"), index=True, nullable=False
+        GUID(), ForeignKey("companies.id"), index=True, nullable=False
     )
 
     quote_number: Mapped[str] = mapped_column(
@@ -22,8 +26,16 @@ class Quote(Base, UUIDMixin, TimestampMixin):
     )
     quote_date: Mapped[date_type] = mapped_column(Date, nullable=False)
     currency: Mapped[str] = mapped_column(String(3), default="EUR")
-    status: Mapped[str] = mapped_column(String(30), default="draft")
+    status: Mapped[str] = mapped_column(
+        String(30), default="draft"
+    )  # draft / sent / accepted / rejected / invoiced
     notes: Mapped[str | None] = mapped_column(String(2000))
+
+    # denormalized from the lines on every flush (app.services.doc_totals)
+    subtotal: Mapped[float] = mapped_column(Numeric(14, 4), default=0)
+    vat_total: Mapped[float] = mapped_column(Numeric(14, 4), default=0)
+    grand_total: Mapped[float] = mapped_column(Numeric(14, 4), default=0)
+
     lines = relationship(
         "QuoteLine", back_populates="quote", cascade="all, delete-orphan"
     )
@@ -32,15 +44,19 @@ class Quote(Base, UUIDMixin, TimestampMixin):
 class QuoteLine(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "quote_lines"
     tenant_id: Mapped[str] = mapped_column(
-        ForeignKey("tenants.id"), index=True, nullable=False
+        GUID(), ForeignKey("tenants.id"), index=True, nullable=False
     )
     quote_id: Mapped[str] = mapped_column(
-        ForeignKey("quotes.id"), index=True, nullable=False
+        GUID(), ForeignKey("quotes.id"), index=True, nullable=False
     )
+    item_id: Mapped[str | None] = mapped_column(
+        GUID(), ForeignKey("items.id"), index=True
+    )  # optional: default source of the line VAT rate
 
     description: Mapped[str] = mapped_column(String(500), nullable=False)
     qty: Mapped[float] = mapped_column(Numeric(12, 3), nullable=False)
     unit: Mapped[str] = mapped_column(String(30), default="pcs")
     unit_price: Mapped[float] = mapped_column(Numeric(12, 4), nullable=False)
+    vat_rate: Mapped[float | None] = mapped_column(Numeric(6, 3))
 
     quote = relationship("Quote", back_populates="lines")
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy import (
+    Date, ForeignKey, Index, Integer, Numeric, String, UniqueConstraint,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, GUID, UUIDMixin, TimestampMixin
+
+
+class DailyRollup(Base, UUIDMixin, TimestampMixin):
+    """Per-tenant daily totals, rebuilt by app.services.rollups."""
+
+    __tablename__ = "daily_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "tenant_id", "day", "metric", "partner_id", "currency",
+            name="uq_daily_rollups_key",
+        ),
+        Index("ix_daily_rollups_tenant_metric_day", "tenant_id", "metric", "day"),
+    )
+    tenant_id: Mapped[str] = mapped_column(
+        GUID(), ForeignKey("tenants.id"), index=True, nullable=False
+    )
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    metric: Mapped[str] = mapped_column(
+        String(30), nullable=False
+    )  # quotes_issued / pos_issued / deals_won / deals_lost
+    # customer (quotes, deals) or supplier (POs); no FK so history survives deletes
+    partner_id: Mapped[str | None] = mapped_column(String(60))
+    currency: Mapped[str] = mapped_column(String(3), default="EUR")
+
+    count: Mapped[int] = mapped_column(Integer, default=0)
+    value: Mapped[float] = mapped_column(Numeric(16, 4), default=0)
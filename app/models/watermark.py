@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, TimestampMixin
+
+
+class Watermark(Base, TimestampMixin):
+    """Last processed point of an incremental background job."""
+
+    __tablename__ = "watermarks"
+    key: Mapped[str] = mapped_column(String(120), primary_key=True)
+    value: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
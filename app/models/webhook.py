@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import (
+    JSON, BigInteger, Boolean, DateTime, ForeignKey, Index, Integer, String,
+    Text, UniqueConstraint,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, GUID, UUIDMixin, TimestampMixin
+
+
+class WebhookSubscription(Base, UUIDMixin, TimestampMixin):
+    """Endpoint a tenant's changes are POSTed to (app.services.webhooks)."""
+
+    __tablename__ = "webhook_subscriptions"
+    tenant_id: Mapped[str] = mapped_column(
+        GUID(), ForeignKey("tenants.id"), index=True, nullable=False
+    )
+    url: Mapped[str] = mapped_column(String(500), nullable=False)
+    secret: Mapped[str] = mapped_column(String(100), nullable=False)  # HMAC key
+    # outbox table names to deliver, e.g. ["deals", "quotes"]
+    topics: Mapped[list] = mapped_column(JSON, nullable=False)
+    active: Mapped[bool] = mapped_column(Boolean, default=True)
+
+    # consecutive failed POSTs; the next attempt waits until retry_at
+    failures: Mapped[int] = mapped_column(Integer, default=0)
+    retry_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+
+class WebhookDelivery(Base, UUIDMixin, TimestampMixin):
+    """One outbox event queued for one subscription."""
+
+    __tablename__ = "webhook_deliveries"
+    __table_args__ = (
+        # the relay is at-least-once; this keeps a replayed event from queueing twice
+        UniqueConstraint("subscription_id", "event_seq", name="uq_webhook_deliveries_event"),
+        Index("ix_webhook_deliveries_sub_status", "subscription_id", "status", "event_seq"),
+    )
+    tenant_id: Mapped[str] = mapped_column(
+        GUID(), ForeignKey("tenants.id"), index=True, nullable=False
+    )
+    subscription_id: Mapped[str] = mapped_column(
+        GUID(), ForeignKey("webhook_subscriptions.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    event_seq: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    event_json: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[str] = mapped_column(
+        String(20), default="queued", index=True
+    )  # queued / sending / delivered / dead
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    error: Mapped[str | None] = mapped_column(Text)
+    # POST this row was claimed into
+    batch_id: Mapped[str | None] = mapped_column(GUID(), index=True)
+    delivered_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
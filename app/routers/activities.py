@@ -1,12 +1,13 @@
 from datetime import datetime, timezone
 
-...existing code...
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_ctx, get_db
 from app.core.rbac import require_perm
 from app.models.activity import Activity
-from app.schemas.activity import ActivityComplete, ActivityIn, ActivityOut
+from app.schemas.activity import ActivityComplete, ActivityIn, ActivityOut, AgendaOut
+from app.services import agenda, archive, response_cache
 
 router = APIRouter(prefix="/activities", tags=["activities"])
 
@@ -30,16 +31,31 @@ def list_activities(
     return q.order_by(Activity.due_at.desc().nullslast()).all()
 
 
+@router.get("/agenda", response_model=AgendaOut)
+def my_agenda(
+    db: Session = Depends(get_db),
+    ctx: dict = Depends(get_ctx),
+):
+    require_perm(ctx["role"], "activities:read")
+    return agenda.agenda(db, ctx["tenant_id"], ctx["sub"])
+
+
 @router.get("/{activity_id}", response_model=ActivityOut)
 def get_activity(
     activity_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     ctx: dict = Depends(get_ctx),
 ):
     require_perm(ctx["role"], "activities:read")
-    a = db.get(Activity, activity_id)
+    a = archive.get(db, Activity, activity_id)
     if not a or a.tenant_id != ctx["tenant_id"]:
         raise HTTPException(404, "Activity not found")
+    etag = response_cache.weak_etag(ctx["tenant_id"], ["activities"], a)
+    if response_cache.matches(request, etag):
+        return response_cache.not_modified(etag)
+    response.headers["ETag"] = etag
     return a
 
 
@@ -1,33 +1,44 @@
-...existing code...
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_ctx, get_db
 from app.core.rbac import require_perm
 from app.models.company import Company
 from app.schemas.company import CompanyIn, CompanyOut
+from app.services import response_cache
 
 router = APIRouter(prefix="/companies", tags=["companies"])
 
 
 @router.get("", response_model=list[CompanyOut])
 def list_companies(
+    request: Request,
     is_customer: bool | None = None,
     is_supplier: bool | None = None,
     db: Session = Depends(get_db),
     ctx: dict = Depends(get_ctx),
 ):
     require_perm(ctx["role"], "companies:read")
-    q = db.query(Company).filter(Company.tenant_id == ctx["tenant_id"])
-    if is_customer is not None:
-        q = q.filter(Company.is_customer == is_customer)
-    if is_supplier is not None:
-        q = q.filter(Company.is_supplier == is_supplier)
-    return q.order_by(Company.created_at.desc()).all()
+
+    def build():
+        q = db.query(Company).filter(Company.tenant_id == ctx["tenant_id"])
+        if is_customer is not None:
+            q = q.filter(Company.is_customer == is_customer)
+        if is_supplier is not None:
+            q = q.filter(Company.is_supplier == is_supplier)
+        return [
+            CompanyOut.model_validate(c)
+            for c in q.order_by(Company.created_at.desc())
+        ]
+
+    return response_cache.cached(request, ctx["tenant_id"], ["companies"], build)
 
 
 @router.get("/{company_id}", response_model=CompanyOut)
 def get_company(
     company_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     ctx: dict = Depends(get_ctx),
 ):
@@ -35,6 +46,10 @@ def get_company(
     c = db.get(Company, company_id)
     if not c or c.tenant_id != ctx["tenant_id"]:
         raise HTTPException(404, "Company not found")
+    etag = response_cache.weak_etag(ctx["tenant_id"], ["companies"], c)
+    if response_cache.matches(request, etag):
+        return response_cache.not_modified(etag)
+    response.headers["ETag"] = etag
     return c
 
 
@@ -1,4 +1,4 @@
-...existing code...
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_ctx, get_db
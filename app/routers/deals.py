@@ -1,16 +1,37 @@
-...existing code...
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_ctx, get_db
 from app.core.rbac import require_perm
 from app.models.deal import Deal
-from app.schemas.deal import DealIn, DealOut, DealStageUpdate
+from app.schemas.deal import (
+    DealBulkStageOut,
+    DealBulkStageUpdate,
+    DealIn,
+    DealOut,
+    DealStageUpdate,
+    FunnelOut,
+)
+from app.services import pipeline, response_cache
+from app.services.pipeline import CLOSED_STAGES
 
 router = APIRouter(prefix="/deals", tags=["deals"])
 
 VALID_STAGES = {"lead", "qualified", "proposal", "negotiation", "won", "lost"}
 
 
+def _set_stage(d: Deal, stage: str) -> None:
+    """Change stage, keeping ``closed_at`` in step with won/lost."""
+    if stage in CLOSED_STAGES:
+        if d.stage != stage or d.closed_at is None:
+            d.closed_at = datetime.now(timezone.utc)
+    else:
+        d.closed_at = None
+    d.stage = stage
+
+
 @router.get("", response_model=list[DealOut])
 def list_deals(
     stage: str | None = None,
@@ -27,9 +48,45 @@ def list_deals(
     return q.order_by(Deal.created_at.desc()).all()
 
 
+@router.get("/funnel", response_model=FunnelOut)
+def deal_funnel(
+    db: Session = Depends(get_db),
+    ctx: dict = Depends(get_ctx),
+):
+    """Stage conversion, median days in stage and win rates (refreshed every
+    few minutes from the stage history)."""
+    require_perm(ctx["role"], "deals:read")
+    return pipeline.funnel(db, ctx["tenant_id"])
+
+
+@router.patch("/stage:bulk", response_model=DealBulkStageOut)
+def bulk_update_deal_stage(
+    payload: DealBulkStageUpdate,
+    db: Session = Depends(get_db),
+    ctx: dict = Depends(get_ctx),
+):
+    """Move many deals to one stage; returns the updated pipeline."""
+    require_perm(ctx["role"], "deals:update")
+    if payload.stage not in VALID_STAGES:
+        raise HTTPException(400, f"Invalid stage. Must be one of: {VALID_STAGES}")
+    if not payload.deal_ids:
+        raise HTTPException(400, "deal_ids is empty")
+    try:
+        moved = pipeline.move_deals(
+            db, ctx["tenant_id"], list(set(payload.deal_ids)), payload.stage
+        )
+    except pipeline.DealsNotFound as e:
+        db.rollback()
+        raise HTTPException(404, str(e))
+    db.commit()
+    return {"moved": moved, "pipeline": pipeline.pipeline_summary(db, ctx["tenant_id"])}
+
+
 @router.get("/{deal_id}", response_model=DealOut)
 def get_deal(
     deal_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     ctx: dict = Depends(get_ctx),
 ):
@@ -37,6 +94,10 @@ def get_deal(
     d = db.get(Deal, deal_id)
     if not d or d.tenant_id != ctx["tenant_id"]:
         raise HTTPException(404, "Deal not found")
+    etag = response_cache.weak_etag(ctx["tenant_id"], ["deals"], d)
+    if response_cache.matches(request, etag):
+        return response_cache.not_modified(etag)
+    response.headers["ETag"] = etag
     return d
 
 
@@ -49,7 +110,8 @@ def create_deal(
     require_perm(ctx["role"], "deals:create")
     if payload.stage not in VALID_STAGES:
         raise HTTPException(400, f"Invalid stage. Must be one of: {VALID_STAGES}")
-    d = Deal(tenant_id=ctx["tenant_id"], **payload.model_dump())
+    d = Deal(tenant_id=ctx["tenant_id"], **payload.model_dump(exclude={"stage"}))
+    _set_stage(d, payload.stage)
     db.add(d)
     db.commit()
     db.refresh(d)
@@ -69,8 +131,9 @@ def update_deal(
         raise HTTPException(404, "Deal not found")
     if payload.stage not in VALID_STAGES:
         raise HTTPException(400, f"Invalid stage. Must be one of: {VALID_STAGES}")
-    for k, v in payload.model_dump().items():
+    for k, v in payload.model_dump(exclude={"stage"}).items():
         setattr(d, k, v)
+    _set_stage(d, payload.stage)
     db.commit()
     db.refresh(d)
     return d
@@ -89,7 +152,7 @@ def update_deal_stage(
         raise HTTPException(404, "Deal not found")
     if payload.stage not in VALID_STAGES:
         raise HTTPException(400, f"Invalid stage. Must be one of: {VALID_STAGES}")
-    d.stage = payload.stage
+    _set_stage(d, payload.stage)
     db.commit()
     db.refresh(d)
     return d
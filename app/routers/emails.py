@@ -1,4 +1,5 @@
 import base64
+from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
@@ -7,6 +8,7 @@ from sqlalchemy.orm import Session
 from app.core.deps import get_ctx, get_db
 from app.core.rbac import require_perm
 from app.models.emailmsg import EmailMessage
+from app.services import archive
 from app.services.mailer import send_smtp
 
 router = APIRouter(prefix="/emails", tags=["emails"])
@@ -36,6 +38,15 @@ class EmailOut(BaseModel):
         from_attributes = True
 
 
+class EmailDetailOut(EmailOut):
+    cc: str | None
+    thread_id: str | None
+    sent_at: datetime | None
+    created_at: datetime | None
+    body_text: str | None
+    body_html: str | None
+
+
 @router.post("/send")
 def send_email(
     payload: SendEmailIn,
@@ -93,3 +104,16 @@ def list_emails(
     if entity_id:
         q = q.filter(EmailMessage.entity_id == entity_id)
     return q.order_by(EmailMessage.created_at.desc()).limit(200).all()
+
+
+@router.get("/{email_id}", response_model=EmailDetailOut)
+def get_email(
+    email_id: str,
+    db: Session = Depends(get_db),
+    ctx: dict = Depends(get_ctx),
+):
+    require_perm(ctx["role"], "emails:read")
+    em = archive.get(db, EmailMessage, email_id)
+    if not em or em.tenant_id != ctx["tenant_id"]:
+        raise HTTPException(404, "Email not found")
+    return em
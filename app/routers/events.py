@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from app.core.deps import get_ctx
+from app.core.rbac import require_perm
+from app.services import live_events
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+@router.get("")
+async def event_stream(ctx: dict = Depends(get_ctx)):
+    """Server-sent events of the tenant's deal, activity and email changes."""
+    require_perm(ctx["role"], "deals:read")
+    return StreamingResponse(
+        live_events.stream(ctx["tenant_id"]),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,4 +1,4 @@
-...existing code...
+from fastapi import APIRouter
 
 router = APIRouter(tags=["health"])
 
@@ -0,0 +1,78 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.deps import get_ctx, get_db
+from app.core.rbac import require_perm
+from app.models.invoice import Invoice
+from app.schemas.invoice import (
+    InvoiceDetailOut,
+    InvoiceOut,
+    InvoicesFromQuotesIn,
+    InvoicesFromQuotesOut,
+)
+from app.services import mydata
+from app.services.invoicing import InvoicingError, invoices_from_quotes
+
+router = APIRouter(prefix="/invoices", tags=["invoices"])
+
+
+@router.get("", response_model=list[InvoiceOut])
+def list_invoices(
+    status: str | None = None,
+    customer_id: str | None = None,
+    db: Session = Depends(get_db),
+    ctx: dict = Depends(get_ctx),
+):
+    require_perm(ctx["role"], "invoices:read")
+    q = db.query(Invoice).filter(Invoice.tenant_id == ctx["tenant_id"])
+    if status:
+        q = q.filter(Invoice.status == status)
+    if customer_id:
+        q = q.filter(Invoice.customer_id == customer_id)
+    return q.order_by(Invoice.created_at.desc()).all()
+
+
+@router.get("/{invoice_id}", response_model=InvoiceDetailOut)
+def get_invoice(
+    invoice_id: str,
+    db: Session = Depends(get_db),
+    ctx: dict = Depends(get_ctx),
+):
+    require_perm(ctx["role"], "invoices:read")
+    inv = db.get(Invoice, invoice_id, options=[selectinload(Invoice.lines)])
+    if not inv or inv.tenant_id != ctx["tenant_id"]:
+        raise HTTPException(404, "Invoice not found")
+    return inv
+
+
+@router.post(":from-quotes", response_model=InvoicesFromQuotesOut)
+def create_invoices_from_quotes(
+    payload: InvoicesFromQuotesIn,
+    db: Session = Depends(get_db),
+    ctx: dict = Depends(get_ctx),
+):
+    """Convert many accepted quotes to invoices in one transaction."""
+    require_perm(ctx["role"], "invoices:create")
+    if not payload.quote_ids:
+        raise HTTPException(400, "quote_ids is empty")
+    try:
+        ids = invoices_from_quotes(
+            db,
+            ctx["tenant_id"],
+            payload.quote_ids,
+            payload.invoice_date or date.today(),
+            series=payload.series,
+            default_vat_rate=payload.default_vat_rate,
+        )
+        queued = (
+            mydata.queue_invoices(db, ctx["tenant_id"], ids)
+            if payload.submit_mydata
+            else 0
+        )
+    except InvoicingError as e:
+        db.rollback()
+        raise HTTPException(409, str(e))
+    db.commit()
+    return {"invoice_ids": ids, "queued_for_mydata": queued}
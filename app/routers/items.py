@@ -1,30 +1,38 @@
-...existing code...
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_ctx, get_db
 from app.core.rbac import require_perm
 from app.models.item import Item
 from app.schemas.item import ItemIn, ItemOut
+from app.services import response_cache
 
 router = APIRouter(prefix="/items", tags=["items"])
 
 
 @router.get("", response_model=list[ItemOut])
 def list_items(
+    request: Request,
     category: str | None = None,
     db: Session = Depends(get_db),
     ctx: dict = Depends(get_ctx),
 ):
     require_perm(ctx["role"], "items:read")
-    q = db.query(Item).filter(Item.tenant_id == ctx["tenant_id"])
-    if category:
-        q = q.filter(Item.category == category)
-    return q.order_by(Item.name).all()
+
+    def build():
+        q = db.query(Item).filter(Item.tenant_id == ctx["tenant_id"])
+        if category:
+            q = q.filter(Item.category == category)
+        return [ItemOut.model_validate(i) for i in q.order_by(Item.name)]
+
+    return response_cache.cached(request, ctx["tenant_id"], ["items"], build)
 
 
 @router.get("/{item_id}", response_model=ItemOut)
 def get_item(
     item_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     ctx: dict = Depends(get_ctx),
 ):
@@ -32,6 +40,10 @@ def get_item(
     it = db.get(Item, item_id)
     if not it or it.tenant_id != ctx["tenant_id"]:
         raise HTTPException(404, "Item not found")
+    etag = response_cache.weak_etag(ctx["tenant_id"], ["items"], it)
+    if response_cache.matches(request, etag):
+        return response_cache.not_modified(etag)
+    response.headers["ETag"] = etag
     return it
 
 
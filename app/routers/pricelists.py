@@ -1,4 +1,4 @@
-...existing code...
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_ctx, get_db
@@ -10,6 +10,7 @@ from app.schemas.pricelist import (
     PriceListLineOut,
     PriceListOut,
 )
+from app.services import response_cache
 
 router = APIRouter(prefix="/pricelists", tags=["pricelists"])
 
@@ -17,16 +18,21 @@ router = APIRouter(prefix="/pricelists", tags=["pricelists"])
 # ── Price Lists ──────────────────────────────────────────────
 @router.get("", response_model=list[PriceListOut])
 def list_pricelists(
+    request: Request,
     db: Session = Depends(get_db),
     ctx: dict = Depends(get_ctx),
 ):
     require_perm(ctx["role"], "pricelists:read")
-    return (
-        db.query(PriceList)
-        .filter(PriceList.tenant_id == ctx["tenant_id"])
-        .order_by(PriceList.name)
-        .all()
-    )
+
+    def build():
+        return [
+            PriceListOut.model_validate(pl)
+            for pl in db.query(PriceList)
+            .filter(PriceList.tenant_id == ctx["tenant_id"])
+            .order_by(PriceList.name)
+        ]
+
+    return response_cache.cached(request, ctx["tenant_id"], ["pricelists"], build)
 
 
 @router.post("", response_model=PriceListOut)
@@ -61,19 +67,23 @@ def delete_pricelist(
 # ── Price List Lines ─────────────────────────────────────────
 @router.get("/{pricelist_id}/lines", response_model=list[PriceListLineOut])
 def list_pricelist_lines(
+    request: Request,
     pricelist_id: str,
     db: Session = Depends(get_db),
     ctx: dict = Depends(get_ctx),
 ):
     require_perm(ctx["role"], "pricelists:read")
-    return (
-        db.query(PriceListLine)
-        .filter(
-            PriceListLine.tenant_id == ctx["tenant_id"],
-            PriceListLine.pricelist_id == pricelist_id,
-        )
-        .all()
-    )
+
+    def build():
+        return [
+            PriceListLineOut.model_validate(line)
+            for line in db.query(PriceListLine).filter(
+                PriceListLine.tenant_id == ctx["tenant_id"],
+                PriceListLine.pricelist_id == pricelist_id,
+            )
+        ]
+
+    return response_cache.cached(request, ctx["tenant_id"], ["pricelist_lines"], build)
 
 
 @router.post("/{pricelist_id}/lines", response_model=PriceListLineOut)
@@ -1,33 +1,46 @@
-...existing code...
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_ctx, get_db
 from app.core.rbac import require_perm
 from app.models.company import Company
 from app.models.po import PurchaseOrder, PurchaseOrderLine
-from app.schemas.po import POCreate, POOut
+from app.schemas.po import POBatchIn, POBatchOut, POCreate, POOut
+from app.services import doc_batch, response_cache
 from app.services.pdf import render_doc_pdf
 
 router = APIRouter(prefix="/purchase-orders", tags=["purchase-orders"])
 
+SORT_FIELDS = {
+    "created_at": PurchaseOrder.created_at,
+    "grand_total": PurchaseOrder.grand_total,
+}
+
 
 @router.get("", response_model=list[POOut])
 def list_pos(
+    min_total: float | None = None,
+    max_total: float | None = None,
+    sort: str = "created_at",
     db: Session = Depends(get_db),
     ctx: dict = Depends(get_ctx),
 ):
     require_perm(ctx["role"], "po:read")
-    return (
-        db.query(PurchaseOrder)
-        .filter(PurchaseOrder.tenant_id == ctx["tenant_id"])
-        .order_by(PurchaseOrder.created_at.desc())
-        .all()
-    )
+    if sort not in SORT_FIELDS:
+        raise HTTPException(400, f"Invalid sort. Must be one of: {set(SORT_FIELDS)}")
+    q = db.query(PurchaseOrder).filter(PurchaseOrder.tenant_id == ctx["tenant_id"])
+    if min_total is not None:
+        q = q.filter(PurchaseOrder.grand_total >= min_total)
+    if max_total is not None:
+        q = q.filter(PurchaseOrder.grand_total <= max_total)
+    return q.order_by(SORT_FIELDS[sort].desc()).all()
 
 
 @router.get("/{po_id}", response_model=POOut)
 def get_po(
     po_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     ctx: dict = Depends(get_ctx),
 ):
@@ -35,6 +48,12 @@ def get_po(
     po = db.get(PurchaseOrder, po_id)
     if not po or po.tenant_id != ctx["tenant_id"]:
         raise HTTPException(404, "PO not found")
+    etag = response_cache.weak_etag(
+        ctx["tenant_id"], ["purchase_orders", "purchase_order_lines"], po
+    )
+    if response_cache.matches(request, etag):
+        return response_cache.not_modified(etag)
+    response.headers["ETag"] = etag
     return po
 
 
@@ -65,6 +84,7 @@ def create_po(
                 qty=ln.qty,
                 unit=ln.unit,
                 unit_price=ln.unit_price,
+                vat_rate=ln.vat_rate,
             )
         )
     db.add(po)
@@ -73,9 +93,33 @@ def create_po(
     return po
 
 
+@router.post(":batch", response_model=POBatchOut)
+def create_pos_batch(
+    payload: POBatchIn,
+    db: Session = Depends(get_db),
+    ctx: dict = Depends(get_ctx),
+):
+    """Create many purchase orders with their lines in one transaction."""
+    require_perm(ctx["role"], "po:create")
+    if not payload.purchase_orders:
+        raise HTTPException(400, "purchase_orders is empty")
+    if len(payload.purchase_orders) > doc_batch.MAX_BATCH:
+        raise HTTPException(
+            400, f"At most {doc_batch.MAX_BATCH} purchase orders per batch"
+        )
+    try:
+        ids = doc_batch.create_pos(db, ctx["tenant_id"], payload.purchase_orders)
+    except doc_batch.BatchError as e:
+        db.rollback()
+        raise HTTPException(404, str(e))
+    db.commit()
+    return {"ids": ids}
+
+
 @router.get("/{po_id}/pdf")
 def po_pdf(
     po_id: str,
+    request: Request,
     db: Session = Depends(get_db),
     ctx: dict = Depends(get_ctx),
 ):
@@ -84,6 +128,14 @@ def po_pdf(
     if not po or po.tenant_id != ctx["tenant_id"]:
         raise HTTPException(404, "PO not found")
     supplier = db.get(Company, po.supplier_id)
+    etag = response_cache.weak_etag(
+        ctx["tenant_id"],
+        ["purchase_orders", "purchase_order_lines", "companies"],
+        po,
+        supplier,
+    )
+    if response_cache.matches(request, etag):
+        return response_cache.not_modified(etag)
     pdf = render_doc_pdf(
         "Purchase Order",
         po.po_number,
@@ -97,6 +149,7 @@ def po_pdf(
         content=pdf,
         media_type="application/pdf",
         headers={
-            "Content-Disposition": f'inline; filename="PO_{po.po_number}.pdf"'
+            "Content-Disposition": f'inline; filename="PO_{po.po_number}.pdf"',
+            "ETag": etag,
         },
     )
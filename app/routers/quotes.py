@@ -1,33 +1,51 @@
-...existing code...
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_ctx, get_db
 from app.core.rbac import require_perm
 from app.models.company import Company
+from app.models.item import Item
 from app.models.quote import Quote, QuoteLine
-from app.schemas.quote import QuoteCreate, QuoteOut
+from app.schemas.quote import (
+    QuoteBatchIn,
+    QuoteBatchOut,
+    QuoteCreate,
+    QuoteOut,
+    QuoteStatusUpdate,
+)
+from app.services import doc_batch, response_cache
 from app.services.pdf import render_doc_pdf
 
 router = APIRouter(prefix="/quotes", tags=["quotes"])
 
+VALID_STATUSES = {"draft", "sent", "accepted", "rejected", "invoiced"}
+SORT_FIELDS = {"created_at": Quote.created_at, "grand_total": Quote.grand_total}
+
 
 @router.get("", response_model=list[QuoteOut])
 def list_quotes(
+    min_total: float | None = None,
+    max_total: float | None = None,
+    sort: str = "created_at",
     db: Session = Depends(get_db),
     ctx: dict = Depends(get_ctx),
 ):
     require_perm(ctx["role"], "quotes:read")
-    return (
-        db.query(Quote)
-        .filter(Quote.tenant_id == ctx["tenant_id"])
-        .order_by(Quote.created_at.desc())
-        .all()
-    )
+    if sort not in SORT_FIELDS:
+        raise HTTPException(400, f"Invalid sort. Must be one of: {set(SORT_FIELDS)}")
+    q = db.query(Quote).filter(Quote.tenant_id == ctx["tenant_id"])
+    if min_total is not None:
+        q = q.filter(Quote.grand_total >= min_total)
+    if max_total is not None:
+        q = q.filter(Quote.grand_total <= max_total)
+    return q.order_by(SORT_FIELDS[sort].desc()).all()
 
 
 @router.get("/{quote_id}", response_model=QuoteOut)
 def get_quote(
     quote_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     ctx: dict = Depends(get_ctx),
 ):
@@ -35,6 +53,10 @@ def get_quote(
     q = db.get(Quote, quote_id)
     if not q or q.tenant_id != ctx["tenant_id"]:
         raise HTTPException(404, "Quote not found")
+    etag = response_cache.weak_etag(ctx["tenant_id"], ["quotes", "quote_lines"], q)
+    if response_cache.matches(request, etag):
+        return response_cache.not_modified(etag)
+    response.headers["ETag"] = etag
     return q
 
 
@@ -49,6 +71,21 @@ def create_quote(
     if not customer or customer.tenant_id != ctx["tenant_id"]:
         raise HTTPException(404, "Customer not found")
 
+    # one query both checks the items belong to the tenant and supplies VAT rates
+    item_ids = {ln.item_id for ln in payload.lines if ln.item_id}
+    vat_by_item = (
+        dict(
+            db.query(Item.id, Item.vat_rate).filter(
+                Item.tenant_id == ctx["tenant_id"], Item.id.in_(item_ids)
+            )
+        )
+        if item_ids
+        else {}
+    )
+    missing = item_ids - vat_by_item.keys()
+    if missing:
+        raise HTTPException(404, f"Items not found: {', '.join(sorted(missing))}")
+
     quote = Quote(
         tenant_id=ctx["tenant_id"],
         customer_id=payload.customer_id,
@@ -61,10 +98,16 @@ def create_quote(
         quote.lines.append(
             QuoteLine(
                 tenant_id=ctx["tenant_id"],
+                item_id=ln.item_id,
                 description=ln.description,
                 qty=ln.qty,
                 unit=ln.unit,
                 unit_price=ln.unit_price,
+                vat_rate=(
+                    ln.vat_rate
+                    if ln.vat_rate is not None
+                    else vat_by_item.get(ln.item_id, 0)
+                ),
             )
         )
     db.add(quote)
@@ -73,9 +116,52 @@ def create_quote(
     return quote
 
 
+@router.post(":batch", response_model=QuoteBatchOut)
+def create_quotes_batch(
+    payload: QuoteBatchIn,
+    db: Session = Depends(get_db),
+    ctx: dict = Depends(get_ctx),
+):
+    """Create many quotes with their lines in one transaction."""
+    require_perm(ctx["role"], "quotes:create")
+    if not payload.quotes:
+        raise HTTPException(400, "quotes is empty")
+    if len(payload.quotes) > doc_batch.MAX_BATCH:
+        raise HTTPException(400, f"At most {doc_batch.MAX_BATCH} quotes per batch")
+    try:
+        ids = doc_batch.create_quotes(db, ctx["tenant_id"], payload.quotes)
+    except doc_batch.BatchError as e:
+        db.rollback()
+        raise HTTPException(404, str(e))
+    db.commit()
+    return {"ids": ids}
+
+
+@router.patch("/{quote_id}/status", response_model=QuoteOut)
+def update_quote_status(
+    quote_id: str,
+    payload: QuoteStatusUpdate,
+    db: Session = Depends(get_db),
+    ctx: dict = Depends(get_ctx),
+):
+    require_perm(ctx["role"], "quotes:update")
+    q = db.get(Quote, quote_id)
+    if not q or q.tenant_id != ctx["tenant_id"]:
+        raise HTTPException(404, "Quote not found")
+    if payload.status not in VALID_STATUSES or payload.status == "invoiced":
+        raise HTTPException(400, "Invalid status (quotes become 'invoiced' via /invoices)")
+    if q.status == "invoiced":
+        raise HTTPException(409, "Quote already invoiced")
+    q.status = payload.status
+    db.commit()
+    db.refresh(q)
+    return q
+
+
 @router.get("/{quote_id}/pdf")
 def quote_pdf(
     quote_id: str,
+    request: Request,
     db: Session = Depends(get_db),
     ctx: dict = Depends(get_ctx),
 ):
@@ -84,6 +170,11 @@ def quote_pdf(
     if not quote or quote.tenant_id != ctx["tenant_id"]:
         raise HTTPException(404, "Quote not found")
     customer = db.get(Company, quote.customer_id)
+    etag = response_cache.weak_etag(
+        ctx["tenant_id"], ["quotes", "quote_lines", "companies"], quote, customer
+    )
+    if response_cache.matches(request, etag):
+        return response_cache.not_modified(etag)
     pdf = render_doc_pdf(
         "Quotation",
         quote.quote_number,
@@ -97,6 +188,7 @@ def quote_pdf(
         content=pdf,
         media_type="application/pdf",
         headers={
-            "Content-Disposition": f'inline; filename="Quote_{quote.quote_number}.pdf"'
+            "Content-Disposition": f'inline; filename="Quote_{quote.quote_number}.pdf"',
+            "ETag": etag,
         },
     )
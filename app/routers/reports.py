@@ -0,0 +1,63 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.deps import get_ctx, get_db
+from app.core.rbac import require_perm
+from app.schemas.report import TrendPoint
+from app.services.rollups import trend
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+VALID_GRAINS = {"month", "quarter", "year"}
+
+
+def _trend(db, ctx, metrics, grain, date_from, date_to, by_partner):
+    require_perm(ctx["role"], "reports:read")
+    if grain not in VALID_GRAINS:
+        raise HTTPException(400, f"Invalid grain. Must be one of: {VALID_GRAINS}")
+    return trend(
+        db, ctx["tenant_id"], metrics, grain, date_from, date_to, by_partner
+    )
+
+
+@router.get("/revenue", response_model=list[TrendPoint])
+def revenue_report(
+    grain: str = "month",
+    date_from: date | None = None,
+    date_to: date | None = None,
+    by_customer: bool = False,
+    db: Session = Depends(get_db),
+    ctx: dict = Depends(get_ctx),
+):
+    """Quotes issued (count/value) per period."""
+    return _trend(db, ctx, ["quotes_issued"], grain, date_from, date_to, by_customer)
+
+
+@router.get("/purchasing", response_model=list[TrendPoint])
+def purchasing_report(
+    grain: str = "month",
+    date_from: date | None = None,
+    date_to: date | None = None,
+    by_supplier: bool = False,
+    db: Session = Depends(get_db),
+    ctx: dict = Depends(get_ctx),
+):
+    """Purchase orders issued (count/value) per period."""
+    return _trend(db, ctx, ["pos_issued"], grain, date_from, date_to, by_supplier)
+
+
+@router.get("/deals", response_model=list[TrendPoint])
+def deals_report(
+    grain: str = "month",
+    date_from: date | None = None,
+    date_to: date | None = None,
+    by_customer: bool = False,
+    db: Session = Depends(get_db),
+    ctx: dict = Depends(get_ctx),
+):
+    """Deals won and lost (count/value) per period of closing."""
+    return _trend(
+        db, ctx, ["deals_won", "deals_lost"], grain, date_from, date_to, by_customer
+    )
@@ -0,0 +1,97 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.deps import get_ctx, get_db
+from app.core.rbac import require_perm
+from app.models.webhook import WebhookDelivery, WebhookSubscription
+from app.schemas.webhook import (
+    RedeliverOut,
+    WebhookCreatedOut,
+    WebhookDeliveryOut,
+    WebhookIn,
+    WebhookOut,
+)
+from app.services import webhooks
+
+router = APIRouter(prefix="/webhooks", tags=["webhooks"])
+
+
+def _get(db: Session, ctx: dict, webhook_id: str) -> WebhookSubscription:
+    sub = db.get(WebhookSubscription, webhook_id)
+    if not sub or sub.tenant_id != ctx["tenant_id"]:
+        raise HTTPException(404, "Webhook not found")
+    return sub
+
+
+@router.get("", response_model=list[WebhookOut])
+def list_webhooks(
+    db: Session = Depends(get_db),
+    ctx: dict = Depends(get_ctx),
+):
+    require_perm(ctx["role"], "webhooks:read")
+    return (
+        db.query(WebhookSubscription)
+        .filter(WebhookSubscription.tenant_id == ctx["tenant_id"])
+        .order_by(WebhookSubscription.created_at)
+        .all()
+    )
+
+
+@router.post("", response_model=WebhookCreatedOut)
+def create_webhook(
+    payload: WebhookIn,
+    db: Session = Depends(get_db),
+    ctx: dict = Depends(get_ctx),
+):
+    require_perm(ctx["role"], "webhooks:create")
+    try:
+        sub = webhooks.create_subscription(
+            db, ctx["tenant_id"], payload.url, payload.topics
+        )
+    except webhooks.InvalidSubscription as e:
+        raise HTTPException(422, str(e))
+    db.commit()
+    db.refresh(sub)
+    return sub
+
+
+@router.delete("/{webhook_id}")
+def delete_webhook(
+    webhook_id: str,
+    db: Session = Depends(get_db),
+    ctx: dict = Depends(get_ctx),
+):
+    require_perm(ctx["role"], "webhooks:delete")
+    webhooks.delete_subscription(db, _get(db, ctx, webhook_id))
+    db.commit()
+    return {"ok": True}
+
+
+@router.get("/{webhook_id}/deliveries", response_model=list[WebhookDeliveryOut])
+def list_deliveries(
+    webhook_id: str,
+    status: str | None = None,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    ctx: dict = Depends(get_ctx),
+):
+    """Latest deliveries first; ``status=dead`` lists the dead letters."""
+    require_perm(ctx["role"], "webhooks:read")
+    sub = _get(db, ctx, webhook_id)
+    q = db.query(WebhookDelivery).filter(WebhookDelivery.subscription_id == sub.id)
+    if status:
+        q = q.filter(WebhookDelivery.status == status)
+    return q.order_by(WebhookDelivery.event_seq.desc()).limit(min(limit, 500)).all()
+
+
+@router.post("/{webhook_id}/redeliver", response_model=RedeliverOut)
+def redeliver(
+    webhook_id: str,
+    db: Session = Depends(get_db),
+    ctx: dict = Depends(get_ctx),
+):
+    """Requeue the dead letters and reactivate the subscription."""
+    require_perm(ctx["role"], "webhooks:update")
+    n = webhooks.redeliver(db, _get(db, ctx, webhook_id))
+    db.commit()
+    return {"requeued": n}
@@ -24,3 +24,9 @@ class ActivityOut(ActivityIn):
 
 class ActivityComplete(BaseModel):
     completed_at: datetime | None = None
+
+
+class AgendaOut(BaseModel):
+    overdue: list[ActivityOut]
+    today: list[ActivityOut]
+    this_week: list[ActivityOut]
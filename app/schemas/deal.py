@@ -1,4 +1,4 @@
-from datetime import date
+from datetime import date, datetime
 
 from pydantic import BaseModel
 
@@ -18,6 +18,8 @@ class DealIn(BaseModel):
 class DealOut(DealIn):
     id: str
     tenant_id: str
+    win_probability: float | None = None
+    scored_at: datetime | None = None
 
     class Config:
         from_attributes = True
@@ -25,3 +27,39 @@ class DealOut(DealIn):
 
 class DealStageUpdate(BaseModel):
     stage: str
+
+
+class DealBulkStageUpdate(BaseModel):
+    deal_ids: list[str]
+    stage: str
+
+
+class PipelineStageOut(BaseModel):
+    stage: str
+    count: int
+    value: float
+
+
+class DealBulkStageOut(BaseModel):
+    moved: int
+    pipeline: list[PipelineStageOut]
+
+
+class FunnelStageOut(BaseModel):
+    stage: str
+    entered: int
+    conversion: float | None  # share that went on to the next stage
+    median_days: float | None
+
+
+class FunnelAssigneeOut(BaseModel):
+    assigned_to: str | None
+    won: int
+    lost: int
+    win_rate: float | None
+
+
+class FunnelOut(BaseModel):
+    stages: list[FunnelStageOut]
+    win_rate: float | None
+    by_assignee: list[FunnelAssigneeOut]
@@ -0,0 +1,51 @@
+from datetime import date
+
+from pydantic import BaseModel, Field
+
+
+class InvoiceLineOut(BaseModel):
+    id: str
+    description: str
+    qty: float
+    unit: str
+    unit_price: float
+    vat_rate: float
+
+    class Config:
+        from_attributes = True
+
+
+class InvoiceOut(BaseModel):
+    id: str
+    tenant_id: str
+    customer_id: str
+    quote_id: str | None
+    invoice_number: str
+    invoice_date: date
+    currency: str
+    net_total: float
+    vat_total: float
+    total: float
+    status: str
+    mydata_mark: str | None
+    notes: str | None
+
+    class Config:
+        from_attributes = True
+
+
+class InvoiceDetailOut(InvoiceOut):
+    lines: list[InvoiceLineOut]
+
+
+class InvoicesFromQuotesIn(BaseModel):
+    quote_ids: list[str]
+    invoice_date: date | None = None  # defaults to today
+    series: str = Field("INV", min_length=1, max_length=20)
+    default_vat_rate: float = 0  # for quote lines without an item
+    submit_mydata: bool = True
+
+
+class InvoicesFromQuotesOut(BaseModel):
+    invoice_ids: list[str]
+    queued_for_mydata: int
@@ -8,6 +8,7 @@ class POLineIn(BaseModel):
     qty: float
     unit: str = "pcs"
     unit_price: float
+    vat_rate: float | None = None
 
 
 class POCreate(BaseModel):
@@ -19,6 +20,10 @@ class POCreate(BaseModel):
     lines: list[POLineIn]
 
 
+class POBatchIn(BaseModel):
+    purchase_orders: list[POCreate]
+
+
 class POOut(BaseModel):
     id: str
     tenant_id: str
@@ -28,6 +33,13 @@ class POOut(BaseModel):
     currency: str
     status: str
     notes: str | None
+    subtotal: float
+    vat_total: float
+    grand_total: float
 
     class Config:
         from_attributes = True
+
+
+class POBatchOut(BaseModel):
+    ids: list[str]
@@ -4,10 +4,12 @@ from pydantic import BaseModel
 
 
 class QuoteLineIn(BaseModel):
+    item_id: str | None = None
     description: str
     qty: float
     unit: str = "pcs"
     unit_price: float
+    vat_rate: float | None = None
 
 
 class QuoteCreate(BaseModel):
@@ -19,6 +21,10 @@ class QuoteCreate(BaseModel):
     lines: list[QuoteLineIn]
 
 
+class QuoteBatchIn(BaseModel):
+    quotes: list[QuoteCreate]
+
+
 class QuoteOut(BaseModel):
     id: str
     tenant_id: str
@@ -28,6 +34,17 @@ class QuoteOut(BaseModel):
     currency: str
     status: str
     notes: str | None
+    subtotal: float
+    vat_total: float
+    grand_total: float
 
     class Config:
         from_attributes = True
+
+
+class QuoteStatusUpdate(BaseModel):
+    status: str
+
+
+class QuoteBatchOut(BaseModel):
+    ids: list[str]
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+
+class TrendPoint(BaseModel):
+    period: str  # 2026 / 2026-Q3 / 2026-07
+    metric: str
+    currency: str
+    partner_id: str | None = None
+    count: int
+    value: float
@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class WebhookIn(BaseModel):
+    url: str
+    topics: list[str] | None = None  # None = every topic
+
+
+class WebhookOut(BaseModel):
+    id: str
+    tenant_id: str
+    url: str
+    topics: list[str]
+    active: bool
+    failures: int
+    retry_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
+
+
+class WebhookCreatedOut(WebhookOut):
+    secret: str  # only returned on create; receivers verify signatures with it
+
+
+class WebhookDeliveryOut(BaseModel):
+    id: str
+    event_seq: int
+    status: str
+    attempts: int
+    error: str | None = None
+    created_at: datetime
+    delivered_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
+
+
+class RedeliverOut(BaseModel):
+    requeued: int
@@ -0,0 +1,151 @@
+"""Per-user agenda of open activities: overdue, due today, due this week.
+
+With ``REDIS_URL`` set every (tenant, user) has a sorted set of open activity
+ids scored by ``due_at``, built from the database on first read and kept in
+step by session listeners (wired up in ``app.core.db``): activity inserts,
+updates, completions and deletes are collected on flush and applied after
+commit, so completing an activity drops it from the set. The sets expire
+after ``AGENDA_TTL`` and are rebuilt, which bounds drift from Core writes
+and from updates dropped while Redis was unreachable.
+Without Redis the agenda is read from ``ix_activities_tenant_assignee_due``.
+
+Day and week boundaries are UTC; weeks end on Sunday night.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from app.core.redis_client import get_redis
+from app.models.activity import Activity
+
+log = logging.getLogger(__name__)
+
+AGENDA_TTL = 24 * 3600
+BUILT = "__built__"  # sentinel member: the set has been loaded from the DB
+
+
+def _key(tenant_id: str, user_id: str) -> str:
+    return f"agenda:{tenant_id}:{user_id}"
+
+
+def _aware(v: datetime) -> datetime:
+    return v if v.tzinfo else v.replace(tzinfo=timezone.utc)
+
+
+def _bounds(now: datetime) -> tuple[datetime, datetime]:
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return today + timedelta(days=1), today + timedelta(days=7 - today.weekday())
+
+
+def _open_query(db: Session, tenant_id: str, user_id: str):
+    return (
+        db.query(Activity)
+        .filter(
+            Activity.tenant_id == tenant_id,
+            Activity.assigned_to == user_id,
+            Activity.completed_at.is_(None),
+            Activity.due_at.isnot(None),
+        )
+        .order_by(Activity.due_at)
+    )
+
+
+def _rebuild(r, db: Session, tenant_id: str, user_id: str) -> None:
+    rows = _open_query(db, tenant_id, user_id).with_entities(
+        Activity.id, Activity.due_at
+    )
+    key = _key(tenant_id, user_id)
+    pipe = r.pipeline()
+    pipe.delete(key)
+    pipe.zadd(key, {BUILT: float("inf")})
+    mapping = {i: _aware(due).timestamp() for i, due in rows}
+    if mapping:
+        pipe.zadd(key, mapping)
+    pipe.expire(key, AGENDA_TTL)
+    pipe.execute()
+
+
+def agenda(
+    db: Session, tenant_id: str, user_id: str, now: datetime | None = None
+) -> dict[str, list[Activity]]:
+    now = now or datetime.now(timezone.utc)
+    today_end, week_end = _bounds(now)
+
+    r = get_redis()
+    if r is None:
+        items = _open_query(db, tenant_id, user_id).filter(
+            Activity.due_at < week_end
+        ).all()
+    else:
+        key = _key(tenant_id, user_id)
+        if r.zscore(key, BUILT) is None:
+            _rebuild(r, db, tenant_id, user_id)
+        ids = [
+            m.decode()
+            for m in r.zrangebyscore(key, "-inf", f"({week_end.timestamp()}")
+        ]
+        by_id = {}
+        if ids:
+            by_id = {
+                a.id: a
+                for a in db.query(Activity).filter(
+                    Activity.tenant_id == tenant_id, Activity.id.in_(ids)
+                )
+            }
+        items = [by_id[i] for i in ids if i in by_id]
+
+    out = {"overdue": [], "today": [], "this_week": []}
+    for a in items:
+        due = _aware(a.due_at)
+        bucket = "overdue" if due < now else "today" if due < today_end else "this_week"
+        out[bucket].append(a)
+    return out
+
+
+# ── Maintenance (session listeners) ──────────────────────────
+def after_flush(session, flush_context):
+    if get_redis() is None:
+        return
+    changes = session.info.setdefault("agenda", [])
+    for obj in session.new | session.dirty:
+        if not isinstance(obj, Activity):
+            continue
+        for old in inspect(obj).attrs.assigned_to.history.deleted:
+            if old:
+                changes.append((obj.tenant_id, old, obj.id, None))
+        if obj.assigned_to:
+            score = (
+                _aware(obj.due_at).timestamp()
+                if obj.due_at and obj.completed_at is None
+                else None
+            )
+            changes.append((obj.tenant_id, obj.assigned_to, obj.id, score))
+    for obj in session.deleted:
+        if isinstance(obj, Activity) and obj.assigned_to:
+            changes.append((obj.tenant_id, obj.assigned_to, obj.id, None))
+
+
+def after_commit(session):
+    changes = session.info.pop("agenda", None)
+    r = get_redis()
+    if not changes or r is None:
+        return
+    try:
+        pipe = r.pipeline()
+        for tenant_id, user_id, activity_id, score in changes:
+            key = _key(tenant_id, user_id)
+            if score is None:
+                pipe.zrem(key, activity_id)
+            else:
+                pipe.zadd(key, {activity_id: score})
+        pipe.execute()
+    except Exception:
+        # runs after commit; the sets expire and rebuild, so dropping is safe
+        log.warning("could not apply %d agenda changes", len(changes), exc_info=True)
+
+
+def after_rollback(session):
+    session.info.pop("agenda", None)
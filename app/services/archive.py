@@ -0,0 +1,140 @@
+"""Move old email messages and completed activities into archive tables.
+
+Rows older than ``ARCHIVE_EMAILS_AFTER_DAYS`` / ``ARCHIVE_ACTIVITIES_AFTER_DAYS``
+are copied into ``email_messages_archive`` / ``activities_archive`` with one
+INSERT ... SELECT and deleted from the hot table, per tenant, in batches of
+``ARCHIVE_BATCH_SIZE`` ids (one transaction per batch). Open activities are
+never archived. Detail lookups go through ``get`` which falls back to the
+archive, so ids stay valid after archiving.
+
+    python -m app.services.archive archive [--tenant ID] [--kind emails]
+    python -m app.services.archive restore --tenant ID [--kind emails]
+        [--since 2025-01-01] [--id ID ...]
+"""
+
+import argparse
+from datetime import date, datetime, time, timedelta, timezone
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.activity import Activity
+from app.models.archive import ArchivedActivity, ArchivedEmailMessage
+from app.models.emailmsg import EmailMessage
+from app.models.tenant import Tenant
+
+# kind -> (hot model, archive model, age column, settings attribute)
+KINDS = {
+    "emails": (
+        EmailMessage, ArchivedEmailMessage, "created_at", "ARCHIVE_EMAILS_AFTER_DAYS",
+    ),
+    "activities": (
+        Activity, ArchivedActivity, "completed_at", "ARCHIVE_ACTIVITIES_AFTER_DAYS",
+    ),
+}
+ARCHIVE_OF = {hot: cold for hot, cold, _col, _setting in KINDS.values()}
+
+
+def _move(db: Session, src, dst, ids: list[str], stamp: bool) -> None:
+    cols = [c.name for c in src.__table__.columns if c.name in dst.__table__.columns]
+    sel = select(*[src.__table__.c[c] for c in cols]).where(src.id.in_(ids))
+    if stamp:
+        cols.append("archived_at")
+        sel = sel.add_columns(func.now())
+    db.execute(insert(dst.__table__).from_select(cols, sel))
+    db.execute(delete(src.__table__).where(src.id.in_(ids)))
+
+
+def _move_batches(db: Session, src, dst, where: list, stamp: bool) -> int:
+    moved = 0
+    while True:
+        ids = [
+            i for (i,) in db.execute(
+                select(src.id).where(*where).limit(settings.ARCHIVE_BATCH_SIZE)
+            )
+        ]
+        if not ids:
+            return moved
+        _move(db, src, dst, ids, stamp)
+        db.commit()
+        moved += len(ids)
+
+
+def archive_tenant(db: Session, kind: str, tenant_id: str, older_than: datetime) -> int:
+    """Archive one tenant's rows of *kind* older than *older_than*."""
+    hot, cold, age_col, _setting = KINDS[kind]
+    age = getattr(hot, age_col)
+    where = [hot.tenant_id == tenant_id, age.isnot(None), age < older_than]
+    return _move_batches(db, hot, cold, where, stamp=True)
+
+
+def archive_all(
+    db: Session, kinds: list[str] | None = None, tenant_ids: list[str] | None = None
+) -> dict[str, int]:
+    """Archive every tenant (or *tenant_ids*) using the configured ages."""
+    now = datetime.now(timezone.utc)
+    tenants = tenant_ids or [t for (t,) in db.query(Tenant.id)]
+    out = {}
+    for kind in kinds or list(KINDS):
+        days = getattr(settings, KINDS[kind][3])
+        older_than = now - timedelta(days=days)
+        out[kind] = sum(archive_tenant(db, kind, t, older_than) for t in tenants)
+    return out
+
+
+def restore(
+    db: Session,
+    kind: str,
+    tenant_id: str,
+    ids: list[str] | None = None,
+    since: date | None = None,
+) -> int:
+    """Move archived rows back into the hot table.
+
+    Restores *ids*, or everything whose age column is on/after *since*, or
+    (with neither) the tenant's whole archive.
+    """
+    hot, cold, age_col, _setting = KINDS[kind]
+    where = [cold.tenant_id == tenant_id]
+    if ids:
+        where.append(cold.id.in_(ids))
+    if since:
+        start = datetime.combine(since, time.min, tzinfo=timezone.utc)
+        where.append(getattr(cold, age_col) >= start)
+    return _move_batches(db, cold, hot, where, stamp=False)
+
+
+def get(db: Session, model, id_: str):
+    """``db.get`` with read-through to the archive table of *model*."""
+    row = db.get(model, id_)
+    if row is None and model in ARCHIVE_OF:
+        row = db.get(ARCHIVE_OF[model], id_)
+    return row
+
+
+if __name__ == "__main__":
+    from app.core.db import SessionLocal
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("command", choices=["archive", "restore"])
+    ap.add_argument("--kind", choices=list(KINDS), action="append")
+    ap.add_argument("--tenant")
+    ap.add_argument("--since", type=date.fromisoformat)
+    ap.add_argument("--id", dest="ids", action="append")
+    args = ap.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.command == "archive":
+            tenants = [args.tenant] if args.tenant else None
+            for kind, n in archive_all(db, args.kind, tenants).items():
+                print(f"{kind}: archived {n}")
+        else:
+            if not args.tenant:
+                ap.error("restore needs --tenant")
+            for kind in args.kind or list(KINDS):
+                n = restore(db, kind, args.tenant, args.ids, args.since)
+                print(f"{kind}: restored {n}")
+    finally:
+        db.close()
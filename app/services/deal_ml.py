@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import pandas as pd
 from sklearn.linear_model import LogisticRegression
 import pickle
@@ -6,6 +8,14 @@ import pickle
 # Features: amount, stage, company_size
 # Target: won (1) or lost (0)
 
+FEATURES = ['amount', 'stage', 'company_size', 'contact_count', 'email_count', 'days_open']
+STAGES = ['lead', 'qualified', 'proposal', 'negotiation', 'won', 'lost']
+DEFAULTS = {'company_size': 1, 'contact_count': 2, 'email_count': 10, 'days_open': 5}
+
+
+def stage_index(stage):
+    return STAGES.index(stage) if stage in STAGES else 0
+
 def train_deal_model():
     # Example training data with more features
     data = {
@@ -25,14 +35,42 @@ def train_deal_model():
     # Save model
     with open('deal_model.pkl', 'wb') as f:
         pickle.dump(model, f)
+    load_model.cache_clear()
     print('Model trained and saved.')
 
 
-def predict_deal(amount, stage, company_size):
+@lru_cache(maxsize=1)
+def load_model():
     with open('deal_model.pkl', 'rb') as f:
-        model = pickle.load(f)
-    # Add new features: contact_count, email_count, days_open
-    X = pd.DataFrame([[amount, stage, company_size, 2, 10, 5]],
+        return pickle.load(f)
+
+
+def win_probabilities(rows):
+    """P(won) for many deals with a single model call.
+
+    *rows* are dicts with the FEATURES keys; missing ones take DEFAULTS.
+    """
+    if not rows:
+        return []
+    model = load_model()
+    X = pd.DataFrame([{**DEFAULTS, **r} for r in rows], columns=FEATURES)
+    won = list(model.classes_).index(1)
+    return [float(p) for p in model.predict_proba(X)[:, won]]
+
+
+def days_open_features(db, deal_ids):
+    """Real days_open per deal from the stage history (one grouped query).
+
+    Deals without history are left out; callers fall back to the default.
+    """
+    from app.services.pipeline import deal_ages
+
+    return {deal_id: ages[0] for deal_id, ages in deal_ages(db, deal_ids).items()}
+
+
+def predict_deal(amount, stage, company_size, contact_count=2, email_count=10, days_open=5):
+    model = load_model()
+    X = pd.DataFrame([[amount, stage, company_size, contact_count, email_count, days_open]],
         columns=['amount', 'stage', 'company_size', 'contact_count', 'email_count', 'days_open'])
     prediction = model.predict(X)[0]
     return prediction
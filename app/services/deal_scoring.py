@@ -0,0 +1,124 @@
+"""Batch win-probability scoring of open deals.
+
+``score_deals`` runs from beat, never from a request or a page render. The
+incremental run rescores the open deals updated since the ``deals:scored``
+watermark. The nightly ``full`` run rescores every open deal, because
+``days_open`` moves even when nothing is edited. Each batch of
+``SCORE_BATCH`` deals is one model call. ``win_probability`` and
+``scored_at`` are written with a Core UPDATE that keeps ``updated_at``, so
+scoring never makes a deal look edited. Deals whose ``win_probability``
+changed get a per-row ``deals.update`` outbox event, so webhook and change
+feed consumers see new scores.
+
+A notification goes out only when a deal's predicted outcome turns into a
+win, once per change rather than once per read.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from sqlalchemy import bindparam, func, update
+from sqlalchemy.orm import Session
+
+from app.models.contact import Contact
+from app.models.deal import Deal
+from app.models.emailmsg import EmailMessage
+from app.models.watermark import Watermark
+from app.services import deal_ml, outbox
+from app.services.mailer import send_prediction_email
+from app.services.pipeline import CLOSED_STAGES
+
+WATERMARK_KEY = "deals:scored"
+SCORE_BATCH = 500
+WIN_THRESHOLD = 0.5
+
+_deals = Deal.__table__
+_store = (
+    update(_deals)
+    .where(_deals.c.id == bindparam("b_id"))
+    .values(
+        win_probability=bindparam("b_p"),
+        scored_at=bindparam("b_at"),
+        updated_at=_deals.c.updated_at,  # explicit, so onupdate does not fire
+    )
+    .execution_options(outbox=False)  # per-row events are added in _score_batch
+)
+
+
+def _features(db: Session, deals: list) -> list[dict]:
+    company_ids = {d.company_id for d in deals}
+    contacts = dict(
+        db.query(Contact.company_id, func.count(Contact.id))
+        .filter(Contact.company_id.in_(company_ids))
+        .group_by(Contact.company_id)
+    )
+    emails = dict(
+        db.query(EmailMessage.entity_id, func.count(EmailMessage.id))
+        .filter(
+            EmailMessage.entity_type == "deal",
+            EmailMessage.entity_id.in_([str(d.id) for d in deals]),
+        )
+        .group_by(EmailMessage.entity_id)
+    )
+    days_open = deal_ml.days_open_features(db, [d.id for d in deals])
+    rows = []
+    for d in deals:
+        n_contacts = contacts.get(d.company_id, 0)
+        row = {
+            "amount": float(d.value or 0),
+            "stage": deal_ml.stage_index(d.stage),
+            "company_size": n_contacts,
+            "contact_count": n_contacts,
+            "email_count": emails.get(str(d.id), 0),
+        }
+        if d.id in days_open:
+            row["days_open"] = days_open[d.id]
+        rows.append(row)
+    return rows
+
+
+def _score_batch(db: Session, deals: list, now: datetime) -> list[str]:
+    """Store scores for *deals*; returns the ids whose prediction became a win."""
+    probs = deal_ml.win_probabilities(_features(db, deals))
+    db.execute(
+        _store,
+        [{"b_id": d.id, "b_p": p, "b_at": now} for d, p in zip(deals, probs)],
+    )
+    changed: dict[str, dict] = defaultdict(dict)
+    for d, p in zip(deals, probs):
+        if p != d.win_probability:
+            changed[d.tenant_id][d.id] = {"win_probability": p, "scored_at": now}
+    for tenant_id, rows in changed.items():
+        outbox.add(db, tenant_id, "deals", "update", rows)
+    return [
+        d.id
+        for d, p in zip(deals, probs)
+        if p >= WIN_THRESHOLD
+        and (d.win_probability is None or d.win_probability < WIN_THRESHOLD)
+    ]
+
+
+def score_deals(db: Session, full: bool = False) -> int:
+    """Rescore stale open deals (all open deals with *full*); returns how many."""
+    now = datetime.now(timezone.utc)
+    wm = db.get(Watermark, WATERMARK_KEY) or Watermark(key=WATERMARK_KEY)
+    q = db.query(
+        Deal.id, Deal.tenant_id, Deal.company_id, Deal.stage, Deal.value,
+        Deal.win_probability, Deal.updated_at,
+    ).filter(Deal.stage.notin_(CLOSED_STAGES))
+    if not full and wm.value is not None:
+        q = q.filter(Deal.updated_at > wm.value)
+
+    rows = q.all()  # read up front: the batches below write to the same table
+    newly_won = []
+    for i in range(0, len(rows), SCORE_BATCH):
+        newly_won += _score_batch(db, rows[i:i + SCORE_BATCH], now)
+
+    stamps = [r.updated_at for r in rows if r.updated_at is not None]
+    if stamps:
+        wm.value = max(stamps)
+    db.merge(wm)
+    db.commit()
+    for deal_id in newly_won:
+        send_prediction_email(deal_id, 1)
+    return len(rows)
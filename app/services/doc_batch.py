@@ -0,0 +1,143 @@
+"""Bulk creation of quotes and purchase orders.
+
+A whole batch goes in with one executemany INSERT for the headers and one
+for the lines, in the caller's transaction. Partner and item ids are checked
+with one tenant-filtered ``IN`` query each, and totals are filled in with one
+UPDATE per batch:
+nothing is flushed, so the ``doc_totals`` listener never sees these rows.
+"""
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.base import uuid7
+from app.models.company import Company
+from app.models.item import Item
+from app.models.po import PurchaseOrder, PurchaseOrderLine
+from app.models.quote import Quote, QuoteLine
+from app.schemas.po import POCreate
+from app.schemas.quote import QuoteCreate
+from app.services.doc_totals import recompute_po_totals, recompute_quote_totals
+
+MAX_BATCH = 500  # documents per call
+
+
+class BatchError(ValueError):
+    pass
+
+
+def _check_partners(db: Session, tenant_id: str, ids: set[str], label: str) -> None:
+    found = {
+        i for (i,) in db.query(Company.id).filter(
+            Company.tenant_id == tenant_id, Company.id.in_(ids)
+        )
+    }
+    missing = ids - found
+    if missing:
+        raise BatchError(f"{label} not found: {', '.join(sorted(missing))}")
+
+
+def create_quotes(db: Session, tenant_id: str, docs: list[QuoteCreate]) -> list[str]:
+    """Insert *docs* with their lines; returns the new ids in input order.
+
+    Does not commit.
+    """
+    _check_partners(db, tenant_id, {d.customer_id for d in docs}, "Customer")
+    item_ids = {ln.item_id for d in docs for ln in d.lines if ln.item_id}
+    vat_by_item = (
+        dict(
+            db.query(Item.id, Item.vat_rate).filter(
+                Item.tenant_id == tenant_id, Item.id.in_(item_ids)
+            )
+        )
+        if item_ids
+        else {}
+    )
+    missing = item_ids - vat_by_item.keys()
+    if missing:
+        raise BatchError(f"Items not found: {', '.join(sorted(missing))}")
+
+    ids, headers, lines = [], [], []
+    for d in docs:
+        quote_id = uuid7()
+        ids.append(quote_id)
+        headers.append(
+            {
+                "id": quote_id,
+                "tenant_id": tenant_id,
+                "customer_id": d.customer_id,
+                "quote_number": d.quote_number,
+                "quote_date": d.quote_date,
+                "currency": d.currency,
+                "status": "draft",
+                "notes": d.notes,
+            }
+        )
+        for ln in d.lines:
+            lines.append(
+                {
+                    "id": uuid7(),
+                    "tenant_id": tenant_id,
+                    "quote_id": quote_id,
+                    "item_id": ln.item_id,
+                    "description": ln.description,
+                    "qty": ln.qty,
+                    "unit": ln.unit,
+                    "unit_price": ln.unit_price,
+                    "vat_rate": (
+                        ln.vat_rate
+                        if ln.vat_rate is not None
+                        else vat_by_item.get(ln.item_id, 0)
+                    ),
+                }
+            )
+
+    db.execute(insert(Quote), headers)
+    if lines:
+        db.execute(insert(QuoteLine), lines)
+    recompute_quote_totals(db, ids)
+    return ids
+
+
+def create_pos(db: Session, tenant_id: str, docs: list[POCreate]) -> list[str]:
+    """Insert *docs* with their lines; returns the new ids in input order.
+
+    Does not commit.
+    """
+    _check_partners(db, tenant_id, {d.supplier_id for d in docs}, "Supplier")
+
+    ids, headers, lines = [], [], []
+    for d in docs:
+        po_id = uuid7()
+        ids.append(po_id)
+        headers.append(
+            {
+                "id": po_id,
+                "tenant_id": tenant_id,
+                "supplier_id": d.supplier_id,
+                "po_number": d.po_number,
+                "po_date": d.po_date,
+                "currency": d.currency,
+                "status": "draft",
+                "notes": d.notes,
+            }
+        )
+        for ln in d.lines:
+            lines.append(
+                {
+                    "id": uuid7(),
+                    "tenant_id": tenant_id,
+                    "po_id": po_id,
+                    "description": ln.description,
+                    "qty": ln.qty,
+                    "unit": ln.unit,
+                    "unit_price": ln.unit_price,
+                    "vat_rate": ln.vat_rate,
+                }
+            )
+
+    db.execute(insert(PurchaseOrder), headers)
+    if lines:
+        db.execute(insert(PurchaseOrderLine), lines)
+    recompute_po_totals(db, ids)
+    return ids
@@ -0,0 +1,100 @@
+"""Denormalized subtotal / VAT / grand total on quotes and purchase orders.
+
+The header columns are refreshed from the lines with one correlated UPDATE
+per document type. A session ``after_flush`` listener (wired up in
+``app.core.db``) does this for every document whose lines were inserted,
+updated or deleted through the ORM; Core bulk inserts must call
+``recompute_quote_totals`` / ``recompute_po_totals`` themselves.
+
+The UPDATE goes straight to the connection, past the outbox listener, so
+each recompute records an outbox ``update`` event per document with its new
+totals; otherwise consumers would keep the zero totals of the insert event.
+"""
+
+from collections import defaultdict
+
+from sqlalchemy import func, inspect, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+
+from app.models.po import PurchaseOrder, PurchaseOrderLine
+from app.models.quote import Quote, QuoteLine
+from app.services import outbox
+
+TOTAL_FIELDS = ["subtotal", "vat_total", "grand_total"]
+
+
+def _totals_stmt(doc_table, line_table, fk_col, ids):
+    net = line_table.c.qty * line_table.c.unit_price
+    vat = net * func.coalesce(line_table.c.vat_rate, 0) / 100
+    sub = (
+        select(func.coalesce(func.sum(net), 0))
+        .where(fk_col == doc_table.c.id)
+        .scalar_subquery()
+    )
+    vat_sum = (
+        select(func.coalesce(func.sum(vat), 0))
+        .where(fk_col == doc_table.c.id)
+        .scalar_subquery()
+    )
+    return (
+        update(doc_table)
+        .where(doc_table.c.id.in_(ids))
+        .values(subtotal=sub, vat_total=vat_sum, grand_total=sub + vat_sum)
+    )
+
+
+def _record(db: Session, doc_table, ids) -> None:
+    """Outbox events carrying the new totals of *ids*."""
+    cols = [doc_table.c.id, doc_table.c.tenant_id, *(doc_table.c[f] for f in TOTAL_FIELDS)]
+    rows = db.connection().execute(select(*cols).where(doc_table.c.id.in_(ids)))
+    by_tenant: dict[str, dict] = defaultdict(dict)
+    for r in rows:
+        by_tenant[r.tenant_id][r.id] = {f: getattr(r, f) for f in TOTAL_FIELDS}
+    for tenant_id, changes in by_tenant.items():
+        outbox.add(db, tenant_id, doc_table.name, "update", changes)
+
+
+def recompute_quote_totals(db: Session, quote_ids) -> None:
+    ids = list(quote_ids)
+    if ids:
+        t, lt = Quote.__table__, QuoteLine.__table__
+        db.connection().execute(_totals_stmt(t, lt, lt.c.quote_id, ids))
+        _record(db, t, ids)
+
+
+def recompute_po_totals(db: Session, po_ids) -> None:
+    ids = list(po_ids)
+    if ids:
+        t, lt = PurchaseOrder.__table__, PurchaseOrderLine.__table__
+        db.connection().execute(_totals_stmt(t, lt, lt.c.po_id, ids))
+        _record(db, t, ids)
+
+
+def _parent_ids(obj, fk: str) -> set[str]:
+    """Current and previous parent id of a line (covers re-parented lines)."""
+    hist = inspect(obj).attrs[fk].history
+    ids = {v for v in (*hist.added, *hist.unchanged, *hist.deleted) if v}
+    if not ids and getattr(obj, fk, None):
+        ids.add(getattr(obj, fk))
+    return ids
+
+
+def after_flush(session: Session, flush_context) -> None:
+    quote_ids: set[str] = set()
+    po_ids: set[str] = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, QuoteLine):
+            quote_ids |= _parent_ids(obj, "quote_id")
+        elif isinstance(obj, PurchaseOrderLine):
+            po_ids |= _parent_ids(obj, "po_id")
+    if not (quote_ids or po_ids):
+        return
+    recompute_quote_totals(session, quote_ids)
+    recompute_po_totals(session, po_ids)
+    # loaded headers now hold stale totals; reload them on next access
+    for model, ids in ((Quote, quote_ids), (PurchaseOrder, po_ids)):
+        for doc_id in ids:
+            doc = session.identity_map.get(identity_key(model, doc_id))
+            if doc is not None:
+                session.expire(doc, TOTAL_FIELDS)
@@ -0,0 +1,176 @@
+"""Invoice generation from accepted quotes.
+
+All quotes of a request are converted in one transaction: headers and lines
+are bulk-inserted and the net/VAT/gross totals of every new invoice come
+from a single GROUP BY over ``invoice_lines``. Numbers come from a locked
+per-tenant ``invoice_series`` counter, so concurrent conversions never share
+one; ``uq_invoices_tenant_number`` backs that up.
+"""
+
+from datetime import date
+
+from sqlalchemy import func, insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
+
+from app.models.base import uuid7
+from app.models.invoice import Invoice, InvoiceLine, InvoiceSeries
+from app.models.item import Item
+from app.models.quote import Quote
+
+
+class InvoicingError(ValueError):
+    pass
+
+
+def recompute_totals(db: Session, invoice_ids: list[str]) -> None:
+    """Refresh net/VAT/gross of *invoice_ids* with one aggregate query."""
+    if not invoice_ids:
+        return
+    line_net = InvoiceLine.qty * InvoiceLine.unit_price
+    rows = (
+        db.query(
+            InvoiceLine.invoice_id,
+            func.coalesce(func.sum(line_net), 0),
+            func.coalesce(func.sum(line_net * InvoiceLine.vat_rate / 100), 0),
+        )
+        .filter(InvoiceLine.invoice_id.in_(invoice_ids))
+        .group_by(InvoiceLine.invoice_id)
+        .all()
+    )
+    totals = {inv_id: (net, vat) for inv_id, net, vat in rows}
+    params = []
+    for inv_id in invoice_ids:
+        net, vat = totals.get(inv_id, (0, 0))
+        params.append(
+            {"id": inv_id, "net_total": net, "vat_total": vat, "total": net + vat}
+        )
+    # ORM bulk UPDATE by primary key: one executemany for all invoices
+    db.execute(update(Invoice), params)
+
+
+def _series_row(db: Session, tenant_id: str, series: str) -> InvoiceSeries:
+    """The series counter, row-locked until commit.
+
+    SQLite ignores FOR UPDATE; there the write lock taken by the quote claim
+    already serializes conversions.
+    """
+    q = (
+        db.query(InvoiceSeries)
+        .filter(InvoiceSeries.tenant_id == tenant_id, InvoiceSeries.series == series)
+        .with_for_update()
+    )
+    row = q.one_or_none()
+    if row is not None:
+        return row
+    try:
+        with db.begin_nested():
+            row = InvoiceSeries(tenant_id=tenant_id, series=series, last_number=0)
+            db.add(row)
+    except IntegrityError:
+        return q.one()  # a concurrent first use created it
+    return row
+
+
+def _reserve_numbers(db: Session, tenant_id: str, series: str, n: int) -> int:
+    """Reserve *n* consecutive numbers of *series*; returns the first one."""
+    row = _series_row(db, tenant_id, series)
+    first = row.last_number + 1
+    row.last_number += n
+    db.flush()
+    return first
+
+
+def invoices_from_quotes(
+    db: Session,
+    tenant_id: str,
+    quote_ids: list[str],
+    invoice_date: date,
+    series: str = "INV",
+    default_vat_rate: float = 0,
+) -> list[str]:
+    """Create one invoice per accepted quote; returns the new invoice ids.
+
+    Lines keep the quote line's VAT rate; legacy lines without one fall back
+    to the linked ``Item`` and then to *default_vat_rate*. Quotes are marked ``invoiced``.
+    Does not commit.
+    """
+    quote_ids = list(dict.fromkeys(quote_ids))
+    quotes = (
+        db.query(Quote)
+        .options(selectinload(Quote.lines))
+        .filter(Quote.tenant_id == tenant_id, Quote.id.in_(quote_ids))
+        .all()
+    )
+    by_id = {q.id: q for q in quotes}
+    missing = [i for i in quote_ids if i not in by_id]
+    if missing:
+        raise InvoicingError(f"Quotes not found: {', '.join(missing)}")
+    not_accepted = [q.quote_number for q in quotes if q.status != "accepted"]
+    if not_accepted:
+        raise InvoicingError(f"Quotes not accepted: {', '.join(not_accepted)}")
+
+    item_ids = {
+        ln.item_id for q in quotes for ln in q.lines
+        if ln.item_id and ln.vat_rate is None
+    }
+    vat_by_item = (
+        dict(
+            db.query(Item.id, Item.vat_rate).filter(
+                Item.tenant_id == tenant_id, Item.id.in_(item_ids)
+            )
+        )
+        if item_ids
+        else {}
+    )
+
+    # claim the quotes first so a concurrent conversion cannot invoice them twice
+    claimed = (
+        db.query(Quote)
+        .filter(Quote.id.in_(quote_ids), Quote.status == "accepted")
+        .update({"status": "invoiced"}, synchronize_session=False)
+    )
+    if claimed != len(quote_ids):
+        raise InvoicingError("Some quotes were invoiced concurrently")
+
+    seq = _reserve_numbers(db, tenant_id, series, len(quote_ids))
+    headers, lines = [], []
+    for q in (by_id[i] for i in quote_ids):
+        inv_id = uuid7()
+        headers.append(
+            {
+                "id": inv_id,
+                "tenant_id": tenant_id,
+                "customer_id": q.customer_id,
+                "quote_id": q.id,
+                "invoice_number": f"{series}-{seq:06d}",
+                "invoice_date": invoice_date,
+                "currency": q.currency,
+                "status": "draft",
+            }
+        )
+        seq += 1
+        for ln in q.lines:
+            lines.append(
+                {
+                    "id": uuid7(),
+                    "tenant_id": tenant_id,
+                    "invoice_id": inv_id,
+                    "description": ln.description,
+                    "qty": ln.qty,
+                    "unit": ln.unit,
+                    "unit_price": ln.unit_price,
+                    "vat_rate": (
+                        ln.vat_rate
+                        if ln.vat_rate is not None
+                        else vat_by_item.get(ln.item_id, default_vat_rate)
+                    ),
+                }
+            )
+
+    db.execute(insert(Invoice), headers)
+    if lines:
+        db.execute(insert(InvoiceLine), lines)
+    invoice_ids = [h["id"] for h in headers]
+    recompute_totals(db, invoice_ids)
+    return invoice_ids
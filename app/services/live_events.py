@@ -0,0 +1,189 @@
+"""Tenant-scoped change events pushed to live clients (``GET /events``, SSE).
+
+Session listeners (wired up in ``app.core.db``) collect events on flush and
+publish them after commit. That covers the routers and the IMAP sync task.
+``move_deals`` adds its own events, because Core DML does not flush. Each
+event carries what a client needs to patch its copy in place, so nobody
+reloads a list:
+
+    {"type": "deal.stage_changed", "tenant_id": ..., "id": <deal id>,
+     "at": ..., "data": {"from_stage", "to_stage", "title", "value",
+     "assigned_to"}}                      # from_stage None = new deal
+    {"type": "activity.completed", ..., "data": {"subject", "assigned_to",
+     "completed_at"}}
+    {"type": "email.received", ..., "data": {"subject", "sender",
+     "entity_type", "entity_id"}}
+
+With ``REDIS_URL`` set, events go over Redis pub/sub (``live:<tenant>``), so
+workers and every API process reach all subscribers. Without Redis,
+delivery is in-process only, so events raised in Celery workers would
+never reach the API; workers refuse to start without ``REDIS_URL``
+(``app.workers.celery_app``). A subscriber that falls ``LIVE_QUEUE_SIZE``
+events behind gets ``{"type": "resync"}`` and should reload. Delivery is
+best effort: if Redis is unreachable the events are logged and dropped, and
+the commit that produced them still succeeds.
+
+Client support is deferred: the bundled Streamlit UIs do not subscribe to
+``/events`` yet, and, like the other routers, ``app.routers.events`` is not
+mounted on an app in this tree.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from datetime import datetime, timezone
+
+from sqlalchemy import inspect
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+from app.models.activity import Activity
+from app.models.deal import Deal
+from app.models.emailmsg import EmailMessage
+
+log = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+# tenant_id -> {(loop, queue)} of in-process subscribers
+_subscribers: dict[str, set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+
+
+def _channel(tenant_id: str) -> str:
+    return f"live:{tenant_id}"
+
+
+def event(type_: str, tenant_id, id_, **data) -> dict:
+    return {
+        "type": type_,
+        "tenant_id": str(tenant_id),
+        "id": str(id_),
+        "at": datetime.now(timezone.utc).isoformat(),
+        "data": data,
+    }
+
+
+def deal_moved(tenant_id, deal_id, from_stage, to_stage, **data) -> dict:
+    return event(
+        "deal.stage_changed", tenant_id, deal_id,
+        from_stage=from_stage, to_stage=to_stage, **data,
+    )
+
+
+def add(session, events: list[dict]) -> None:
+    """Publish *events* when *session* commits (dropped on rollback)."""
+    session.info.setdefault("live", []).extend(events)
+
+
+def publish(events: list[dict]) -> None:
+    r = get_redis()
+    if r is not None:
+        try:
+            pipe = r.pipeline(transaction=False)
+            for ev in events:
+                pipe.publish(_channel(ev["tenant_id"]), json.dumps(ev, default=str))
+            pipe.execute()
+        except Exception:
+            # runs after commit; failing here would turn a saved change into a 500
+            log.warning("could not publish %d live events; dropping them", len(events),
+                        exc_info=True)
+        return
+    with _lock:
+        targets = [(ev, list(_subscribers.get(ev["tenant_id"], ()))) for ev in events]
+    for ev, subs in targets:
+        for loop, q in subs:
+            loop.call_soon_threadsafe(_offer, q, ev)
+
+
+def _offer(q: asyncio.Queue, ev: dict) -> None:
+    try:
+        q.put_nowait(ev)
+    except asyncio.QueueFull:
+        # too far behind for deltas to be useful; drop them and ask for a reload
+        while not q.empty():
+            q.get_nowait()
+        q.put_nowait({"type": "resync"})
+
+
+def _sse(payload: str) -> str:
+    return f"data: {payload}\n\n"
+
+
+async def stream(tenant_id: str):
+    """SSE frames of *tenant_id*'s events until the client goes away."""
+    beat = settings.LIVE_HEARTBEAT_SECONDS
+    if get_redis() is not None:
+        import redis.asyncio as aioredis
+
+        client = aioredis.from_url(settings.REDIS_URL)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(_channel(tenant_id))
+        try:
+            while True:
+                msg = await pubsub.get_message(ignore_subscribe_messages=True, timeout=beat)
+                yield _sse(msg["data"].decode()) if msg else ": ping\n\n"
+        finally:
+            await pubsub.unsubscribe()
+            await client.aclose()
+        return
+
+    entry = (asyncio.get_running_loop(), asyncio.Queue(settings.LIVE_QUEUE_SIZE))
+    with _lock:
+        _subscribers.setdefault(tenant_id, set()).add(entry)
+    try:
+        while True:
+            try:
+                ev = await asyncio.wait_for(entry[1].get(), beat)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"  # keeps proxies from closing an idle stream
+                continue
+            yield _sse(json.dumps(ev, default=str))
+    finally:
+        with _lock:
+            _subscribers.get(tenant_id, set()).discard(entry)
+
+
+# ── Collection (session listeners) ───────────────────────────
+def after_flush(session, flush_context):
+    events = []
+    for obj in session.new:
+        if isinstance(obj, Deal):
+            events.append(
+                deal_moved(obj.tenant_id, obj.id, None, obj.stage, title=obj.title,
+                           value=obj.value, assigned_to=obj.assigned_to)
+            )
+        elif isinstance(obj, EmailMessage) and obj.direction == "in":
+            events.append(
+                event("email.received", obj.tenant_id, obj.id, subject=obj.subject,
+                      sender=obj.sender, entity_type=obj.entity_type,
+                      entity_id=obj.entity_id)
+            )
+    for obj in session.dirty:
+        if isinstance(obj, Deal):
+            hist = inspect(obj).attrs.stage.history
+            if hist.added and hist.deleted and hist.added[0] != hist.deleted[0]:
+                events.append(
+                    deal_moved(obj.tenant_id, obj.id, hist.deleted[0], hist.added[0],
+                               title=obj.title, value=obj.value,
+                               assigned_to=obj.assigned_to)
+                )
+        elif isinstance(obj, Activity):
+            hist = inspect(obj).attrs.completed_at.history
+            if hist.added and hist.added[0] is not None and not any(hist.deleted):
+                events.append(
+                    event("activity.completed", obj.tenant_id, obj.id,
+                          subject=obj.subject, assigned_to=obj.assigned_to,
+                          completed_at=obj.completed_at)
+                )
+    if events:
+        add(session, events)
+
+
+def after_commit(session):
+    events = session.info.pop("live", None)
+    if events:
+        publish(events)
+
+
+def after_rollback(session):
+    session.info.pop("live", None)
@@ -1,9 +1,37 @@
-"""myDATA / ΑΑΔΕ invoicing provider interface.
+"""myDATA / ΑΑΔΕ invoicing provider interface and batch submission pipeline.
 
-This is a stub: the interface is defined so that later a real implementation
-can be swapped in without changing any other code.
+Invoices are queued as one ``MyDataSubmission`` row per invoice (the invoice
+id is the idempotency key, so re-queueing never duplicates a submission).
+A dispatcher claims queued rows per tenant into batches, capped at
+``MYDATA_MAX_INFLIGHT_PER_TENANT`` batches in flight, and each batch goes out
+in a single SendInvoices call. Status is polled separately per batch.
+
+For offline runs start ``python -m app.services.mydata_fake`` and leave
+``MYDATA_BASE_URL`` at its default.
 """
 
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import requests
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.config import settings
+from app.models.base import uuid7
+from app.models.company import Company
+from app.models.invoice import Invoice, MyDataSubmission
+from app.models.tenant import Tenant
+
+log = logging.getLogger(__name__)
+
+# rows stuck in "sending" longer than this (worker died mid-call) are requeued
+SENDING_TIMEOUT = timedelta(minutes=15)
+
+FINAL_STATUSES = {"submitted", "accepted", "rejected"}
+
 
 class InvoicingProvider:
     """Abstract base for invoicing providers (ΑΑΔΕ myDATA, etc.)."""
@@ -11,6 +39,20 @@ class InvoicingProvider:
     def submit_invoice(self, invoice_payload: dict) -> dict:
         raise NotImplementedError
 
+    def submit_invoices(self, invoice_payloads: list[dict]) -> dict:
+        """Submit several invoices; providers with a batch API override this.
+
+        Returns ``{"submission_uid": ..., "invoices": [{"invoice_id", "status",
+        "mark", "error"}, ...]}``.
+        """
+        return {
+            "submission_uid": None,
+            "invoices": [
+                {"invoice_id": p["invoice_id"], **self.submit_invoice(p)}
+                for p in invoice_payloads
+            ],
+        }
+
     def get_status(self, submission_id: str) -> dict:
         raise NotImplementedError
 
@@ -19,10 +61,9 @@ class InvoicingProvider:
 
 
 class MyDataProviderStub(InvoicingProvider):
-    """Stub implementation — replace with real AADE API calls later."""
+    """Stub implementation — does nothing, useful in unit tests."""
 
     def submit_invoice(self, invoice_payload: dict) -> dict:
-        # TODO: Real AADE myDATA API call + return MARK / status
         return {"status": "stub", "mark": None, "raw": None}
 
     def get_status(self, submission_id: str) -> dict:
@@ -32,5 +73,286 @@ class MyDataProviderStub(InvoicingProvider):
         return {"status": "stub", "mark": mark}
 
 
-# singleton — swap class when you integrate the real provider
-mydata_provider: InvoicingProvider = MyDataProviderStub()
+class MyDataHTTPProvider(InvoicingProvider):
+    """HTTP provider: one SendInvoices call per batch over a pooled session."""
+
+    def __init__(
+        self, base_url: str, user_id: str, subscription_key: str, timeout: int = 30
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self._session = requests.Session()
+        self._session.headers.update(
+            {
+                "aade-user-id": user_id,
+                "Ocp-Apim-Subscription-Key": subscription_key,
+            }
+        )
+
+    @classmethod
+    def from_settings(cls) -> "MyDataHTTPProvider":
+        return cls(
+            settings.MYDATA_BASE_URL,
+            settings.MYDATA_USER_ID,
+            settings.MYDATA_SUBSCRIPTION_KEY,
+            settings.MYDATA_TIMEOUT,
+        )
+
+    def _call(self, method: str, path: str, **kwargs) -> dict:
+        r = self._session.request(
+            method, f"{self.base_url}{path}", timeout=self.timeout, **kwargs
+        )
+        r.raise_for_status()
+        return r.json()
+
+    def submit_invoice(self, invoice_payload: dict) -> dict:
+        return self.submit_invoices([invoice_payload])["invoices"][0]
+
+    def submit_invoices(self, invoice_payloads: list[dict]) -> dict:
+        return self._call("POST", "/SendInvoices", json={"invoices": invoice_payloads})
+
+    def get_status(self, submission_id: str) -> dict:
+        return self._call("GET", "/RequestStatus", params={"uid": submission_id})
+
+    def cancel_invoice(self, mark: str) -> dict:
+        return self._call("POST", "/CancelInvoice", params={"mark": mark})
+
+
+# singleton — swap class when you integrate another provider
+mydata_provider: InvoicingProvider = MyDataHTTPProvider.from_settings()
+
+
+# ── Pipeline ─────────────────────────────────────────────────
+def build_invoice_payload(invoice: Invoice, customer: Company | None) -> dict:
+    net = vat = Decimal("0")
+    lines = []
+    for ln in invoice.lines:
+        line_net = Decimal(str(ln.qty)) * Decimal(str(ln.unit_price))
+        line_vat = line_net * Decimal(str(ln.vat_rate or 0)) / 100
+        net += line_net
+        vat += line_vat
+        lines.append(
+            {
+                "description": ln.description,
+                "qty": str(ln.qty),
+                "unit_price": str(ln.unit_price),
+                "vat_rate": str(ln.vat_rate or 0),
+                "net": str(line_net),
+                "vat": str(line_vat),
+            }
+        )
+    return {
+        "invoice_id": invoice.id,
+        "invoice_number": invoice.invoice_number,
+        "invoice_date": invoice.invoice_date.isoformat(),
+        "currency": invoice.currency,
+        "counterpart_vat": customer.vat if customer else None,
+        "counterpart_country": customer.country if customer else None,
+        "lines": lines,
+        "total_net": str(net),
+        "total_vat": str(vat),
+        "total_gross": str(net + vat),
+    }
+
+
+def queue_invoices(db: Session, tenant_id: str, invoice_ids: list[str]) -> int:
+    """Queue invoices for submission; already queued/sent invoices are skipped.
+
+    Rejected or errored submissions are re-queued with a fresh payload.
+    Returns the number of invoices (re)queued. Does not commit.
+    """
+    if not invoice_ids:
+        return 0
+    existing = {
+        s.invoice_id: s
+        for s in db.query(MyDataSubmission).filter(
+            MyDataSubmission.tenant_id == tenant_id,
+            MyDataSubmission.invoice_id.in_(invoice_ids),
+        )
+    }
+    todo = [
+        i for i in set(invoice_ids)
+        if i not in existing or existing[i].status in ("rejected", "error")
+    ]
+    if not todo:
+        return 0
+
+    invoices = (
+        db.query(Invoice)
+        .options(selectinload(Invoice.lines))
+        .filter(Invoice.tenant_id == tenant_id, Invoice.id.in_(todo))
+        .all()
+    )
+    customers = {
+        c.id: c
+        for c in db.query(Company).filter(
+            Company.id.in_({inv.customer_id for inv in invoices})
+        )
+    }
+    for inv in invoices:
+        payload = json.dumps(build_invoice_payload(inv, customers.get(inv.customer_id)))
+        sub = existing.get(inv.id)
+        if sub is None:
+            db.add(
+                MyDataSubmission(
+                    tenant_id=tenant_id, invoice_id=inv.id, request_json=payload
+                )
+            )
+        else:
+            sub.request_json = payload
+            sub.status = "queued"
+            sub.batch_id = None
+            sub.submission_uid = None
+    return len(invoices)
+
+
+def claim_batches(db: Session) -> list[tuple[str, str]]:
+    """Claim queued submissions into batches, respecting the per-tenant cap.
+
+    Returns ``(tenant_id, batch_id)`` pairs ready for ``send_batch``.
+    Each tenant's count and claim run under a lock on its ``tenants`` row
+    (``FOR UPDATE``), so concurrent dispatchers cannot both pass the cap.
+    SQLite ignores ``FOR UPDATE`` but allows only one writer at a time.
+    """
+    stale = datetime.now(timezone.utc) - SENDING_TIMEOUT
+    db.query(MyDataSubmission).filter(
+        MyDataSubmission.status == "sending",
+        MyDataSubmission.updated_at < stale,
+    ).update({"status": "queued", "batch_id": None}, synchronize_session=False)
+    db.commit()
+
+    tenants = [
+        t for (t,) in db.query(MyDataSubmission.tenant_id)
+        .filter(MyDataSubmission.status == "queued")
+        .distinct()
+    ]
+    claimed: list[tuple[str, str]] = []
+    for tenant_id in tenants:
+        db.query(Tenant.id).filter(Tenant.id == tenant_id).with_for_update().one()
+        inflight = (
+            db.query(func.count(func.distinct(MyDataSubmission.batch_id)))
+            .filter(
+                MyDataSubmission.tenant_id == tenant_id,
+                MyDataSubmission.status == "sending",
+            )
+            .scalar()
+        ) or 0
+        for _ in range(settings.MYDATA_MAX_INFLIGHT_PER_TENANT - inflight):
+            ids = [
+                i for (i,) in db.query(MyDataSubmission.id)
+                .filter(
+                    MyDataSubmission.tenant_id == tenant_id,
+                    MyDataSubmission.status == "queued",
+                )
+                .order_by(MyDataSubmission.created_at)
+                .limit(settings.MYDATA_BATCH_SIZE)
+            ]
+            if not ids:
+                break
+            batch_id = uuid7()
+            db.query(MyDataSubmission).filter(
+                MyDataSubmission.id.in_(ids),
+                MyDataSubmission.status == "queued",
+            ).update(
+                {"status": "sending", "batch_id": batch_id},
+                synchronize_session=False,
+            )
+            claimed.append((tenant_id, batch_id))
+        db.commit()  # releases the tenant lock
+    return claimed
+
+
+def _apply_results(db: Session, subs: list[MyDataSubmission], results: list[dict]):
+    by_invoice = {s.invoice_id: s for s in subs}
+    invoices = {
+        inv.id: inv
+        for inv in db.query(Invoice).filter(Invoice.id.in_(by_invoice.keys()))
+    }
+    for res in results:
+        sub = by_invoice.get(res.get("invoice_id"))
+        if sub is None:
+            continue
+        status = res.get("status")
+        sub.status = status if status in FINAL_STATUSES else "error"
+        sub.response_json = json.dumps(res)
+        sub.error = res.get("error")
+        inv = invoices.get(sub.invoice_id)
+        if inv is not None:
+            if sub.status in FINAL_STATUSES:
+                inv.status = sub.status
+            if res.get("mark"):
+                inv.mydata_mark = res["mark"]
+
+
+def send_batch(
+    db: Session, tenant_id: str, batch_id: str, provider: InvoicingProvider | None = None
+) -> int:
+    """Send one claimed batch in a single provider call.
+
+    On transport failure the rows go back to ``queued``; resending is safe
+    because the provider deduplicates on invoice id. Rows that have failed
+    ``MYDATA_MAX_ATTEMPTS`` times go to ``error`` instead.
+    """
+    provider = provider or mydata_provider
+    subs = (
+        db.query(MyDataSubmission)
+        .filter(
+            MyDataSubmission.tenant_id == tenant_id,
+            MyDataSubmission.batch_id == batch_id,
+            MyDataSubmission.status == "sending",
+        )
+        .all()
+    )
+    if not subs:
+        return 0
+    for s in subs:
+        s.attempts = (s.attempts or 0) + 1
+    try:
+        resp = provider.submit_invoices([json.loads(s.request_json) for s in subs])
+    except Exception as e:
+        for s in subs:
+            s.status = "error" if s.attempts >= settings.MYDATA_MAX_ATTEMPTS else "queued"
+            s.batch_id = None
+            s.error = str(e)
+        db.commit()
+        raise
+    for s in subs:
+        s.submission_uid = resp.get("submission_uid")
+    _apply_results(db, subs, resp.get("invoices", []))
+    db.commit()
+    return len(subs)
+
+
+def poll_submitted(db: Session, provider: InvoicingProvider | None = None) -> int:
+    """Poll every batch still in ``submitted``; one status call per batch.
+
+    A batch whose status call fails is logged and polled again next run.
+    """
+    provider = provider or mydata_provider
+    uids = [
+        u for (u,) in db.query(MyDataSubmission.submission_uid)
+        .filter(
+            MyDataSubmission.status == "submitted",
+            MyDataSubmission.submission_uid.isnot(None),
+        )
+        .distinct()
+    ]
+    updated = 0
+    for uid in uids:
+        try:
+            resp = provider.get_status(uid)
+        except Exception:
+            log.warning("myDATA status poll failed for %s", uid, exc_info=True)
+            continue
+        subs = (
+            db.query(MyDataSubmission)
+            .filter(
+                MyDataSubmission.submission_uid == uid,
+                MyDataSubmission.status == "submitted",
+            )
+            .all()
+        )
+        _apply_results(db, subs, resp.get("invoices", []))
+        db.commit()
+        updated += len(subs)
+    return updated
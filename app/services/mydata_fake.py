@@ -0,0 +1,98 @@
+"""Local fake of the myDATA endpoints used by ``MyDataHTTPProvider``.
+
+Run ``python -m app.services.mydata_fake [--port 8765]``. SendInvoices
+answers ``submitted`` immediately and hands out MARKs on the next
+RequestStatus call, so the async polling path is exercised. Invoices are
+deduplicated on ``invoice_id``: resubmitting returns the original MARK.
+"""
+
+import argparse
+import json
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+from urllib.parse import parse_qs, urlparse
+
+_lock = threading.Lock()
+_marks: dict[str, str] = {}  # invoice_id -> MARK
+_batches: dict[str, list[str]] = {}  # submission uid -> invoice ids
+_next_mark = count(400000000000001)
+
+
+def _result(invoice_id: str) -> dict:
+    mark = _marks.get(invoice_id)
+    return {
+        "invoice_id": invoice_id,
+        "status": "accepted" if mark else "submitted",
+        "mark": mark,
+        "error": None,
+    }
+
+
+class Handler(BaseHTTPRequestHandler):
+    def _send(self, code: int, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path == "/SendInvoices":
+            length = int(self.headers.get("Content-Length") or 0)
+            invoices = json.loads(self.rfile.read(length) or b"{}").get("invoices", [])
+            uid = str(uuid.uuid4())
+            out = []
+            with _lock:
+                _batches[uid] = []
+                for inv in invoices:
+                    iid = inv.get("invoice_id")
+                    if not iid or not inv.get("lines"):
+                        out.append(
+                            {"invoice_id": iid, "status": "rejected", "mark": None,
+                             "error": "invoice has no lines"}
+                        )
+                        continue
+                    _batches[uid].append(iid)
+                    out.append(_result(iid))
+            self._send(200, {"submission_uid": uid, "invoices": out})
+        elif url.path == "/CancelInvoice":
+            mark = parse_qs(url.query).get("mark", [None])[0]
+            self._send(200, {"status": "cancelled", "mark": mark})
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != "/RequestStatus":
+            self._send(404, {"error": "not found"})
+            return
+        uid = parse_qs(url.query).get("uid", [None])[0]
+        with _lock:
+            ids = _batches.get(uid)
+            if ids is None:
+                self._send(404, {"error": "unknown submission"})
+                return
+            for iid in ids:
+                _marks.setdefault(iid, str(next(_next_mark)))
+            out = [_result(iid) for iid in ids]
+        self._send(200, {"submission_uid": uid, "status": "done", "invoices": out})
+
+
+def serve(host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """Start the fake server in a daemon thread and return it."""
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    args = ap.parse_args()
+    print(f"fake myDATA listening on http://{args.host}:{args.port}")
+    ThreadingHTTPServer((args.host, args.port), Handler).serve_forever()
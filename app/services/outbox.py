@@ -0,0 +1,308 @@
+"""Transactional outbox: one ordered change feed for downstream consumers.
+
+Session listeners (wired up in ``app.core.db``) write an ``outbox_events``
+row for every inserted, updated or deleted model instance in the same
+transaction as the change. Inserts carry the full row, updates only the
+changed columns, deletes only the id. Core DML run through a session
+(``doc_batch``, archive moves) is recorded as well. Executemany inserts get
+one event per row. Statements without per-row parameters get a single
+``bulk`` event for the table, carrying the tenant when the WHERE clause pins
+``tenant_id``. Callers that know the rows they changed (``move_deals``, deal
+scoring, quote/PO totals) record them with ``add`` instead. ``watermarks``,
+webhook bookkeeping and the outbox's own tables are not recorded. Secret
+columns (``SECRET_COLUMNS``, e.g. ``users.password_hash``) are left out of
+the data on every path, ORM flushes and Core inserts alike.
+
+``relay`` runs from beat. It reads the events past each consumer's offset
+in ``seq`` order, with one query per distinct offset, and delivers them:
+
+* with ``REDIS_URL`` set, the ``redis`` consumer appends them to the
+  per-tenant stream ``outbox:<tenant_id>`` (``outbox:global`` when there is
+  no tenant), for XREADGROUP consumers;
+* in-process handlers registered with ``subscribe`` get them as lists.
+
+A consumer's offset moves only after its delivery succeeds, so delivery is
+at least once and consumers dedupe on ``seq``. Sequence numbers can reach
+the table out of commit order, so the relay stops at a gap until the
+event after it is ``OUTBOX_GAP_TIMEOUT_SECONDS`` old. After that it treats
+the gap as a rolled-back transaction.
+"""
+
+import json
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable
+
+from sqlalchemy import delete, func, inspect, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import operators, visitors
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+from app.models.outbox import OutboxEvent, OutboxOffset
+
+log = logging.getLogger(__name__)
+
+SKIP_TABLES = {
+    "outbox_events", "outbox_offsets", "watermarks",
+    "webhook_subscriptions", "webhook_deliveries",
+}
+# never copied into event data: events leave the database (streams, webhooks)
+SECRET_COLUMNS = {"password_hash", "secret"}
+REDIS_CONSUMER = "redis"
+
+_outbox = OutboxEvent.__table__
+_subscribers: dict[str, Callable[[list[dict]], None]] = {}
+
+
+def subscribe(name: str, handler: Callable[[list[dict]], None]) -> None:
+    """Have the relay call *handler* with batches of events in ``seq`` order.
+
+    Progress is kept as consumer *name*; a new consumer starts at the oldest
+    retained event, and a batch whose handler raises is offered again.
+    """
+    _subscribers[name] = handler
+
+
+def _plain(v):
+    if v is None or isinstance(v, (str, int, float, bool)):
+        return v
+    if isinstance(v, (datetime, date)):
+        return v.isoformat()
+    return str(v)
+
+
+def _public(items) -> dict:
+    """``(column, value)`` *items* as event data, without ``SECRET_COLUMNS``."""
+    return {k: _plain(v) for k, v in items if k not in SECRET_COLUMNS}
+
+
+def _aware(v: datetime) -> datetime:
+    return v if v.tzinfo else v.replace(tzinfo=timezone.utc)
+
+
+# ── Capture (session listeners) ──────────────────────────────
+def _row(obj, op: str, now: datetime) -> dict | None:
+    state = inspect(obj)
+    table = state.mapper.persist_selectable.name
+    if table in SKIP_TABLES:
+        return None
+    data = None
+    if op == "insert":
+        data = _public((a.key, getattr(obj, a.key)) for a in state.mapper.column_attrs)
+    elif op == "update":
+        data = _public(
+            (a.key, getattr(obj, a.key))
+            for a in state.mapper.column_attrs
+            if state.attrs[a.key].history.has_changes()
+        )
+        if not data:
+            return None  # only relationships or secret columns changed
+    tenant_id = obj.id if table == "tenants" else getattr(obj, "tenant_id", None)
+    return {
+        "tenant_id": tenant_id,
+        "table_name": table,
+        "op": op,
+        # state.identity is not set yet for new objects during after_flush
+        "row_id": ":".join(str(k) for k in state.mapper.primary_key_from_instance(obj)),
+        "data": data,
+        "created_at": now,
+    }
+
+
+def after_flush(session, flush_context):
+    now = datetime.now(timezone.utc)
+    rows = [
+        r
+        for objs, op in (
+            (session.new, "insert"), (session.dirty, "update"), (session.deleted, "delete")
+        )
+        for obj in objs
+        if (r := _row(obj, op, now)) is not None
+    ]
+    if rows:
+        session.connection().execute(insert(_outbox), rows)
+
+
+def _tenant(statement, table):
+    """``tenant_id`` bound by ``tenant_id == :x`` in *statement*'s WHERE, if any."""
+    where = getattr(statement, "whereclause", None)
+    if "tenant_id" not in table.c or where is None:
+        return None
+    for el in visitors.iterate(where):
+        if (
+            isinstance(el, BinaryExpression)
+            and el.operator is operators.eq
+            # ORM columns and statement tables are annotated copies; compare names
+            and getattr(getattr(el.left, "table", None), "name", None) == table.name
+            and el.left.name == "tenant_id"
+            and isinstance(el.right, BindParameter)
+        ):
+            return el.right.value
+    return None
+
+
+def add(session, tenant_id, table: str, op: str, rows: dict[str, dict]) -> None:
+    """Record one *op* event per row for Core DML the listeners see only in bulk.
+
+    *rows* maps row id to its changed columns. Run the DML itself with
+    ``execution_options(outbox=False)`` so it is not recorded a second time
+    as a ``bulk`` event. Written in *session*'s transaction; does not commit.
+    """
+    if not rows:
+        return
+    now = datetime.now(timezone.utc)
+    session.connection().execute(
+        insert(_outbox),
+        [
+            {
+                "tenant_id": tenant_id,
+                "table_name": table,
+                "op": op,
+                "row_id": str(row_id),
+                "data": _public(data.items()),
+                "created_at": now,
+            }
+            for row_id, data in rows.items()
+        ],
+    )
+
+
+def on_execute(orm_execute_state):
+    st = orm_execute_state
+    if not (st.is_insert or st.is_update or st.is_delete):
+        return
+    table = getattr(st.statement, "table", None)
+    if table is None or table.name in SKIP_TABLES:
+        return
+    if not st.execution_options.get("outbox", True):
+        return  # the caller records per-row events with add()
+    now = datetime.now(timezone.utc)
+    params = st.parameters
+    params = params if isinstance(params, list) else [params] if params else []
+    if st.is_insert and params and all("id" in p for p in params):
+        rows = [
+            {
+                "tenant_id": p.get("tenant_id"),
+                "table_name": table.name,
+                "op": "insert",
+                "row_id": str(p["id"]),
+                "data": _public(p.items()),
+                "created_at": now,
+            }
+            for p in params
+        ]
+    else:
+        dml = "insert" if st.is_insert else "update" if st.is_update else "delete"
+        rows = [
+            {
+                "tenant_id": _tenant(st.statement, table),
+                "table_name": table.name,
+                "op": "bulk",
+                "row_id": None,
+                "data": {"dml": dml},
+                "created_at": now,
+            }
+        ]
+    st.session.connection().execute(insert(_outbox), rows)
+
+
+# ── Relay ────────────────────────────────────────────────────
+def _event(e: OutboxEvent) -> dict:
+    return {
+        "seq": e.seq,
+        "tenant_id": e.tenant_id,
+        "table": e.table_name,
+        "op": e.op,
+        "row_id": e.row_id,
+        "data": e.data,
+        "at": _aware(e.created_at).isoformat(),
+    }
+
+
+def _ready(db: Session, after: int) -> list[dict]:
+    """Events past *after* that are safe to hand out, in ``seq`` order."""
+    now = datetime.now(timezone.utc)
+    gap_timeout = timedelta(seconds=settings.OUTBOX_GAP_TIMEOUT_SECONDS)
+    rows = (
+        db.query(OutboxEvent)
+        .filter(OutboxEvent.seq > after)
+        .order_by(OutboxEvent.seq)
+        .limit(settings.OUTBOX_BATCH_SIZE)
+    )
+    out, expect = [], after + 1
+    for e in rows:
+        if e.seq != expect and now - _aware(e.created_at) < gap_timeout:
+            break  # an older transaction may still commit into the gap
+        out.append(_event(e))
+        expect = e.seq + 1
+    return out
+
+
+def _to_streams(events: list[dict]) -> None:
+    pipe = get_redis().pipeline(transaction=False)
+    for ev in events:
+        pipe.xadd(
+            f"outbox:{ev['tenant_id'] or 'global'}",
+            {"seq": ev["seq"], "event": json.dumps(ev)},
+            maxlen=settings.OUTBOX_STREAM_MAXLEN,
+            approximate=True,
+        )
+    pipe.execute()
+
+
+def _consumers() -> list[str]:
+    return ([REDIS_CONSUMER] if get_redis() is not None else []) + list(_subscribers)
+
+
+def relay(db: Session) -> int:
+    """Deliver one batch to every consumer; returns the largest batch read."""
+    consumers = _consumers()
+    if not consumers:
+        return 0
+    offsets = {
+        o.consumer: o
+        for o in db.query(OutboxOffset).filter(OutboxOffset.consumer.in_(consumers))
+    }
+    # consumers at the same offset (the usual case) share one read; a stuck
+    # one does not hold the others back
+    at: dict[int, list[str]] = {}
+    for name in consumers:
+        off = offsets.setdefault(name, OutboxOffset(consumer=name, seq=0))
+        at.setdefault(off.seq, []).append(name)
+
+    read = 0
+    for after, names in at.items():
+        events = _ready(db, after)
+        read = max(read, len(events))
+        if not events:
+            continue
+        for name in names:
+            try:
+                if name == REDIS_CONSUMER:
+                    _to_streams(events)
+                else:
+                    _subscribers[name](events)
+            except Exception:
+                log.exception("outbox consumer %s failed at seq %s", name, events[0]["seq"])
+                continue
+            offsets[name].seq = events[-1]["seq"]
+            db.merge(offsets[name])
+    db.commit()
+    return read
+
+
+def prune(db: Session) -> int:
+    """Delete events every consumer has seen and that are past retention."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.OUTBOX_RETENTION_DAYS)
+    q = delete(OutboxEvent).where(OutboxEvent.created_at < cutoff)
+    consumers = _consumers()
+    if consumers:
+        seen = db.query(func.min(OutboxOffset.seq)).filter(
+            OutboxOffset.consumer.in_(consumers)
+        ).scalar()
+        q = q.where(OutboxEvent.seq <= (seen or 0))
+    n = db.execute(q).rowcount
+    db.commit()
+    return n
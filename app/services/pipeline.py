@@ -0,0 +1,279 @@
+"""Deal stage history, funnel analytics and pipeline summaries.
+
+Every stage change lands in ``deal_stage_events`` together with the time the
+deal spent in the stage it left. ORM writes are picked up by a session
+``after_flush`` listener (wired up in ``app.core.db``); ``move_deals``
+updates many deals with one UPDATE and writes its events itself (stage,
+live and outbox), since Core DML does not flush.
+
+``refresh_funnel`` folds events newer than the ``pipeline:funnel`` watermark
+into the ``deal_funnel_stats`` counters, so ``funnel`` never rescans history.
+"""
+
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, insert, inspect, select
+from sqlalchemy.orm import Session
+
+from app.models.deal import Deal, DealFunnelStat, DealStageEvent
+from app.models.watermark import Watermark
+from app.services import live_events, outbox
+
+STAGE_ORDER = ["lead", "qualified", "proposal", "negotiation", "won"]
+CLOSED_STAGES = {"won", "lost"}
+
+WATERMARK_KEY = "pipeline:funnel"
+# events are stamped before commit; leave slow transactions time to land
+REFRESH_LAG = timedelta(minutes=1)
+
+
+class DealsNotFound(ValueError):
+    pass
+
+
+def _aware(v: datetime) -> datetime:
+    return v if v.tzinfo else v.replace(tzinfo=timezone.utc)
+
+
+def _entered_at(conn, deal_ids) -> dict[str, datetime]:
+    """When each deal entered its current stage (its latest event)."""
+    if not deal_ids:
+        return {}
+    rows = conn.execute(
+        select(DealStageEvent.deal_id, func.max(DealStageEvent.changed_at))
+        .where(DealStageEvent.deal_id.in_(deal_ids))
+        .group_by(DealStageEvent.deal_id)
+    )
+    return {deal_id: _aware(at) for deal_id, at in rows if at is not None}
+
+
+def _event(
+    deal_id, tenant_id, from_stage, to_stage, assigned_to, value, at, entered=None
+) -> dict:
+    return {
+        "tenant_id": tenant_id,
+        "deal_id": deal_id,
+        "from_stage": from_stage,
+        "to_stage": to_stage,
+        "assigned_to": assigned_to,
+        "value": value,
+        "changed_at": at,
+        "days_in_stage": (at - entered).total_seconds() / 86400 if entered else None,
+    }
+
+
+def after_flush(session: Session, flush_context) -> None:
+    now = datetime.now(timezone.utc)
+    rows = []
+    for obj in session.new:
+        if isinstance(obj, Deal):
+            rows.append(
+                _event(obj.id, obj.tenant_id, None, obj.stage,
+                       obj.assigned_to, obj.value, now)
+            )
+    moved = []
+    for obj in session.dirty:
+        if not isinstance(obj, Deal):
+            continue
+        hist = inspect(obj).attrs.stage.history
+        if hist.added and hist.deleted and hist.added[0] != hist.deleted[0]:
+            moved.append((obj, hist.deleted[0], hist.added[0]))
+    conn = session.connection()
+    entered = _entered_at(conn, [obj.id for obj, _old, _new in moved])
+    for obj, old, new in moved:
+        rows.append(
+            _event(obj.id, obj.tenant_id, old, new, obj.assigned_to, obj.value,
+                   now, entered.get(obj.id))
+        )
+    if rows:
+        conn.execute(insert(DealStageEvent.__table__), rows)
+
+
+def move_deals(db: Session, tenant_id: str, deal_ids: list[str], stage: str) -> int:
+    """Move *deal_ids* to *stage* with one UPDATE and log the changes.
+
+    Deals already in *stage* are left untouched; returns how many moved.
+    Raises ``DealsNotFound`` (before writing) if any id is unknown.
+    Does not commit.
+    """
+    current = db.query(
+        Deal.id, Deal.stage, Deal.assigned_to, Deal.value, Deal.title
+    ).filter(
+        Deal.tenant_id == tenant_id, Deal.id.in_(deal_ids)
+    ).all()
+    missing = sorted(set(deal_ids) - {r.id for r in current})
+    if missing:
+        raise DealsNotFound(f"Deals not found: {', '.join(missing)}")
+    moving = [r for r in current if r.stage != stage]
+    if not moving:
+        return 0
+
+    now = datetime.now(timezone.utc)
+    changes = {"stage": stage, "closed_at": now if stage in CLOSED_STAGES else None}
+    entered = _entered_at(db, [r.id for r in moving])
+    db.query(Deal).filter(
+        Deal.tenant_id == tenant_id, Deal.id.in_([r.id for r in moving])
+    ).execution_options(outbox=False).update(changes, synchronize_session=False)
+    outbox.add(db, tenant_id, "deals", "update", {r.id: changes for r in moving})
+    db.execute(
+        insert(DealStageEvent),
+        [
+            _event(r.id, tenant_id, r.stage, stage, r.assigned_to, r.value,
+                   now, entered.get(r.id))
+            for r in moving
+        ],
+    )
+    live_events.add(
+        db,
+        [
+            live_events.deal_moved(tenant_id, r.id, r.stage, stage, title=r.title,
+                                   value=r.value, assigned_to=r.assigned_to)
+            for r in moving
+        ],
+    )
+    return len(moving)
+
+
+def pipeline_summary(db: Session, tenant_id: str) -> list[dict]:
+    """Deal count and value per stage."""
+    rows = (
+        db.query(
+            Deal.stage, func.count(Deal.id), func.coalesce(func.sum(Deal.value), 0)
+        )
+        .filter(Deal.tenant_id == tenant_id)
+        .group_by(Deal.stage)
+    )
+    return [
+        {"stage": stage, "count": count, "value": float(value)}
+        for stage, count, value in rows
+    ]
+
+
+# ── Funnel analytics ─────────────────────────────────────────
+def refresh_funnel(db: Session) -> int:
+    """Fold new stage events into the funnel counters; returns events read."""
+    until = datetime.now(timezone.utc) - REFRESH_LAG
+    wm = db.get(Watermark, WATERMARK_KEY) or Watermark(key=WATERMARK_KEY)
+    q = db.query(
+        DealStageEvent.tenant_id, DealStageEvent.from_stage, DealStageEvent.to_stage,
+        DealStageEvent.assigned_to, DealStageEvent.days_in_stage,
+    ).filter(DealStageEvent.changed_at <= until)
+    if wm.value is not None:
+        q = q.filter(DealStageEvent.changed_at > wm.value)
+
+    deltas: Counter = Counter()
+    seen = 0
+    for tenant_id, from_stage, to_stage, assigned_to, days in q.yield_per(1000):
+        seen += 1
+        deltas[(tenant_id, "entered", to_stage, None, None)] += 1
+        if from_stage is not None and days is not None:
+            deltas[(tenant_id, "days", from_stage, None, int(days))] += 1
+        if to_stage in CLOSED_STAGES:
+            deltas[(tenant_id, to_stage, None, assigned_to, None)] += 1
+
+    tenants = {k[0] for k in deltas}
+    if tenants:
+        existing = {
+            (s.tenant_id, s.metric, s.stage, s.assigned_to, s.days): s
+            for s in db.query(DealFunnelStat).filter(
+                DealFunnelStat.tenant_id.in_(tenants)
+            )
+        }
+        for key, n in deltas.items():
+            stat = existing.get(key)
+            if stat is None:
+                tenant_id, metric, stage, assigned_to, days = key
+                db.add(
+                    DealFunnelStat(
+                        tenant_id=tenant_id, metric=metric, stage=stage,
+                        assigned_to=assigned_to, days=days, count=n,
+                    )
+                )
+            else:
+                stat.count += n
+    wm.value = until
+    db.merge(wm)
+    db.commit()
+    return seen
+
+
+def _median(hist: Counter) -> float | None:
+    total = sum(hist.values())
+    if not total:
+        return None
+    running = 0
+    for days in sorted(hist):
+        running += hist[days]
+        if running * 2 >= total:
+            return float(days)
+    return None
+
+
+def funnel(db: Session, tenant_id: str) -> dict:
+    """Conversion and median days per stage, win rate per assignee."""
+    entered: Counter = Counter()
+    days: dict[str, Counter] = defaultdict(Counter)
+    closes: dict[str | None, Counter] = defaultdict(Counter)
+    for s in db.query(DealFunnelStat).filter(DealFunnelStat.tenant_id == tenant_id):
+        if s.metric == "entered":
+            entered[s.stage] += s.count
+        elif s.metric == "days":
+            days[s.stage][s.days] += s.count
+        else:
+            closes[s.assigned_to][s.metric] += s.count
+
+    stages = []
+    for i, stage in enumerate([*STAGE_ORDER, "lost"]):
+        nxt = STAGE_ORDER[i + 1] if i + 1 < len(STAGE_ORDER) else None
+        n = entered[stage]
+        stages.append(
+            {
+                "stage": stage,
+                "entered": n,
+                "conversion": entered[nxt] / n if nxt and n else None,
+                "median_days": _median(days[stage]),
+            }
+        )
+
+    def _rate(c: Counter) -> float | None:
+        closed = c["won"] + c["lost"]
+        return c["won"] / closed if closed else None
+
+    total = sum(closes.values(), Counter())
+    return {
+        "stages": stages,
+        "win_rate": _rate(total),
+        "by_assignee": [
+            {
+                "assigned_to": who,
+                "won": c["won"],
+                "lost": c["lost"],
+                "win_rate": _rate(c),
+            }
+            for who, c in sorted(closes.items(), key=lambda kv: kv[0] or "")
+        ],
+    }
+
+
+def deal_ages(db: Session, deal_ids: list[str]) -> dict[str, tuple[float, float]]:
+    """``(days_open, days_in_stage)`` per deal from its first and latest event."""
+    if not deal_ids:
+        return {}
+    now = datetime.now(timezone.utc)
+    rows = (
+        db.query(
+            DealStageEvent.deal_id,
+            func.min(DealStageEvent.changed_at),
+            func.max(DealStageEvent.changed_at),
+        )
+        .filter(DealStageEvent.deal_id.in_(deal_ids))
+        .group_by(DealStageEvent.deal_id)
+    )
+    return {
+        deal_id: (
+            (now - _aware(first)).total_seconds() / 86400,
+            (now - _aware(last)).total_seconds() / 86400,
+        )
+        for deal_id, first, last in rows
+    }
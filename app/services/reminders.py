@@ -0,0 +1,100 @@
+"""Due-date reminders for open activities.
+
+``due_reminders`` is run by beat every minute. It only looks at the slice of
+time it has not scanned yet: activities falling due in
+``(scanned_until, now + REMINDER_LEAD_MINUTES]``, read through the partial
+index on ``due_at`` of open activities in ``REMINDER_BUCKET_MINUTES`` steps.
+Activities created or rescheduled into a slice that was already scanned are
+caught by a second query over ``(now, scanned_until]`` restricted to rows
+touched since the previous run; that range is at most one lead window wide.
+Each queued reminder stores its ``due_at`` in ``reminded_due_at``, and the
+second query skips rows where the two still match, so edits that leave the
+due date alone (notes, assignee, ...) do not send the reminder again. That
+column is internal: marking it records no outbox event and leaves the
+response cache alone.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import bindparam, or_, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.activity import Activity
+from app.models.watermark import Watermark
+
+SCANNED_KEY = "reminders:scanned_until"
+RUN_KEY = "reminders:last_run"
+
+_activities = Activity.__table__
+_mark = (
+    update(_activities)
+    .where(_activities.c.id == bindparam("b_id"))
+    .values(
+        reminded_due_at=bindparam("b_due"),
+        updated_at=_activities.c.updated_at,  # explicit, so onupdate does not fire
+    )
+    .execution_options(outbox=False, rcache=False)
+)
+
+
+def _aware(v: datetime | None) -> datetime | None:
+    # SQLite hands DateTime(timezone=True) back naive
+    if v is not None and v.tzinfo is None:
+        return v.replace(tzinfo=timezone.utc)
+    return v
+
+
+def _open_due(db: Session, start: datetime, stop: datetime):
+    return db.query(Activity.id, Activity.due_at).filter(
+        Activity.completed_at.is_(None),
+        Activity.due_at > start,
+        Activity.due_at <= stop,
+    )
+
+
+def due_reminders(db: Session, now: datetime | None = None) -> list[tuple[str, datetime]]:
+    """Return ``(activity_id, due_at)`` pairs to remind about and advance the
+    watermark. The first run starts at *now*, so past-due work is not replayed."""
+    now = now or datetime.now(timezone.utc)
+    scanned = db.get(Watermark, SCANNED_KEY) or Watermark(key=SCANNED_KEY)
+    last_run = db.get(Watermark, RUN_KEY) or Watermark(key=RUN_KEY)
+    start = max(_aware(scanned.value) or now, now)
+    end = now + timedelta(minutes=settings.REMINDER_LEAD_MINUTES)
+    bucket = timedelta(minutes=settings.REMINDER_BUCKET_MINUTES)
+
+    out: dict[str, datetime] = {}
+    while start < end:
+        stop = min(start + bucket, end)
+        out.update(_open_due(db, start, stop))
+        start = stop
+
+    if scanned.value is not None and last_run.value is not None:
+        late = _open_due(db, now, _aware(scanned.value)).filter(
+            Activity.updated_at > last_run.value,
+            or_(
+                Activity.reminded_due_at.is_(None),
+                Activity.reminded_due_at != Activity.due_at,
+            ),
+        )
+        out.update(late)
+
+    if out:
+        db.execute(_mark, [{"b_id": i, "b_due": due} for i, due in out.items()])
+
+    scanned.value = max(end, _aware(scanned.value) or end)
+    last_run.value = now
+    db.merge(scanned)
+    db.merge(last_run)
+    db.commit()
+    return list(out.items())
+
+
+def reminder_target(db: Session, activity_id: str, due_at: datetime) -> Activity | None:
+    """The activity, if a reminder for *due_at* is still wanted."""
+    a = db.get(Activity, activity_id)
+    if a is None or a.completed_at is not None or a.due_at is None:
+        return None
+    if abs(_aware(a.due_at) - _aware(due_at)) > timedelta(seconds=1):
+        return None  # rescheduled since it was queued
+    return a
@@ -0,0 +1,246 @@
+"""Tenant-aware response cache for rarely changing reference lists.
+
+An entry is keyed by ``(tenant_id, route, query params)`` plus the current
+*generation* of every table the response reads; that key is also the ETag.
+Session listeners (wired up in ``app.core.db``) bump the generation of each
+written table for the writing tenant after commit, so stale entries are never
+looked up again and age out of the LRU. A repeat load only reads generations
+and, on a miss of ``If-None-Match``, the cached body — never the database.
+
+Bodies live in a per-process LRU of ``RESPONSE_CACHE_SIZE`` entries and, with
+``REDIS_URL`` set, in Redis for ``RESPONSE_CACHE_TTL`` seconds. Generations
+are then kept in Redis as well, so a write in one worker invalidates all of
+them; without Redis invalidation is per process. The cache never fails a
+request: while Redis is unreachable, cached endpoints build every response
+(no ETag), ``weak_etag`` tags never match, and bumps that could not be sent
+are retried before this process next reads or bumps a generation.
+
+Detail endpoints do not cache bodies; they answer conditional GETs with
+``weak_etag`` (row ids + the generations of the tables they read) checked
+before serializing. ``updated_at`` alone would not do: it has one-second
+resolution on SQLite, so an edit in the same second as a read kept its tag.
+"""
+
+import hashlib
+import json
+import logging
+import secrets
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+
+log = logging.getLogger(__name__)
+
+# tables read by cached endpoints; writes elsewhere do not bump anything
+CACHED_TABLES = {"companies", "items", "pricelists", "pricelist_lines"}
+# tables read by detail endpoints with a weak_etag
+ETAG_TABLES = {
+    "companies", "items", "quotes", "quote_lines", "purchase_orders",
+    "purchase_order_lines", "deals", "activities",
+}
+TRACKED_TABLES = CACHED_TABLES | ETAG_TABLES
+ANY_TENANT = "*"  # bumped by bulk DML whose tenant is not known
+
+_lock = threading.Lock()
+_lru: OrderedDict[str, bytes] = OrderedDict()
+_gens: dict[str, int] = {}
+_unsent: set[str] = set()  # generation bumps Redis missed
+
+
+def _gen_key(tenant_id: str, table: str) -> str:
+    return f"rcache:gen:{tenant_id}:{table}"
+
+
+def _incr(r, keys: list[str]) -> None:
+    """INCR *keys* plus any earlier bumps that did not reach Redis."""
+    with _lock:
+        keys = [*keys, *_unsent]
+        _unsent.clear()
+    if not keys:
+        return
+    try:
+        pipe = r.pipeline()
+        for k in keys:
+            pipe.incr(k)
+        pipe.execute()
+    except Exception:
+        with _lock:
+            _unsent.update(keys)
+        raise
+
+
+def _generations(tenant_id: str, tables: list[str]) -> list[int] | None:
+    """Current generations, or None when Redis cannot be read."""
+    keys = [_gen_key(t, table) for table in tables for t in (tenant_id, ANY_TENANT)]
+    r = get_redis()
+    if r is not None:
+        try:
+            _incr(r, [])
+            return [int(v or 0) for v in r.mget(keys)]
+        except Exception:
+            log.warning("cache generations unavailable; bypassing the cache", exc_info=True)
+            return None
+    with _lock:
+        return [_gens.get(k, 0) for k in keys]
+
+
+def bump(touched: set[tuple[str | None, str]]) -> None:
+    """Invalidate every entry reading *touched* ``(tenant_id, table)`` pairs."""
+    keys = [_gen_key(t or ANY_TENANT, table) for t, table in touched]
+    r = get_redis()
+    if r is not None:
+        try:
+            _incr(r, keys)
+        except Exception:
+            log.warning("could not bump %d cache generations; will retry", len(keys),
+                        exc_info=True)
+        return
+    with _lock:
+        for k in keys:
+            _gens[k] = _gens.get(k, 0) + 1
+
+
+def _lookup(etag: str) -> bytes | None:
+    with _lock:
+        body = _lru.get(etag)
+        if body is not None:
+            _lru.move_to_end(etag)
+            return body
+    r = get_redis()
+    if r is None:
+        return None
+    try:
+        body = r.get(f"rcache:body:{etag}")
+    except Exception:
+        log.warning("cache lookup failed; treating as a miss", exc_info=True)
+        return None
+    if body is not None:
+        _store_local(etag, body)
+    return body
+
+
+def _store_local(etag: str, body: bytes) -> None:
+    with _lock:
+        _lru[etag] = body
+        _lru.move_to_end(etag)
+        while len(_lru) > settings.RESPONSE_CACHE_SIZE:
+            _lru.popitem(last=False)
+
+
+def _store(etag: str, body: bytes) -> None:
+    _store_local(etag, body)
+    r = get_redis()
+    if r is not None:
+        try:
+            r.set(f"rcache:body:{etag}", body, ex=settings.RESPONSE_CACHE_TTL)
+        except Exception:
+            log.warning("could not store cached response", exc_info=True)
+
+
+def matches(request: Request, etag: str) -> bool:
+    """Weak comparison of *etag* against the request's If-None-Match."""
+    sent = request.headers.get("if-none-match")
+    if not sent:
+        return False
+    if sent.strip() == "*":
+        return True
+    return etag.removeprefix("W/") in {
+        t.strip().removeprefix("W/") for t in sent.split(",")
+    }
+
+
+def weak_etag(tenant_id: str, tables: list[str], *rows) -> str:
+    """Weak ETag from the ids of *rows* (None skipped) and the generations
+    of *tables* for *tenant_id*.
+
+    Cheap enough to check before serializing. Any committed write to one of
+    *tables* by the tenant changes the tag, so it is weak: an edit to a
+    sibling row also ends a client's 304s.
+    """
+    gens = _generations(tenant_id, tables)
+    raw = "|".join(
+        [str(r.id) for r in rows if r is not None]
+        # without generations no tag can be trusted; make this one unique
+        + [repr(gens) if gens is not None else secrets.token_hex(8)]
+    )
+    return 'W/"' + hashlib.sha1(raw.encode()).hexdigest()[:20] + '"'
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"}
+    )
+
+
+def cached(
+    request: Request | None, tenant_id: str, tables: list[str], build: Callable
+):
+    """Serve ``build()`` through the cache; answers 304 on a matching ETag.
+
+    With ``request=None`` (direct calls, e.g. the index advisor) or while
+    Redis is unreachable, the cache is bypassed and ``build()`` is returned
+    as is.
+    """
+    if request is None:
+        return build()
+    gens = _generations(tenant_id, tables)
+    if gens is None:
+        return build()
+    raw = "|".join(
+        [
+            tenant_id,
+            request.url.path,
+            repr(sorted(request.query_params.multi_items())),
+            repr(gens),
+        ]
+    )
+    etag = '"' + hashlib.sha1(raw.encode()).hexdigest() + '"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if matches(request, etag):
+        return not_modified(etag)
+
+    body = _lookup(etag)
+    if body is None:
+        body = json.dumps(jsonable_encoder(build())).encode()
+        _store(etag, body)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+# ── Invalidation (session listeners) ─────────────────────────
+def after_flush(session, flush_context):
+    touched = session.info.setdefault("rcache", set())
+    for obj in session.new | session.dirty | session.deleted:
+        table = getattr(obj, "__tablename__", None)
+        if table in TRACKED_TABLES:
+            touched.add((getattr(obj, "tenant_id", None), table))
+
+
+def on_execute(orm_execute_state):
+    if not (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        return
+    if not orm_execute_state.execution_options.get("rcache", True):
+        return  # the caller only wrote columns no cached response reads
+    table = getattr(orm_execute_state.statement, "table", None)
+    if table is not None and table.name in TRACKED_TABLES:
+        orm_execute_state.session.info.setdefault("rcache", set()).add((None, table.name))
+
+
+def after_commit(session):
+    touched = session.info.pop("rcache", None)
+    if touched:
+        bump(touched)
+
+
+def after_rollback(session):
+    session.info.pop("rcache", None)
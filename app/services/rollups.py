@@ -0,0 +1,177 @@
+"""Daily per-tenant rollups behind the /reports endpoints.
+
+``refresh_rollups`` is incremental: it looks at documents written since the
+last run (the ``rollups:daily`` watermark) and rebuilds only the tenant-days
+they fall on. Hard deletes and reopened deals do not leave a trace there, so
+``rebuild_rollups`` re-derives a trailing window nightly.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.deal import Deal
+from app.models.po import PurchaseOrder
+from app.models.quote import Quote
+from app.models.rollup import DailyRollup
+from app.models.tenant import Tenant
+from app.models.watermark import Watermark
+
+WATERMARK_KEY = "rollups:daily"
+
+
+def _as_date(v) -> date:
+    # func.date() comes back as text on SQLite
+    return v if isinstance(v, date) else date.fromisoformat(str(v)[:10])
+
+
+def _metric_queries(db: Session, tenant_id: str):
+    """(metric, day column, query, group-by) per metric; each query selects
+    (day, partner_id, currency, count, value)."""
+    deal_day = func.date(Deal.closed_at)
+    # grouped by the coalesced value, so NULL and "EUR" land in one rollup row
+    quote_cur = func.coalesce(Quote.currency, "EUR")
+    po_cur = func.coalesce(PurchaseOrder.currency, "EUR")
+    deal_cur = func.coalesce(Deal.currency, "EUR")
+    quotes = db.query(
+        Quote.quote_date, Quote.customer_id, quote_cur,
+        func.count(Quote.id), func.coalesce(func.sum(Quote.grand_total), 0),
+    ).filter(Quote.tenant_id == tenant_id)
+    pos = db.query(
+        PurchaseOrder.po_date, PurchaseOrder.supplier_id, po_cur,
+        func.count(PurchaseOrder.id),
+        func.coalesce(func.sum(PurchaseOrder.grand_total), 0),
+    ).filter(PurchaseOrder.tenant_id == tenant_id)
+    deals = db.query(
+        deal_day, Deal.company_id, deal_cur,
+        func.count(Deal.id), func.coalesce(func.sum(Deal.value), 0),
+    ).filter(Deal.tenant_id == tenant_id, Deal.closed_at.isnot(None))
+    return [
+        ("quotes_issued", Quote.quote_date, quotes,
+         (Quote.quote_date, Quote.customer_id, quote_cur)),
+        ("pos_issued", PurchaseOrder.po_date, pos,
+         (PurchaseOrder.po_date, PurchaseOrder.supplier_id, po_cur)),
+        ("deals_won", deal_day, deals.filter(Deal.stage == "won"),
+         (deal_day, Deal.company_id, deal_cur)),
+        ("deals_lost", deal_day, deals.filter(Deal.stage == "lost"),
+         (deal_day, Deal.company_id, deal_cur)),
+    ]
+
+
+def rebuild_days(db: Session, tenant_id: str, days: set[date]) -> int:
+    """Replace the rollup rows of *days* for one tenant. Does not commit."""
+    if not days:
+        return 0
+    db.query(DailyRollup).filter(
+        DailyRollup.tenant_id == tenant_id, DailyRollup.day.in_(days)
+    ).delete(synchronize_session=False)
+    rows = []
+    for metric, day_col, q, group in _metric_queries(db, tenant_id):
+        for day, partner_id, currency, count, value in (
+            q.filter(day_col.in_(days)).group_by(*group)
+        ):
+            rows.append(
+                DailyRollup(
+                    tenant_id=tenant_id,
+                    day=_as_date(day),
+                    metric=metric,
+                    partner_id=partner_id,
+                    currency=currency,
+                    count=count,
+                    value=value,
+                )
+            )
+    db.add_all(rows)
+    return len(rows)
+
+
+def _changed_days(db: Session, since: datetime | None) -> dict[str, set[date]]:
+    changed: dict[str, set[date]] = defaultdict(set)
+    sources = [
+        (Quote.tenant_id, Quote.quote_date, Quote.updated_at),
+        (PurchaseOrder.tenant_id, PurchaseOrder.po_date, PurchaseOrder.updated_at),
+        (Deal.tenant_id, func.date(Deal.closed_at), Deal.updated_at),
+    ]
+    for tenant_col, day_col, updated_col in sources:
+        q = db.query(tenant_col, day_col).filter(day_col.isnot(None)).distinct()
+        if since is not None:
+            q = q.filter(updated_col > since)
+        for tenant_id, day in q:
+            changed[tenant_id].add(_as_date(day))
+    return changed
+
+
+def refresh_rollups(db: Session) -> int:
+    """Rebuild the tenant-days touched since the last run; returns rows written."""
+    started = datetime.now(timezone.utc)
+    wm = db.get(Watermark, WATERMARK_KEY) or Watermark(key=WATERMARK_KEY)
+    written = 0
+    for tenant_id, days in _changed_days(db, wm.value).items():
+        written += rebuild_days(db, tenant_id, days)
+    # start time, not end time: rows written during the run are picked up next time
+    wm.value = started
+    db.merge(wm)
+    db.commit()
+    return written
+
+
+def rebuild_rollups(db: Session, trailing_days: int = 35) -> int:
+    """Re-derive the last *trailing_days* for every tenant."""
+    since = date.today() - timedelta(days=trailing_days)
+    days = {since + timedelta(days=i) for i in range(trailing_days + 1)}
+    tenants = [t for (t,) in db.query(Tenant.id)]
+    written = 0
+    for tenant_id in tenants:
+        written += rebuild_days(db, tenant_id, days)
+    db.commit()
+    return written
+
+
+# ── Reading ──────────────────────────────────────────────────
+def _period(day: date, grain: str) -> str:
+    if grain == "year":
+        return f"{day.year}"
+    if grain == "quarter":
+        return f"{day.year}-Q{(day.month - 1) // 3 + 1}"
+    return f"{day.year}-{day.month:02d}"
+
+
+def trend(
+    db: Session,
+    tenant_id: str,
+    metrics: list[str],
+    grain: str = "month",
+    date_from: date | None = None,
+    date_to: date | None = None,
+    by_partner: bool = False,
+) -> list[dict]:
+    """Bucket rollup rows into month/quarter/year periods."""
+    q = db.query(
+        DailyRollup.day, DailyRollup.metric, DailyRollup.partner_id,
+        DailyRollup.currency, DailyRollup.count, DailyRollup.value,
+    ).filter(DailyRollup.tenant_id == tenant_id, DailyRollup.metric.in_(metrics))
+    if date_from:
+        q = q.filter(DailyRollup.day >= date_from)
+    if date_to:
+        q = q.filter(DailyRollup.day <= date_to)
+
+    buckets: dict[tuple, list] = defaultdict(lambda: [0, 0.0])
+    for day, metric, partner_id, currency, count, value in q:
+        key = (_period(day, grain), metric, currency, partner_id if by_partner else None)
+        buckets[key][0] += count or 0
+        buckets[key][1] += float(value or 0)
+    return [
+        {
+            "period": period,
+            "metric": metric,
+            "currency": currency,
+            "partner_id": partner_id,
+            "count": count,
+            "value": value,
+        }
+        for (period, metric, currency, partner_id), (count, value) in sorted(
+            buckets.items(), key=lambda kv: (kv[0][0], kv[0][1], kv[0][2], kv[0][3] or "")
+        )
+    ]
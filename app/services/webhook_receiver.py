@@ -0,0 +1,80 @@
+"""Local webhook receiver for trying out subscriptions end to end.
+
+Run ``python -m app.services.webhook_receiver --secret <subscription secret>
+[--port 8766] [--fail-rate 0.3]`` and subscribe ``http://127.0.0.1:8766/``
+(the API and worker need ``WEBHOOK_ALLOW_PRIVATE=true`` to accept it).
+Each POST is checked with ``webhooks.verify`` (401 on a bad signature),
+events already seen are dropped by ``id`` the way a real receiver should,
+and the rest are printed. ``--fail-rate`` answers that share of requests
+with 503 to exercise backoff and dead-lettering.
+"""
+
+import argparse
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.services.webhooks import verify
+
+_lock = threading.Lock()
+_seen: set[int] = set()
+
+
+class Handler(BaseHTTPRequestHandler):
+    secret = ""
+    fail_rate = 0.0
+
+    def _send(self, code: int, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        if not verify(self.secret, body, self.headers.get("X-Webhook-Signature", "")):
+            self._send(401, {"error": "bad signature"})
+            return
+        if random.random() < self.fail_rate:
+            self._send(503, {"error": "simulated failure"})
+            return
+        batch = json.loads(body)
+        with _lock:
+            new = [e for e in batch["events"] if e["id"] not in _seen]
+            _seen.update(e["id"] for e in new)
+        print(
+            f"batch {batch['batch_id']}: {len(batch['events'])} events, "
+            f"{len(batch['events']) - len(new)} duplicates"
+        )
+        for e in new:
+            print(f"  #{e['id']} {e['type']} {e['object_id']}")
+        self._send(200, {"received": len(new)})
+
+    def log_message(self, *args):
+        pass  # the batch lines above are the log
+
+
+def serve(secret: str, host: str = "127.0.0.1", port: int = 8766,
+          fail_rate: float = 0.0) -> ThreadingHTTPServer:
+    """Start the receiver in a daemon thread and return it."""
+    handler = type("BoundHandler", (Handler,), {"secret": secret, "fail_rate": fail_rate})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8766)
+    ap.add_argument("--secret", required=True)
+    ap.add_argument("--fail-rate", type=float, default=0.0)
+    args = ap.parse_args()
+    Handler.secret = args.secret
+    Handler.fail_rate = args.fail_rate
+    print(f"webhook receiver listening on http://{args.host}:{args.port}/")
+    ThreadingHTTPServer((args.host, args.port), Handler).serve_forever()
@@ -0,0 +1,403 @@
+"""Outbound webhooks: tenant changes pushed to integrators in signed batches.
+
+``fan_out`` is an outbox consumer (registered in ``app.workers.tasks``). It
+turns each ``deals`` / ``quotes`` / ``purchase_orders`` change into one
+``WebhookDelivery`` row per active subscription of that tenant whose topics
+include the table. A dispatcher works like the myDATA pipeline. It claims
+up to ``WEBHOOK_BATCH_SIZE`` queued rows per subscription into a batch,
+and each batch goes out as one POST over a pooled HTTP session:
+
+    POST <url>
+    X-Webhook-Id: <batch id>
+    X-Webhook-Signature: t=<unix ts>,v1=<hex HMAC-SHA256(secret, "<ts>." + body)>
+
+    {"batch_id": ..., "events": [{"id": <outbox seq>, "type": "deals.update",
+     "tenant_id", "object_id", "data", "occurred_at"}, ...]}
+
+Only one batch per subscription is in flight, and rows go out in ``seq``
+order, so a receiver sees events in order. Delivery is at least once, so
+receivers dedupe on the event ``id``. A failed POST puts the batch back
+and pauses the subscription for an exponential backoff with jitter. Rows
+that have failed ``WEBHOOK_MAX_ATTEMPTS`` times are dead-lettered
+(``status="dead"``) and can be requeued with ``redeliver``. A 410 answer
+deactivates the subscription.
+
+URLs must resolve to public addresses only: private, loopback, link-local
+and other non-routable targets are refused when subscribing. At send time
+the pooled session checks the address each socket actually connected to,
+before anything is sent, so a host re-pointed after the check (DNS
+rebinding) is refused too. The session ignores proxy environment variables,
+since the peer would then be the proxy. ``WEBHOOK_ALLOW_PRIVATE`` lifts both
+checks for local testing; ``python -m app.services.webhook_receiver`` is such
+a local receiver.
+"""
+
+import hashlib
+import hmac
+import ipaddress
+import json
+import random
+import secrets
+import socket
+import time
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.base import uuid7
+from app.models.webhook import WebhookDelivery, WebhookSubscription
+
+CONSUMER = "webhooks"
+TOPICS = ("deals", "quotes", "purchase_orders")
+
+# rows stuck in "sending" longer than this (worker died mid-POST) are requeued
+SENDING_TIMEOUT = timedelta(minutes=5)
+
+_session: requests.Session | None = None
+
+
+class InvalidSubscription(ValueError):
+    pass
+
+
+# ── Subscriptions ────────────────────────────────────────────
+def _refused(address: str) -> bool:
+    """True for addresses webhooks must not reach (private, loopback, ...)."""
+    ip = ipaddress.ip_address(address.split("%")[0])
+    if ip.version == 6 and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return (
+        ip.is_private or ip.is_loopback or ip.is_link_local or ip.is_reserved
+        or ip.is_multicast or ip.is_unspecified
+    )
+
+
+def check_url(url: str) -> None:
+    """Raise ``InvalidSubscription`` unless *url* is http(s) on a public host.
+
+    Every address the host resolves to must be public, so a name pointing
+    into the internal network is refused like a literal private IP.
+    """
+    parts = urlparse(url)
+    if parts.scheme not in ("http", "https"):
+        raise InvalidSubscription("Webhook URL must be http(s)")
+    if not parts.hostname:
+        raise InvalidSubscription("Webhook URL has no host")
+    if settings.WEBHOOK_ALLOW_PRIVATE:
+        return
+    try:
+        infos = socket.getaddrinfo(parts.hostname, parts.port, proto=socket.IPPROTO_TCP)
+    except (OSError, UnicodeError, ValueError):
+        raise InvalidSubscription(f"Cannot resolve webhook host {parts.hostname}")
+    for *_, sockaddr in infos:
+        if _refused(sockaddr[0]):
+            raise InvalidSubscription(f"Webhook host {parts.hostname} is not a public address")
+
+
+def create_subscription(
+    db: Session, tenant_id: str, url: str, topics: list[str] | None
+) -> WebhookSubscription:
+    """Add a subscription with a fresh signing secret. Does not commit.
+
+    Raises ``InvalidSubscription`` for a URL ``check_url`` refuses or an
+    unknown topic.
+    """
+    check_url(url)
+    topics = list(dict.fromkeys(topics or TOPICS))
+    unknown = sorted(set(topics) - set(TOPICS))
+    if unknown:
+        raise InvalidSubscription(f"Unknown topics: {', '.join(unknown)}")
+    sub = WebhookSubscription(
+        tenant_id=tenant_id, url=url, topics=topics, secret=secrets.token_hex(32)
+    )
+    db.add(sub)
+    return sub
+
+
+def delete_subscription(db: Session, sub: WebhookSubscription) -> None:
+    """Remove *sub* and its delivery rows. Does not commit."""
+    db.execute(delete(WebhookDelivery).where(WebhookDelivery.subscription_id == sub.id))
+    db.delete(sub)
+
+
+def redeliver(db: Session, sub: WebhookSubscription) -> int:
+    """Requeue *sub*'s dead-lettered rows and reactivate it. Does not commit."""
+    n = (
+        db.query(WebhookDelivery)
+        .filter(
+            WebhookDelivery.subscription_id == sub.id,
+            WebhookDelivery.status == "dead",
+        )
+        .update(
+            {"status": "queued", "attempts": 0, "batch_id": None, "error": None},
+            synchronize_session=False,
+        )
+    )
+    sub.active = True
+    sub.failures = 0
+    sub.retry_at = None
+    return n
+
+
+# ── Fan-out (outbox consumer) ────────────────────────────────
+def fan_out(events: list[dict]) -> None:
+    """Queue outbox *events* for the subscriptions that want them."""
+    events = [e for e in events if e["tenant_id"] and e["table"] in TOPICS]
+    if not events:
+        return
+    from app.core.db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        subs = (
+            db.query(WebhookSubscription)
+            .filter(
+                WebhookSubscription.tenant_id.in_({e["tenant_id"] for e in events}),
+                WebhookSubscription.active.is_(True),
+            )
+            .all()
+        )
+        if not subs:
+            return
+        seen = set(
+            db.query(WebhookDelivery.subscription_id, WebhookDelivery.event_seq).filter(
+                WebhookDelivery.subscription_id.in_([s.id for s in subs]),
+                WebhookDelivery.event_seq.between(events[0]["seq"], events[-1]["seq"]),
+            )
+        )
+        rows = [
+            {
+                "id": uuid7(),
+                "tenant_id": s.tenant_id,
+                "subscription_id": s.id,
+                "event_seq": e["seq"],
+                "event_json": json.dumps(_payload(e)),
+            }
+            for e in events
+            for s in subs
+            if s.tenant_id == e["tenant_id"]
+            and e["table"] in s.topics
+            and (s.id, e["seq"]) not in seen
+        ]
+        if rows:
+            db.execute(insert(WebhookDelivery), rows)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _payload(e: dict) -> dict:
+    return {
+        "id": e["seq"],
+        "type": f"{e['table']}.{e['op']}",
+        "tenant_id": e["tenant_id"],
+        "object_id": e["row_id"],
+        "data": e["data"],
+        "occurred_at": e["at"],
+    }
+
+
+# ── Signing ──────────────────────────────────────────────────
+def sign(secret: str, body: bytes, ts: int) -> str:
+    mac = hmac.new(secret.encode(), f"{ts}.".encode() + body, hashlib.sha256)
+    return f"t={ts},v1={mac.hexdigest()}"
+
+
+def verify(secret: str, body: bytes, header: str, tolerance: int = 300) -> bool:
+    """Check an ``X-Webhook-Signature`` header; for receivers."""
+    try:
+        parts = dict(p.split("=", 1) for p in header.split(","))
+        ts = int(parts["t"])
+    except (KeyError, ValueError):
+        return False
+    if abs(time.time() - ts) > tolerance:
+        return False  # replayed or badly skewed
+    return hmac.compare_digest(sign(secret, body, ts), f"t={ts},v1={parts.get('v1', '')}")
+
+
+# ── Delivery ─────────────────────────────────────────────────
+def _check_peer(sock, host: str) -> None:
+    """Close *sock* and raise unless it is connected to a public address."""
+    if settings.WEBHOOK_ALLOW_PRIVATE:
+        return
+    if _refused(sock.getpeername()[0]):
+        sock.close()
+        raise InvalidSubscription(f"Webhook host {host} is not a public address")
+
+
+class _CheckedHTTPConnection(HTTPConnection):
+    def _new_conn(self):
+        sock = super()._new_conn()
+        _check_peer(sock, self.host)
+        return sock
+
+
+class _CheckedHTTPSConnection(HTTPSConnection):
+    def _new_conn(self):
+        sock = super()._new_conn()
+        _check_peer(sock, self.host)
+        return sock
+
+
+class _CheckedHTTPPool(HTTPConnectionPool):
+    ConnectionCls = _CheckedHTTPConnection
+
+
+class _CheckedHTTPSPool(HTTPSConnectionPool):
+    ConnectionCls = _CheckedHTTPSConnection
+
+
+class _PublicOnlyAdapter(HTTPAdapter):
+    """Checks the connected address of every new socket before it is used."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CheckedHTTPPool,
+            "https": _CheckedHTTPSPool,
+        }
+
+
+def _http() -> requests.Session:
+    """One keep-alive pool per worker process, shared by every subscription."""
+    global _session
+    if _session is None:
+        s = requests.Session()
+        s.trust_env = False  # a proxy would hide the address we check
+        adapter = _PublicOnlyAdapter(
+            pool_connections=settings.WEBHOOK_POOL_SIZE,
+            pool_maxsize=settings.WEBHOOK_POOL_SIZE,
+        )
+        s.mount("http://", adapter)
+        s.mount("https://", adapter)
+        s.headers.update({"User-Agent": "food-crm-webhooks/1", "Content-Type": "application/json"})
+        _session = s
+    return _session
+
+
+def backoff(failures: int) -> timedelta:
+    """Wait before the next attempt after *failures* consecutive failures."""
+    base = settings.WEBHOOK_BACKOFF_SECONDS * 2 ** (max(failures, 1) - 1)
+    delay = min(base, settings.WEBHOOK_BACKOFF_MAX_SECONDS)
+    return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+
+def claim_batches(db: Session) -> list[str]:
+    """Claim the next batch of every subscription that is due; returns batch ids."""
+    now = datetime.now(timezone.utc)
+    db.query(WebhookDelivery).filter(
+        WebhookDelivery.status == "sending",
+        WebhookDelivery.updated_at < now - SENDING_TIMEOUT,
+    ).update({"status": "queued", "batch_id": None}, synchronize_session=False)
+
+    busy = db.query(WebhookDelivery.subscription_id).filter(
+        WebhookDelivery.status == "sending"
+    )
+    due = [
+        s for (s,) in db.query(WebhookSubscription.id)
+        .join(WebhookDelivery, WebhookDelivery.subscription_id == WebhookSubscription.id)
+        .filter(
+            WebhookDelivery.status == "queued",
+            WebhookSubscription.active.is_(True),
+            (WebhookSubscription.retry_at.is_(None)) | (WebhookSubscription.retry_at <= now),
+            WebhookSubscription.id.notin_(busy),
+        )
+        .distinct()
+    ]
+    claimed = []
+    for sub_id in due:
+        ids = [
+            i for (i,) in db.query(WebhookDelivery.id)
+            .filter(
+                WebhookDelivery.subscription_id == sub_id,
+                WebhookDelivery.status == "queued",
+            )
+            .order_by(WebhookDelivery.event_seq)
+            .limit(settings.WEBHOOK_BATCH_SIZE)
+        ]
+        batch_id = uuid7()
+        db.query(WebhookDelivery).filter(
+            WebhookDelivery.id.in_(ids), WebhookDelivery.status == "queued"
+        ).update({"status": "sending", "batch_id": batch_id}, synchronize_session=False)
+        claimed.append(batch_id)
+    db.commit()
+    return claimed
+
+
+def send_batch(db: Session, batch_id: str) -> int:
+    """POST one claimed batch; returns how many events were delivered."""
+    rows = (
+        db.query(WebhookDelivery)
+        .filter(WebhookDelivery.batch_id == batch_id, WebhookDelivery.status == "sending")
+        .order_by(WebhookDelivery.event_seq)
+        .all()
+    )
+    if not rows:
+        return 0
+    sub = db.get(WebhookSubscription, rows[0].subscription_id)
+    body = json.dumps(
+        {"batch_id": batch_id, "events": [json.loads(r.event_json) for r in rows]}
+    ).encode()
+    now = datetime.now(timezone.utc)
+    error = None
+    try:
+        check_url(sub.url)  # fail early; the adapter re-checks the connected address
+        resp = _http().post(
+            sub.url,
+            data=body,
+            headers={
+                "X-Webhook-Id": batch_id,
+                "X-Webhook-Signature": sign(sub.secret, body, int(time.time())),
+            },
+            timeout=settings.WEBHOOK_TIMEOUT,
+            allow_redirects=False,
+        )
+        if resp.status_code == 410:
+            sub.active = False  # receiver says the endpoint is gone for good
+            error = "410 Gone: subscription deactivated"
+        elif resp.status_code >= 300:
+            error = f"HTTP {resp.status_code}: {resp.text[:200]}"
+    except (InvalidSubscription, requests.RequestException) as e:
+        error = str(e)
+
+    if error is None:
+        for r in rows:
+            r.status = "delivered"
+            r.delivered_at = now
+            r.attempts = (r.attempts or 0) + 1
+            r.error = None
+        sub.failures = 0
+        sub.retry_at = None
+        db.commit()
+        return len(rows)
+
+    sub.failures = (sub.failures or 0) + 1
+    sub.retry_at = now + backoff(sub.failures)
+    for r in rows:
+        r.attempts = (r.attempts or 0) + 1
+        r.error = error
+        r.batch_id = None
+        dead = not sub.active or r.attempts >= settings.WEBHOOK_MAX_ATTEMPTS
+        r.status = "dead" if dead else "queued"
+    db.commit()
+    return 0
+
+
+def prune(db: Session) -> int:
+    """Delete delivered rows older than ``WEBHOOK_RETENTION_DAYS``."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.WEBHOOK_RETENTION_DAYS)
+    n = db.execute(
+        delete(WebhookDelivery).where(
+            WebhookDelivery.status == "delivered", WebhookDelivery.delivered_at < cutoff
+        )
+    ).rowcount
+    db.commit()
+    return n
+
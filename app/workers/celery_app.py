@@ -1,4 +1,8 @@
 from celery import Celery
+from celery.schedules import crontab
+from celery.signals import worker_init
+
+from app.core.config import settings
 
 celery_app = Celery(
     "food_crm",
@@ -6,9 +10,34 @@ celery_app = Celery(
     backend="redis://localhost:6379/1",
 )
 
+
+
+@worker_init.connect
+def _require_redis(**kwargs):
+    # tasks raise live events (IMAP sync, move_deals); without Redis they would
+    # be delivered in the worker process, where nobody is subscribed
+    if not settings.REDIS_URL:
+        raise RuntimeError("REDIS_URL must be set for workers (live events)")
+
+
 celery_app.conf.task_routes = {
     "app.workers.tasks.imap_sync_task": {"queue": "email"},
     "app.workers.tasks.mydata_submit_task": {"queue": "invoicing"},
+    "app.workers.tasks.mydata_dispatch_task": {"queue": "invoicing"},
+    "app.workers.tasks.mydata_send_batch_task": {"queue": "invoicing"},
+    "app.workers.tasks.mydata_poll_task": {"queue": "invoicing"},
+    "app.workers.tasks.rollup_refresh_task": {"queue": "reporting"},
+    "app.workers.tasks.rollup_rebuild_task": {"queue": "reporting"},
+    "app.workers.tasks.funnel_refresh_task": {"queue": "reporting"},
+    "app.workers.tasks.deal_scoring_task": {"queue": "reporting"},
+    "app.workers.tasks.outbox_relay_task": {"queue": "outbox"},
+    "app.workers.tasks.outbox_prune_task": {"queue": "maintenance"},
+    "app.workers.tasks.webhook_dispatch_task": {"queue": "webhooks"},
+    "app.workers.tasks.webhook_send_task": {"queue": "webhooks"},
+    "app.workers.tasks.webhook_prune_task": {"queue": "maintenance"},
+    "app.workers.tasks.archive_task": {"queue": "maintenance"},
+    "app.workers.tasks.reminder_scan_task": {"queue": "notifications"},
+    "app.workers.tasks.activity_reminder_task": {"queue": "notifications"},
 }
 
 celery_app.conf.beat_schedule = {
@@ -17,4 +46,57 @@ celery_app.conf.beat_schedule = {
         "schedule": 300.0,  # every 5 minutes
         "args": [],
     },
+    "mydata-dispatch-every-30-sec": {
+        "task": "app.workers.tasks.mydata_dispatch_task",
+        "schedule": 30.0,
+    },
+    "mydata-poll-every-2-min": {
+        "task": "app.workers.tasks.mydata_poll_task",
+        "schedule": 120.0,
+    },
+    "rollups-refresh-every-10-min": {
+        "task": "app.workers.tasks.rollup_refresh_task",
+        "schedule": 600.0,
+    },
+    "funnel-refresh-every-5-min": {
+        "task": "app.workers.tasks.funnel_refresh_task",
+        "schedule": 300.0,
+    },
+    "deal-scoring-every-5-min": {
+        "task": "app.workers.tasks.deal_scoring_task",
+        "schedule": 300.0,
+    },
+    "deal-scoring-full-nightly": {
+        "task": "app.workers.tasks.deal_scoring_task",
+        "schedule": crontab(hour=3, minute=45),
+        "args": [True],
+    },
+    "rollups-rebuild-nightly": {
+        "task": "app.workers.tasks.rollup_rebuild_task",
+        "schedule": crontab(hour=3, minute=15),
+    },
+    "reminders-scan-every-min": {
+        "task": "app.workers.tasks.reminder_scan_task",
+        "schedule": 60.0,
+    },
+    "outbox-relay-every-5-sec": {
+        "task": "app.workers.tasks.outbox_relay_task",
+        "schedule": 5.0,
+    },
+    "outbox-prune-nightly": {
+        "task": "app.workers.tasks.outbox_prune_task",
+        "schedule": crontab(hour=4, minute=0),
+    },
+    "webhook-dispatch-every-5-sec": {
+        "task": "app.workers.tasks.webhook_dispatch_task",
+        "schedule": 5.0,
+    },
+    "webhook-prune-nightly": {
+        "task": "app.workers.tasks.webhook_prune_task",
+        "schedule": crontab(hour=4, minute=10),
+    },
+    "archive-nightly": {
+        "task": "app.workers.tasks.archive_task",
+        "schedule": crontab(hour=2, minute=30),
+    },
 }
@@ -1,13 +1,24 @@
 import re
+from datetime import datetime
 
 from sqlalchemy.orm import Session
 
-from app.core.db import SessionLocal
+from app.core.config import settings
+from app.core.db import SessionLocal, read_only_session
+from app.models.archive import ArchivedEmailMessage
 from app.models.company import Company
 from app.models.emailmsg import EmailMessage
+from app.models.user import User
+from app.services import (
+    archive, deal_scoring, mydata, outbox, pipeline, reminders, rollups, webhooks,
+)
 from app.services.imap_sync import fetch_latest_emails
+from app.services.mailer import send_smtp
 from app.workers.celery_app import celery_app
 
+# change-feed consumers that live in the worker (see app.services.outbox)
+outbox.subscribe(webhooks.CONSUMER, webhooks.fan_out)
+
 
 def _extract_email(s: str | None) -> str | None:
     if not s:
@@ -34,6 +45,13 @@ def imap_sync_task(tenant_id: str, limit: int = 50):
                     EmailMessage.provider_msg_id == provider_id,
                 )
                 .first()
+            ) or (
+                db.query(ArchivedEmailMessage.id)
+                .filter(
+                    ArchivedEmailMessage.tenant_id == tenant_id,
+                    ArchivedEmailMessage.provider_msg_id == provider_id,
+                )
+                .first()
             )
             if exists:
                 continue
@@ -76,9 +94,189 @@ def imap_sync_task(tenant_id: str, limit: int = 50):
 
 @celery_app.task
 def mydata_submit_task(tenant_id: str, invoice_id: str):
-    """Stub: later calls mydata_provider.submit_invoice()."""
-    return {
-        "tenant_id": tenant_id,
-        "invoice_id": invoice_id,
-        "status": "stubbed",
-    }
+    """Queue one invoice; the dispatcher batches it with the tenant's others."""
+    db: Session = SessionLocal()
+    try:
+        queued = mydata.queue_invoices(db, tenant_id, [invoice_id])
+        db.commit()
+    finally:
+        db.close()
+    return {"tenant_id": tenant_id, "invoice_id": invoice_id, "queued": bool(queued)}
+
+
+@celery_app.task
+def mydata_dispatch_task():
+    """Claim queued submissions into per-tenant batches and fan them out."""
+    db: Session = SessionLocal()
+    try:
+        claimed = mydata.claim_batches(db)
+    finally:
+        db.close()
+    for tenant_id, batch_id in claimed:
+        mydata_send_batch_task.delay(tenant_id, batch_id)
+    return len(claimed)
+
+
+@celery_app.task
+def mydata_send_batch_task(tenant_id: str, batch_id: str):
+    """Send one batch; on failure rows are requeued for the next dispatch."""
+    db: Session = SessionLocal()
+    try:
+        return mydata.send_batch(db, tenant_id, batch_id)
+    finally:
+        db.close()
+
+
+@celery_app.task
+def mydata_poll_task():
+    """Poll provider status for submitted batches."""
+    db: Session = SessionLocal()
+    try:
+        return mydata.poll_submitted(db)
+    finally:
+        db.close()
+
+
+@celery_app.task
+def rollup_refresh_task():
+    """Incrementally rebuild the daily rollups of days that changed."""
+    db: Session = SessionLocal()
+    try:
+        return rollups.refresh_rollups(db)
+    finally:
+        db.close()
+
+
+@celery_app.task
+def rollup_rebuild_task(trailing_days: int = 35):
+    """Re-derive a trailing window (catches deletes and reopened deals).
+
+    Source reads go to the replica; the window is old enough for lag not to
+    matter. The incremental refresh stays on the primary because its
+    watermark must not skip rows the replica has not seen yet.
+    """
+    db: Session = read_only_session()
+    try:
+        return rollups.rebuild_rollups(db, trailing_days)
+    finally:
+        db.close()
+
+
+@celery_app.task
+def funnel_refresh_task():
+    """Fold new deal stage events into the funnel counters."""
+    db: Session = SessionLocal()
+    try:
+        return pipeline.refresh_funnel(db)
+    finally:
+        db.close()
+
+
+@celery_app.task
+def deal_scoring_task(full: bool = False):
+    """Store win probabilities for changed open deals (all of them with *full*)."""
+    db: Session = SessionLocal()
+    try:
+        return deal_scoring.score_deals(db, full)
+    finally:
+        db.close()
+
+
+@celery_app.task
+def outbox_relay_task():
+    """Hand new outbox events to the change-feed consumers."""
+    db: Session = SessionLocal()
+    total = 0
+    try:
+        while True:
+            n = outbox.relay(db)
+            total += n
+            if n < settings.OUTBOX_BATCH_SIZE:
+                return total
+    finally:
+        db.close()
+
+
+@celery_app.task
+def outbox_prune_task():
+    """Drop outbox events every consumer has seen, past retention."""
+    db: Session = SessionLocal()
+    try:
+        return outbox.prune(db)
+    finally:
+        db.close()
+
+
+@celery_app.task
+def webhook_dispatch_task():
+    """Claim due webhook batches and fan them out to send tasks."""
+    db: Session = SessionLocal()
+    try:
+        batches = webhooks.claim_batches(db)
+    finally:
+        db.close()
+    for batch_id in batches:
+        webhook_send_task.delay(batch_id)
+    return len(batches)
+
+
+@celery_app.task
+def webhook_send_task(batch_id: str):
+    """POST one claimed webhook batch; failures back off in the database."""
+    db: Session = SessionLocal()
+    try:
+        return webhooks.send_batch(db, batch_id)
+    finally:
+        db.close()
+
+
+@celery_app.task
+def webhook_prune_task():
+    """Drop delivered webhook rows past retention."""
+    db: Session = SessionLocal()
+    try:
+        return webhooks.prune(db)
+    finally:
+        db.close()
+
+
+@celery_app.task
+def archive_task():
+    """Move old emails and completed activities into the archive tables."""
+    db: Session = SessionLocal()
+    try:
+        return archive.archive_all(db)
+    finally:
+        db.close()
+
+
+@celery_app.task
+def reminder_scan_task():
+    """Find activities falling due in the next window and queue reminders."""
+    db: Session = SessionLocal()
+    try:
+        due = reminders.due_reminders(db)
+    finally:
+        db.close()
+    for activity_id, due_at in due:
+        activity_reminder_task.delay(activity_id, due_at.isoformat())
+    return len(due)
+
+
+@celery_app.task
+def activity_reminder_task(activity_id: str, due_at: str):
+    """Email the assignee; skipped if the activity was completed or moved."""
+    db: Session = SessionLocal()
+    try:
+        a = reminders.reminder_target(db, activity_id, datetime.fromisoformat(due_at))
+        user = db.get(User, a.assigned_to) if a and a.assigned_to else None
+        if user is None or not user.is_active:
+            return False
+        send_smtp(
+            f"Reminder: {a.subject}",
+            f"{a.activity_type} due {a.due_at:%Y-%m-%d %H:%M}\n\n{a.description or ''}",
+            [user.email],
+        )
+        return True
+    finally:
+        db.close()
@@ -3,11 +3,12 @@ import os
 from datetime import date, datetime
 from typing import Optional, List, Literal, Any
 
-from fastapi import FastAPI, Depends, HTTPException, Header, Query
-from pydantic import BaseModel, Field
+import anyio
+from fastapi import FastAPI, Depends, HTTPException, Header, Query, Response
+from pydantic import BaseModel, Field, TypeAdapter
 from pydantic_settings import BaseSettings
 
-from sqlalchemy import create_engine, select, func, or_
+from sqlalchemy import create_engine, event, select, func, or_
 from sqlalchemy.orm import sessionmaker, Session
 
 from models import Base, Company, Contact, Deal, Task, Activity
@@ -20,15 +21,48 @@ class Settings(BaseSettings):
     database_url: str = Field(default="sqlite:///./crm.sqlite3", alias="DATABASE_URL")
     api_key: str = Field(default="change-me-now", alias="API_KEY")
 
+    # single-box SQLite profile (ignored for other databases)
+    sqlite_tuned: bool = Field(default=True, alias="SQLITE_TUNED")
+    sqlite_mmap_mb: int = Field(default=256, alias="SQLITE_MMAP_MB")
+    sqlite_cache_mb: int = Field(default=64, alias="SQLITE_CACHE_MB")
+    sqlite_busy_timeout_ms: int = Field(default=5000, alias="SQLITE_BUSY_TIMEOUT_MS")
+
     class Config:
         env_file = ".env"
         extra = "ignore"
 
 settings = Settings()
 
-engine = create_engine(settings.database_url, echo=False, future=True)
+_is_sqlite = settings.database_url.startswith("sqlite")
+_tuned = _is_sqlite and settings.sqlite_tuned
+
+engine = create_engine(
+    settings.database_url, echo=False, future=True,
+    **({"connect_args": {"check_same_thread": False}} if _is_sqlite else {}),
+)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
+if _tuned:
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, connection_record):
+        # WAL lets readers run alongside the writer; NORMAL only fsyncs at checkpoints
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.execute(f"PRAGMA mmap_size={settings.sqlite_mmap_mb * 1024 * 1024}")
+        cur.execute(f"PRAGMA cache_size=-{settings.sqlite_cache_mb * 1024}")  # negative = KiB
+        cur.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}")
+        cur.execute("PRAGMA temp_store=MEMORY")
+        cur.close()
+
+# SQLite allows one writer at a time; a second one waits on busy_timeout and can
+# still fail with "database is locked" when it upgrades from a read. Writers take
+# this lock first, so in-process they never contend; other processes on the same
+# file are covered by busy_timeout. Waiters park on the event loop (FIFO), not in
+# a threadpool thread, so a queue of writers cannot starve the pool that the
+# current writer needs to finish. Created on first use, inside the running loop.
+_write_lock: anyio.Lock | None = None
+
 def init_db():
     Base.metadata.create_all(engine)
 
@@ -39,6 +73,24 @@ def get_db():
     finally:
         db.close()
 
+async def get_write_db():
+    global _write_lock
+    if not _tuned:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+        return
+    if _write_lock is None:
+        _write_lock = anyio.Lock()
+    async with _write_lock:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
 def auth(x_api_key: Optional[str] = Header(default=None), authorization: Optional[str] = Header(default=None)):
     # Accept either X-API-Key or "Authorization: Bearer <key>"
     key = None
@@ -53,6 +105,25 @@ def auth(x_api_key: Optional[str] = Header(default=None), authorization: Optiona
 def not_found(entity: str):
     raise HTTPException(status_code=404, detail=f"{entity} not found")
 
+def columns(out: type[BaseModel], model) -> list:
+    # select only what the schema returns: rows stay plain tuples, no ORM identity map
+    return [getattr(model, name) for name in out.model_fields]
+
+def json_rows(adapter: TypeAdapter, db: Session, stmt) -> Response:
+    # validated once and dumped by pydantic-core; response_model is kept for the docs only
+    rows = db.execute(stmt).all()
+    return Response(adapter.dump_json(adapter.validate_python(rows, from_attributes=True)), media_type="application/json")
+
+def paged(stmt, model, out: type[BaseModel], sort: str, default: list, offset: int, limit: int):
+    # sort is "field" or "-field" over the schema's columns; id last keeps pages from overlapping
+    if sort:
+        name = sort.lstrip("-")
+        if name not in out.model_fields:
+            raise HTTPException(400, f"sort must be one of {list(out.model_fields)}, optionally prefixed with -")
+        col = getattr(model, name)
+        default = [col.desc() if sort.startswith("-") else col.asc()]
+    return stmt.order_by(*default, model.id.asc()).offset(offset).limit(limit)
+
 # ----------------- Schemas -----------------
 class CompanyIn(BaseModel):
     name: str
@@ -126,6 +197,57 @@ class ActivityOut(ActivityIn):
     id: int
     created_at: datetime
 
+# query params of each list endpoint, as accepted by POST /batch
+class PageQuery(BaseModel):
+    offset: int = Field(default=0, ge=0)
+    sort: str = ""
+
+class CompanyQuery(PageQuery):
+    q: str = ""
+    limit: int = Field(default=200, ge=1, le=2000)
+
+class ContactQuery(PageQuery):
+    q: str = ""
+    company_id: Optional[int] = None
+    limit: int = Field(default=500, ge=1, le=5000)
+
+class DealQuery(PageQuery):
+    q: str = ""
+    stage: str = "All"
+    company_id: Optional[int] = None
+    limit: int = Field(default=500, ge=1, le=5000)
+
+class TaskQuery(PageQuery):
+    status: str = "All"
+    owner: str = ""
+    due_before: Optional[date] = None
+    limit: int = Field(default=1000, ge=1, le=5000)
+
+class ActivityQuery(PageQuery):
+    q: str = ""
+    days: int = Field(default=30, ge=1, le=3650)
+    limit: int = Field(default=2000, ge=1, le=10000)
+
+class BatchIn(BaseModel):
+    kpi: bool = False
+    companies: Optional[CompanyQuery] = None
+    contacts: Optional[ContactQuery] = None
+    deals: Optional[DealQuery] = None
+    tasks: Optional[TaskQuery] = None
+    activities: Optional[ActivityQuery] = None
+
+CompanyList = TypeAdapter(List[CompanyOut])
+ContactList = TypeAdapter(List[ContactOut])
+DealList = TypeAdapter(List[DealOut])
+TaskList = TypeAdapter(List[TaskOut])
+ActivityList = TypeAdapter(List[ActivityOut])
+
+class StageOut(BaseModel):
+    stage: str
+    deals: int
+    total: float
+    weighted: float
+
 class KPIOut(BaseModel):
     companies: int
     contacts: int
@@ -133,6 +255,7 @@ class KPIOut(BaseModel):
     open_tasks: int
     pipeline_total: float
     pipeline_weighted: float
+    by_stage: List[StageOut] = []
 
 # ----------------- App -----------------
 app = FastAPI(title="CRM API", version="2.0")
@@ -156,6 +279,14 @@ def kpi(db: Session = Depends(get_db)):
 
     total = db.scalar(select(func.coalesce(func.sum(Deal.value_eur), 0.0))) or 0.0
     weighted = db.scalar(select(func.coalesce(func.sum(Deal.value_eur * (Deal.probability/100.0)), 0.0))) or 0.0
+    by_stage = db.execute(
+        select(
+            Deal.stage,
+            func.count(),
+            func.coalesce(func.sum(Deal.value_eur), 0.0),
+            func.coalesce(func.sum(Deal.value_eur * (Deal.probability/100.0)), 0.0),
+        ).group_by(Deal.stage)
+    ).all()
 
     return KPIOut(
         companies=int(companies),
@@ -164,6 +295,7 @@ def kpi(db: Session = Depends(get_db)):
         open_tasks=int(open_tasks),
         pipeline_total=float(total),
         pipeline_weighted=float(weighted),
+        by_stage=[StageOut(stage=stage, deals=n, total=float(t), weighted=float(w)) for stage, n, t, w in by_stage],
     )
 
 # -------- Companies --------
@@ -171,34 +303,36 @@ def kpi(db: Session = Depends(get_db)):
 def companies_list(
     q: str = Query(default="", description="Search"),
     limit: int = Query(default=200, ge=1, le=2000),
+    offset: int = Query(default=0, ge=0),
+    sort: str = Query(default="", description="Column, - prefix for descending"),
     db: Session = Depends(get_db)
 ):
-    stmt = select(Company).order_by(Company.name.asc()).limit(limit)
+    stmt = select(*columns(CompanyOut, Company))
     if q.strip():
         like = f"%{q.strip()}%"
-        stmt = select(Company).where(
+        stmt = stmt.where(
             or_(
                 Company.name.like(like),
                 Company.country.like(like),
                 Company.city.like(like),
                 Company.vat.like(like),
             )
-        ).order_by(Company.name.asc()).limit(limit)
-    rows = db.scalars(stmt).all()
-    return [CompanyOut(**r.__dict__) for r in rows]
+        )
+    stmt = paged(stmt, Company, CompanyOut, sort, [Company.name.asc()], offset, limit)
+    return json_rows(CompanyList, db, stmt)
 
 @app.post("/companies", response_model=CompanyOut, dependencies=[Depends(auth)])
-def companies_create(payload: CompanyIn, db: Session = Depends(get_db)):
+def companies_create(payload: CompanyIn, db: Session = Depends(get_write_db)):
     if not payload.name.strip():
         raise HTTPException(400, "name is required")
     row = Company(**payload.model_dump())
     db.add(row)
     db.commit()
     db.refresh(row)
-    return CompanyOut(**row.__dict__)
+    return CompanyOut.model_validate(row, from_attributes=True)
 
 @app.put("/companies/{company_id}", response_model=CompanyOut, dependencies=[Depends(auth)])
-def companies_update(company_id: int, payload: CompanyIn, db: Session = Depends(get_db)):
+def companies_update(company_id: int, payload: CompanyIn, db: Session = Depends(get_write_db)):
     row = db.get(Company, company_id)
     if not row:
         not_found("company")
@@ -206,10 +340,10 @@ def companies_update(company_id: int, payload: CompanyIn, db: Session = Depends(
         setattr(row, k, v)
     db.commit()
     db.refresh(row)
-    return CompanyOut(**row.__dict__)
+    return CompanyOut.model_validate(row, from_attributes=True)
 
 @app.delete("/companies/{company_id}", dependencies=[Depends(auth)])
-def companies_delete(company_id: int, db: Session = Depends(get_db)):
+def companies_delete(company_id: int, db: Session = Depends(get_write_db)):
     row = db.get(Company, company_id)
     if not row:
         not_found("company")
@@ -223,9 +357,11 @@ def contacts_list(
     q: str = Query(default=""),
     company_id: Optional[int] = Query(default=None),
     limit: int = Query(default=500, ge=1, le=5000),
+    offset: int = Query(default=0, ge=0),
+    sort: str = Query(default=""),
     db: Session = Depends(get_db),
 ):
-    stmt = select(Contact).order_by(Contact.last_name.asc(), Contact.first_name.asc()).limit(limit)
+    stmt = select(*columns(ContactOut, Contact))
     if company_id:
         stmt = stmt.where(Contact.company_id == company_id)
     if q.strip():
@@ -238,19 +374,19 @@ def contacts_list(
                 Contact.phone.like(like),
             )
         )
-    rows = db.scalars(stmt).all()
-    return [ContactOut(**r.__dict__) for r in rows]
+    stmt = paged(stmt, Contact, ContactOut, sort, [Contact.last_name.asc(), Contact.first_name.asc()], offset, limit)
+    return json_rows(ContactList, db, stmt)
 
 @app.post("/contacts", response_model=ContactOut, dependencies=[Depends(auth)])
-def contacts_create(payload: ContactIn, db: Session = Depends(get_db)):
+def contacts_create(payload: ContactIn, db: Session = Depends(get_write_db)):
     row = Contact(**payload.model_dump())
     db.add(row)
     db.commit()
     db.refresh(row)
-    return ContactOut(**row.__dict__)
+    return ContactOut.model_validate(row, from_attributes=True)
 
 @app.put("/contacts/{contact_id}", response_model=ContactOut, dependencies=[Depends(auth)])
-def contacts_update(contact_id: int, payload: ContactIn, db: Session = Depends(get_db)):
+def contacts_update(contact_id: int, payload: ContactIn, db: Session = Depends(get_write_db)):
     row = db.get(Contact, contact_id)
     if not row:
         not_found("contact")
@@ -258,10 +394,10 @@ def contacts_update(contact_id: int, payload: ContactIn, db: Session = Depends(g
         setattr(row, k, v)
     db.commit()
     db.refresh(row)
-    return ContactOut(**row.__dict__)
+    return ContactOut.model_validate(row, from_attributes=True)
 
 @app.delete("/contacts/{contact_id}", dependencies=[Depends(auth)])
-def contacts_delete(contact_id: int, db: Session = Depends(get_db)):
+def contacts_delete(contact_id: int, db: Session = Depends(get_write_db)):
     row = db.get(Contact, contact_id)
     if not row:
         not_found("contact")
@@ -276,9 +412,11 @@ def deals_list(
     stage: str = Query(default="All"),
     company_id: Optional[int] = Query(default=None),
     limit: int = Query(default=500, ge=1, le=5000),
+    offset: int = Query(default=0, ge=0),
+    sort: str = Query(default=""),
     db: Session = Depends(get_db),
 ):
-    stmt = select(Deal).order_by(Deal.created_at.desc()).limit(limit)
+    stmt = select(*columns(DealOut, Deal))
     if stage != "All":
         stmt = stmt.where(Deal.stage == stage)
     if company_id:
@@ -286,11 +424,11 @@ def deals_list(
     if q.strip():
         like = f"%{q.strip()}%"
         stmt = stmt.where(or_(Deal.title.like(like), Deal.owner.like(like)))
-    rows = db.scalars(stmt).all()
-    return [DealOut(**r.__dict__) for r in rows]
+    stmt = paged(stmt, Deal, DealOut, sort, [Deal.created_at.desc()], offset, limit)
+    return json_rows(DealList, db, stmt)
 
 @app.post("/deals", response_model=DealOut, dependencies=[Depends(auth)])
-def deals_create(payload: DealIn, db: Session = Depends(get_db)):
+def deals_create(payload: DealIn, db: Session = Depends(get_write_db)):
     if payload.stage not in PIPELINE_STAGES:
         raise HTTPException(400, f"stage must be one of {PIPELINE_STAGES}")
     if payload.probability < 0 or payload.probability > 100:
@@ -299,10 +437,10 @@ def deals_create(payload: DealIn, db: Session = Depends(get_db)):
     db.add(row)
     db.commit()
     db.refresh(row)
-    return DealOut(**row.__dict__)
+    return DealOut.model_validate(row, from_attributes=True)
 
 @app.put("/deals/{deal_id}", response_model=DealOut, dependencies=[Depends(auth)])
-def deals_update(deal_id: int, payload: DealIn, db: Session = Depends(get_db)):
+def deals_update(deal_id: int, payload: DealIn, db: Session = Depends(get_write_db)):
     row = db.get(Deal, deal_id)
     if not row:
         not_found("deal")
@@ -314,10 +452,10 @@ def deals_update(deal_id: int, payload: DealIn, db: Session = Depends(get_db)):
         setattr(row, k, v)
     db.commit()
     db.refresh(row)
-    return DealOut(**row.__dict__)
+    return DealOut.model_validate(row, from_attributes=True)
 
 @app.delete("/deals/{deal_id}", dependencies=[Depends(auth)])
-def deals_delete(deal_id: int, db: Session = Depends(get_db)):
+def deals_delete(deal_id: int, db: Session = Depends(get_write_db)):
     row = db.get(Deal, deal_id)
     if not row:
         not_found("deal")
@@ -332,20 +470,22 @@ def tasks_list(
     owner: str = Query(default=""),
     due_before: Optional[date] = Query(default=None),
     limit: int = Query(default=1000, ge=1, le=5000),
+    offset: int = Query(default=0, ge=0),
+    sort: str = Query(default=""),
     db: Session = Depends(get_db),
 ):
-    stmt = select(Task).order_by(Task.priority.asc(), Task.due_date.asc().nullslast(), Task.created_at.desc()).limit(limit)
+    stmt = select(*columns(TaskOut, Task))
     if status != "All":
         stmt = stmt.where(Task.status == status)
     if owner.strip():
         stmt = stmt.where(Task.owner.like(f"%{owner.strip()}%"))
     if due_before:
         stmt = stmt.where(Task.due_date != None).where(Task.due_date <= due_before)
-    rows = db.scalars(stmt).all()
-    return [TaskOut(**r.__dict__) for r in rows]
+    stmt = paged(stmt, Task, TaskOut, sort, [Task.priority.asc(), Task.due_date.asc().nullslast(), Task.created_at.desc()], offset, limit)
+    return json_rows(TaskList, db, stmt)
 
 @app.post("/tasks", response_model=TaskOut, dependencies=[Depends(auth)])
-def tasks_create(payload: TaskIn, db: Session = Depends(get_db)):
+def tasks_create(payload: TaskIn, db: Session = Depends(get_write_db)):
     if payload.status not in TASK_STATUS:
         raise HTTPException(400, f"status must be one of {TASK_STATUS}")
     if payload.priority not in (1,2,3):
@@ -354,10 +494,10 @@ def tasks_create(payload: TaskIn, db: Session = Depends(get_db)):
     db.add(row)
     db.commit()
     db.refresh(row)
-    return TaskOut(**row.__dict__)
+    return TaskOut.model_validate(row, from_attributes=True)
 
 @app.put("/tasks/{task_id}", response_model=TaskOut, dependencies=[Depends(auth)])
-def tasks_update(task_id: int, payload: TaskIn, db: Session = Depends(get_db)):
+def tasks_update(task_id: int, payload: TaskIn, db: Session = Depends(get_write_db)):
     row = db.get(Task, task_id)
     if not row:
         not_found("task")
@@ -369,10 +509,10 @@ def tasks_update(task_id: int, payload: TaskIn, db: Session = Depends(get_db)):
         setattr(row, k, v)
     db.commit()
     db.refresh(row)
-    return TaskOut(**row.__dict__)
+    return TaskOut.model_validate(row, from_attributes=True)
 
 @app.delete("/tasks/{task_id}", dependencies=[Depends(auth)])
-def tasks_delete(task_id: int, db: Session = Depends(get_db)):
+def tasks_delete(task_id: int, db: Session = Depends(get_write_db)):
     row = db.get(Task, task_id)
     if not row:
         not_found("task")
@@ -386,31 +526,47 @@ def activities_list(
     q: str = Query(default=""),
     days: int = Query(default=30, ge=1, le=3650),
     limit: int = Query(default=2000, ge=1, le=10000),
+    offset: int = Query(default=0, ge=0),
+    sort: str = Query(default=""),
     db: Session = Depends(get_db),
 ):
     cutoff = date.fromordinal(date.today().toordinal() - days)
-    stmt = select(Activity).where(Activity.activity_date >= cutoff).order_by(Activity.activity_date.desc(), Activity.created_at.desc()).limit(limit)
+    stmt = select(*columns(ActivityOut, Activity)).where(Activity.activity_date >= cutoff)
     if q.strip():
         like = f"%{q.strip()}%"
         stmt = stmt.where(or_(Activity.subject.like(like), Activity.body.like(like), Activity.activity_type.like(like)))
-    rows = db.scalars(stmt).all()
-    return [ActivityOut(**r.__dict__) for r in rows]
+    stmt = paged(stmt, Activity, ActivityOut, sort, [Activity.activity_date.desc(), Activity.created_at.desc()], offset, limit)
+    return json_rows(ActivityList, db, stmt)
 
 @app.post("/activities", response_model=ActivityOut, dependencies=[Depends(auth)])
-def activities_create(payload: ActivityIn, db: Session = Depends(get_db)):
+def activities_create(payload: ActivityIn, db: Session = Depends(get_write_db)):
     if payload.activity_type not in ACTIVITY_TYPES:
         raise HTTPException(400, f"activity_type must be one of {ACTIVITY_TYPES}")
     row = Activity(**payload.model_dump())
     db.add(row)
     db.commit()
     db.refresh(row)
-    return ActivityOut(**row.__dict__)
+    return ActivityOut.model_validate(row, from_attributes=True)
 
 @app.delete("/activities/{activity_id}", dependencies=[Depends(auth)])
-def activities_delete(activity_id: int, db: Session = Depends(get_db)):
+def activities_delete(activity_id: int, db: Session = Depends(get_write_db)):
     row = db.get(Activity, activity_id)
     if not row:
         not_found("activity")
     db.delete(row)
     db.commit()
     return {"deleted": True}
+
+# -------- Batch --------
+@app.post("/batch", dependencies=[Depends(auth)])
+def batch(payload: BatchIn, db: Session = Depends(get_db)):
+    # everything a UI page needs in one round trip; each part is the exact body of its list endpoint
+    lists = {"companies": companies_list, "contacts": contacts_list, "deals": deals_list, "tasks": tasks_list, "activities": activities_list}
+    parts = []
+    if payload.kpi:
+        parts.append(b'"kpi":' + kpi(db).model_dump_json().encode())
+    for name, endpoint in lists.items():
+        params = getattr(payload, name)
+        if params is not None:
+            parts.append(f'"{name}":'.encode() + endpoint(**params.model_dump(), db=db).body)
+    return Response(b"{" + b",".join(parts) + b"}", media_type="application/json")
@@ -0,0 +1,116 @@
+"""Reads/sec and writes/sec of the crm_v2 SQLite setup under N concurrent clients.
+
+    python bench_sqlite.py --clients 8 --seconds 10
+    SQLITE_TUNED=0 python bench_sqlite.py --clients 8     # untuned, for comparison
+    python bench_sqlite.py --clients 60 --write-ratio 1   # more writers than pool threads
+
+Runs the real app under uvicorn (in this process, on ``--port``) against a
+scratch database (``--db``, default ``bench.sqlite3``) seeded with ``--seed``
+activities. Each client is a thread with its own keep-alive HTTP session:
+reads list the last 30 days of activities, writes POST one activity. Going
+through HTTP matters: write serialization has to hold up when more writers
+are waiting than the server has threadpool threads (40 by default), which
+direct endpoint calls would not exercise. Requests slower than
+``--timeout`` count as timeouts; any timeout means writers are stuck.
+"""
+from __future__ import annotations
+import argparse
+import os
+import sys
+import threading
+import time
+from datetime import date, timedelta
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--clients", type=int, default=8)
+parser.add_argument("--seconds", type=float, default=10.0)
+parser.add_argument("--write-ratio", type=float, default=0.2, help="share of operations that write")
+parser.add_argument("--read-limit", type=int, default=200, help="rows per list read")
+parser.add_argument("--seed", type=int, default=5000)
+parser.add_argument("--db", default="bench.sqlite3")
+parser.add_argument("--port", type=int, default=8799)
+parser.add_argument("--timeout", type=float, default=10.0, help="seconds before a request counts as stuck")
+args = parser.parse_args()
+
+for suffix in ("", "-wal", "-shm"):
+    if os.path.exists(args.db + suffix):
+        os.remove(args.db + suffix)
+os.environ["DATABASE_URL"] = f"sqlite:///{args.db}"
+os.environ.setdefault("API_KEY", "bench")
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import backend  # noqa: E402  (reads DATABASE_URL at import)
+import requests  # noqa: E402
+import uvicorn  # noqa: E402
+from models import Activity  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+backend.init_db()
+with backend.engine.begin() as conn:
+    today = date.today()
+    conn.execute(insert(Activity), [
+        {"activity_type": "Note", "subject": f"seed {i}", "activity_date": today - timedelta(days=i % 60)}
+        for i in range(args.seed)
+    ])
+
+server = uvicorn.Server(uvicorn.Config(backend.app, host="127.0.0.1", port=args.port, log_level="warning"))
+threading.Thread(target=server.run, daemon=True).start()
+while not server.started:
+    time.sleep(0.05)
+base = f"http://127.0.0.1:{args.port}"
+headers = {"X-API-Key": backend.settings.api_key}
+
+stop = threading.Event()
+lock = threading.Lock()
+totals = {"reads": 0, "writes": 0, "errors": 0, "timeouts": 0}
+
+def client(idx: int):
+    http = requests.Session()
+    http.headers.update(headers)
+    counts = dict.fromkeys(totals, 0)
+    every = max(1, round(1 / args.write_ratio)) if args.write_ratio > 0 else 0
+    n = idx
+    while not stop.is_set():
+        n += 1
+        write = bool(every) and n % every == 0
+        try:
+            if write:
+                r = http.post(f"{base}/activities", timeout=args.timeout, json={
+                    "activity_type": "Call", "subject": f"bench {n}", "activity_date": date.today().isoformat(),
+                })
+            else:
+                r = http.get(f"{base}/activities", timeout=args.timeout,
+                             params={"days": 30, "limit": args.read_limit})
+        except requests.Timeout:
+            counts["timeouts"] += 1
+            continue
+        if r.status_code != 200:
+            counts["errors"] += 1
+        else:
+            counts["writes" if write else "reads"] += 1
+    with lock:
+        for k, v in counts.items():
+            totals[k] += v
+
+threads = [threading.Thread(target=client, args=(i,)) for i in range(args.clients)]
+start = time.perf_counter()
+for t in threads:
+    t.start()
+time.sleep(args.seconds)
+stop.set()
+for t in threads:
+    t.join()
+elapsed = time.perf_counter() - start
+try:  # a deadlocked server stops answering even this
+    health = requests.get(f"{base}/health", timeout=args.timeout).status_code
+except requests.RequestException:
+    health = "no answer"
+server.should_exit = True
+
+mode = "tuned" if backend.settings.sqlite_tuned else "untuned"
+print(f"{mode} sqlite, {args.clients} clients, {elapsed:.1f}s")
+print(f"reads/sec : {totals['reads'] / elapsed:10.1f}")
+print(f"writes/sec: {totals['writes'] / elapsed:10.1f}")
+print(f"non-200 responses: {totals['errors']}")
+print(f"timeouts (> {args.timeout:g}s): {totals['timeouts']}")
+print(f"/health afterwards: {health}")
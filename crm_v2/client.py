@@ -0,0 +1,79 @@
+"""HTTP client for ui.py.
+
+One pooled ``requests.Session`` per server process, reads cached with
+``st.cache_data`` for ``UI_CACHE_TTL`` seconds, and ``batch`` to fetch every
+collection a page needs in one ``POST /batch``. Successful writes clear the
+read cache, so the next render sees them.
+"""
+import os
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+
+API_BASE = os.getenv("API_BASE", "http://127.0.0.1:8000")
+API_KEY = os.getenv("API_KEY", "change-me-now")
+CACHE_TTL = int(os.getenv("UI_CACHE_TTL", "30"))
+
+class APIError(Exception):
+    pass
+
+@st.cache_resource
+def _session() -> requests.Session:
+    s = requests.Session()
+    pool = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    s.mount("http://", pool)
+    s.mount("https://", pool)
+    s.headers["X-API-Key"] = API_KEY
+    return s
+
+def _request(method, path, **kw):
+    r = _session().request(method, f"{API_BASE}{path}", timeout=30, **kw)
+    if r.status_code >= 400:
+        raise APIError(f"API error {r.status_code}: {r.text}")
+    return r.json()
+
+# errors are raised, not returned, so a failed call is never cached
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _cached_get(path, params):
+    return _request("GET", path, params=params)
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _cached_batch(parts):
+    return _request("POST", "/batch", json=parts)
+
+def _call(fn, *args, **kw):
+    try:
+        return fn(*args, **kw)
+    except (APIError, requests.RequestException) as e:
+        st.error(str(e))
+        return None
+
+def invalidate():
+    _cached_get.clear()
+    _cached_batch.clear()
+
+def get(path, params=None):
+    return _call(_cached_get, path, params or {})
+
+def batch(**parts):
+    """``batch(kpi=True, deals={"stage": "Won"})`` -> ``{"kpi": ..., "deals": [...]}``.
+
+    Each keyword is a collection with the query params of its list endpoint.
+    """
+    return _call(_cached_batch, parts) or {}
+
+def _write(method, path, payload=None):
+    out = _call(_request, method, path, **({"json": payload} if payload is not None else {}))
+    if out is not None:
+        invalidate()
+    return out
+
+def post(path, payload):
+    return _write("POST", path, payload)
+
+def put(path, payload):
+    return _write("PUT", path, payload)
+
+def delete(path):
+    return _write("DELETE", path)
@@ -122,5 +122,6 @@ class Activity(Base):
     deal: Mapped[Optional[Deal]] = relationship(back_populates="activities")
 
 Index("idx_deals_stage_created", Deal.stage, Deal.created_at)
+Index("idx_deals_created", Deal.created_at)
 Index("idx_tasks_status_due", Task.status, Task.due_date)
 Index("idx_activities_date_created", Activity.activity_date, Activity.created_at)
@@ -1,47 +1,59 @@
-import os
 from datetime import date
 import pandas as pd
-import requests
 import streamlit as st
 
-API_BASE = os.getenv("API_BASE", "http://127.0.0.1:8000")
-API_KEY = os.getenv("API_KEY", "change-me-now")
+import client
+from client import API_BASE
 
 PIPELINE_STAGES = ["Lead", "Qualified", "Proposal", "Negotiation", "Won", "Lost"]
 TASK_STATUS = ["Open", "In Progress", "Done", "Blocked"]
 ACTIVITY_TYPES = ["Call", "Email", "Meeting", "Note", "Task", "WhatsApp", "Other"]
 
-def api_get(path, params=None):
-    r = requests.get(f"{API_BASE}{path}", params=params or {}, headers={"X-API-Key": API_KEY}, timeout=30)
-    if r.status_code >= 400:
-        st.error(f"API error {r.status_code}: {r.text}")
-        return None
-    return r.json()
-
-def api_post(path, payload):
-    r = requests.post(f"{API_BASE}{path}", json=payload, headers={"X-API-Key": API_KEY}, timeout=30)
-    if r.status_code >= 400:
-        st.error(f"API error {r.status_code}: {r.text}")
-        return None
-    return r.json()
-
-def api_put(path, payload):
-    r = requests.put(f"{API_BASE}{path}", json=payload, headers={"X-API-Key": API_KEY}, timeout=30)
-    if r.status_code >= 400:
-        st.error(f"API error {r.status_code}: {r.text}")
-        return None
-    return r.json()
-
-def api_delete(path):
-    r = requests.delete(f"{API_BASE}{path}", headers={"X-API-Key": API_KEY}, timeout=30)
-    if r.status_code >= 400:
-        st.error(f"API error {r.status_code}: {r.text}")
-        return None
-    return r.json()
-
 def to_df(x):
     return pd.DataFrame(x) if x else pd.DataFrame()
 
+PAGE_SIZES = [25, 50, 100, 200]
+
+def _turn(name, step):
+    st.session_state[f"{name}_page"] += step
+
+def paged_table(name, params, sort_columns, derive=None, **also):
+    """Show one page of a list endpoint; sorting, filtering and paging happen server-side.
+
+    ``also`` are extra collections fetched in the same /batch call. Returns
+    ``(rows of the page, whole batch response)``.
+    """
+    c1, c2, c3 = st.columns([2, 1, 1])
+    sort_col = c1.selectbox("Sort by", ["(default)"] + sort_columns, key=f"{name}_sort")
+    desc = c2.toggle("Descending", key=f"{name}_desc")
+    size = c3.selectbox("Rows per page", PAGE_SIZES, index=1, key=f"{name}_size")
+    sort = "" if sort_col == "(default)" else ("-" if desc else "") + sort_col
+
+    # a new filter, sort or page size starts over at the first page
+    view = repr((sorted(params.items()), sort, size))
+    if st.session_state.get(f"{name}_view") != view:
+        st.session_state[f"{name}_view"] = view
+        st.session_state[f"{name}_page"] = 0
+    page = st.session_state[f"{name}_page"]
+
+    # one extra row tells whether there is a next page without counting
+    data = client.batch(**{name: {**params, "sort": sort, "offset": page * size, "limit": size + 1}}, **also)
+    rows = data.get(name) or []
+    has_next = len(rows) > size
+    rows = rows[:size]
+
+    df = to_df(rows)
+    if derive and not df.empty:
+        df = derive(df)
+    st.dataframe(df, use_container_width=True, hide_index=True)
+    p1, p2, p3, p4 = st.columns([1, 1, 2, 2])
+    p1.button("‹ Prev", key=f"{name}_prev", disabled=page == 0, on_click=_turn, args=(name, -1))
+    p2.button("Next ›", key=f"{name}_next", disabled=not has_next, on_click=_turn, args=(name, 1))
+    p3.caption(f"Page {page + 1} · rows {page * size + 1 if rows else 0}–{page * size + len(rows)}")
+    if not df.empty:
+        p4.download_button("Download page CSV", df.to_csv(index=False).encode("utf-8"), f"{name}.csv", "text/csv", key=f"{name}_csv")
+    return rows, data
+
 def money(x):
     try:
         return f"€{float(x):,.2f}"
@@ -56,7 +68,7 @@ page = st.sidebar.radio("Menu", ["Dashboard", "Companies", "Contacts", "Deals",
 st.sidebar.caption(f"API: {API_BASE}")
 
 if page == "Dashboard":
-    kpi = api_get("/kpi")
+    kpi = client.batch(kpi=True).get("kpi")
     if kpi:
         c1, c2, c3, c4 = st.columns(4)
         c1.metric("Companies", kpi["companies"])
@@ -69,29 +81,21 @@ if page == "Dashboard":
         b.metric("Pipeline (Weighted)", money(kpi["pipeline_weighted"]))
 
     st.subheader("Deals by Stage")
-    deals = api_get("/deals", params={"stage": "All"})
-    df = to_df(deals)
-    if df.empty:
+    agg = to_df((kpi or {}).get("by_stage"))
+    if agg.empty:
         st.info("No deals yet.")
     else:
-        df["weighted"] = df["value_eur"].fillna(0) * (df["probability"].fillna(0)/100.0)
-        agg = df.groupby("stage").agg(deals=("id","count"), total=("value_eur","sum"), weighted=("weighted","sum")).reset_index()
         st.dataframe(agg, use_container_width=True)
         st.bar_chart(agg.set_index("stage")["total"])
 
 elif page == "Companies":
     st.subheader("List")
     q = st.text_input("Search", "")
-    data = api_get("/companies", params={"q": q})
-    df = to_df(data)
-    st.dataframe(df, use_container_width=True)
-    if not df.empty:
-        st.download_button("Download CSV", df.to_csv(index=False).encode("utf-8"), "companies.csv", "text/csv")
+    companies, _ = paged_table("companies", {"q": q}, ["name", "country", "city", "vat", "created_at"])
 
     st.divider()
     st.subheader("Add / Update / Delete")
     mode = st.radio("Mode", ["Add", "Update", "Delete"], horizontal=True)
-    companies = api_get("/companies", params={"q": ""}) or []
     opts = {f'{c["name"]} (#{c["id"]})': c["id"] for c in companies}
 
     sel_id = None
@@ -113,17 +117,18 @@ elif page == "Companies":
     col1, col2, col3 = st.columns(3)
     if col1.button("Execute"):
         if mode == "Add":
-            api_post("/companies", payload)
+            client.post("/companies", payload)
         elif mode == "Update":
             if sel_id:
-                api_put(f"/companies/{sel_id}", payload)
+                client.put(f"/companies/{sel_id}", payload)
         else:
             if sel_id:
-                api_delete(f"/companies/{sel_id}")
+                client.delete(f"/companies/{sel_id}")
 
 elif page == "Contacts":
     st.subheader("List")
-    companies = api_get("/companies", params={"q": ""}) or []
+    # the filter options are needed before the contacts query; same cache entry as the Companies page
+    companies = client.batch(companies={"q": ""}).get("companies") or []
     comp_map = {"All": None} | {f'{c["name"]} (#{c["id"]})': c["id"] for c in companies}
     comp_sel = st.selectbox("Company filter", list(comp_map.keys()))
     company_id = comp_map[comp_sel]
@@ -132,17 +137,12 @@ elif page == "Contacts":
     params = {"q": q}
     if company_id:
         params["company_id"] = company_id
-    data = api_get("/contacts", params=params)
-    df = to_df(data)
-    st.dataframe(df, use_container_width=True)
-    if not df.empty:
-        st.download_button("Download CSV", df.to_csv(index=False).encode("utf-8"), "contacts.csv", "text/csv")
+    contacts, _ = paged_table("contacts", params, ["last_name", "first_name", "email", "company_id", "created_at"])
 
     st.divider()
     st.subheader("Add / Update / Delete")
     mode = st.radio("Mode", ["Add", "Update", "Delete"], horizontal=True, key="ct_mode")
 
-    contacts = api_get("/contacts", params={"q": ""}) or []
     opts = {f'{(c.get("first_name") or "")} {(c.get("last_name") or "")} — {c.get("email") or ""} (#{c["id"]})': c["id"] for c in contacts}
     sel_id = None
     if mode != "Add" and opts:
@@ -164,37 +164,35 @@ elif page == "Contacts":
 
     if st.button("Execute", key="ct_exec"):
         if mode == "Add":
-            api_post("/contacts", payload)
+            client.post("/contacts", payload)
         elif mode == "Update":
             if sel_id:
-                api_put(f"/contacts/{sel_id}", payload)
+                client.put(f"/contacts/{sel_id}", payload)
         else:
             if sel_id:
-                api_delete(f"/contacts/{sel_id}")
+                client.delete(f"/contacts/{sel_id}")
 
 elif page == "Deals":
     st.subheader("List")
     q = st.text_input("Search deal", "")
     stage = st.selectbox("Stage", ["All"] + PIPELINE_STAGES)
-    data = api_get("/deals", params={"q": q, "stage": stage})
-    df = to_df(data)
-    if not df.empty:
-        df["weighted"] = df["value_eur"].fillna(0) * (df["probability"].fillna(0)/100.0)
-    st.dataframe(df, use_container_width=True)
-    if not df.empty:
-        st.download_button("Download CSV", df.to_csv(index=False).encode("utf-8"), "deals.csv", "text/csv")
+    deals, data = paged_table(
+        "deals", {"q": q, "stage": stage},
+        ["created_at", "title", "stage", "value_eur", "probability", "expected_close_date", "owner"],
+        derive=lambda df: df.assign(weighted=df["value_eur"].fillna(0) * (df["probability"].fillna(0)/100.0)),
+        companies={"q": ""},
+    )
 
     st.divider()
     st.subheader("Add / Update / Delete")
     mode = st.radio("Mode", ["Add", "Update", "Delete"], horizontal=True, key="deal_mode")
-    deals = api_get("/deals", params={"stage": "All"}) or []
     opts = {f'{d["title"]} [{d["stage"]}] (#{d["id"]})': d["id"] for d in deals}
     sel_id = None
     if mode != "Add" and opts:
         sel_label = st.selectbox("Select deal", list(opts.keys()))
         sel_id = opts[sel_label]
 
-    companies = api_get("/companies", params={"q": ""}) or []
+    companies = data.get("companies") or []
     company_id = st.selectbox("Company (optional)", ["None"] + [f'{c["name"]} (#{c["id"]})' for c in companies])
     company_id = None if company_id == "None" else int(company_id.split("#")[-1].rstrip(")"))
 
@@ -215,13 +213,13 @@ elif page == "Deals":
 
     if st.button("Execute", key="deal_exec"):
         if mode == "Add":
-            api_post("/deals", payload)
+            client.post("/deals", payload)
         elif mode == "Update":
             if sel_id:
-                api_put(f"/deals/{sel_id}", payload)
+                client.put(f"/deals/{sel_id}", payload)
         else:
             if sel_id:
-                api_delete(f"/deals/{sel_id}")
+                client.delete(f"/deals/{sel_id}")
 
 elif page == "Tasks":
     st.subheader("List")
@@ -233,16 +231,11 @@ elif page == "Tasks":
     if isinstance(due_before, date):
         params["due_before"] = due_before.isoformat()
 
-    data = api_get("/tasks", params=params)
-    df = to_df(data)
-    st.dataframe(df, use_container_width=True)
-    if not df.empty:
-        st.download_button("Download CSV", df.to_csv(index=False).encode("utf-8"), "tasks.csv", "text/csv")
+    tasks, _ = paged_table("tasks", params, ["priority", "due_date", "status", "title", "owner", "created_at"])
 
     st.divider()
     st.subheader("Add / Update / Delete")
     mode = st.radio("Mode", ["Add", "Update", "Delete"], horizontal=True, key="task_mode")
-    tasks = api_get("/tasks", params={"status": "All"}) or []
     opts = {f'#{t["id"]} {t["title"]} [{t["status"]}]': t["id"] for t in tasks}
     sel_id = None
     if mode != "Add" and opts:
@@ -267,32 +260,28 @@ elif page == "Tasks":
 
     if st.button("Execute", key="task_exec"):
         if mode == "Add":
-            api_post("/tasks", payload)
+            client.post("/tasks", payload)
         elif mode == "Update":
             if sel_id:
-                api_put(f"/tasks/{sel_id}", payload)
+                client.put(f"/tasks/{sel_id}", payload)
         else:
             if sel_id:
-                api_delete(f"/tasks/{sel_id}")
+                client.delete(f"/tasks/{sel_id}")
 
 elif page == "Activities":
     st.subheader("List")
     q = st.text_input("Search activity", "")
     days = st.number_input("Lookback days", min_value=1, max_value=3650, value=30, step=10)
 
-    data = api_get("/activities", params={"q": q, "days": int(days)})
-    df = to_df(data)
-    st.dataframe(df, use_container_width=True)
-    if not df.empty:
-        st.download_button("Download CSV", df.to_csv(index=False).encode("utf-8"), "activities.csv", "text/csv")
+    activities, _ = paged_table("activities", {"q": q, "days": int(days)}, ["activity_date", "activity_type", "subject", "created_at"])
 
     st.divider()
     st.subheader("Add / Delete")
     mode = st.radio("Mode", ["Add", "Delete"], horizontal=True, key="act_mode")
 
     sel_id = None
-    if mode == "Delete" and not df.empty:
-        opts = {f'#{r["id"]} {r["activity_date"]} {r["activity_type"]} {r.get("subject","") or ""}': r["id"] for _, r in df.head(500).iterrows()}
+    if mode == "Delete" and activities:
+        opts = {f'#{r["id"]} {r["activity_date"]} {r["activity_type"]} {r.get("subject","") or ""}': r["id"] for r in activities}
         sel_label = st.selectbox("Select activity", list(opts.keys()))
         sel_id = opts[sel_label]
 
@@ -305,7 +294,7 @@ elif page == "Activities":
 
     if st.button("Execute", key="act_exec"):
         if mode == "Add":
-            api_post("/activities", payload)
+            client.post("/activities", payload)
         else:
             if sel_id:
-                api_delete(f"/activities/{sel_id}")
+                client.delete(f"/activities/{sel_id}")
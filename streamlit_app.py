@@ -3,6 +3,13 @@
 # (No backend API, all logic will be local or in this file)
 
 
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
 import streamlit as st
 import copy
 from datetime import date, datetime
@@ -18,155 +25,208 @@ class DummyResponse:
     def json(self):
         return self._data
 
+# ── Local store ──
+STORE_PATH = os.getenv("SALES_TREE_DB", "sales_tree_local.sqlite3")
+KINDS = ["companies", "contacts", "deals", "activities", "items", "quotes", "pos", "pricelists", "emails"]
+ENDPOINT_KINDS = {
+    "/companies": "companies", "/contacts": "contacts", "/deals": "deals", "/activities": "activities",
+    "/items": "items", "/quotes": "quotes", "/purchase-orders": "pos", "/pricelists": "pricelists",
+}
+
+class LocalStore:
+    """Every entity in a dict per kind keyed by id, written through to SQLite.
+
+    Ids come from a per-kind counter (never reused), so allocating one and
+    looking a row up are O(1). One instance per server process, shared by all
+    browser sessions; the SQLite file keeps the data across restarts.
+    """
+
+    def __init__(self, path):
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS records (kind TEXT, id INTEGER, data TEXT NOT NULL, PRIMARY KEY (kind, id))")
+        self._db.execute("CREATE TABLE IF NOT EXISTS counters (kind TEXT PRIMARY KEY, last_id INTEGER NOT NULL)")
+        self._rows = {k: {} for k in KINDS}
+        self._last = dict.fromkeys(KINDS, 0)
+        for kind, id_, data in self._db.execute("SELECT kind, id, data FROM records ORDER BY kind, id"):
+            self._rows.setdefault(kind, {})[id_] = json.loads(data)
+        for kind, last in self._db.execute("SELECT kind, last_id FROM counters"):
+            self._last[kind] = last
+
+    def all(self, kind):
+        with self._lock:
+            return list(self._rows[kind].values())
+
+    def get(self, kind, id_):
+        return self._rows[kind].get(id_)
+
+    def insert(self, kind, row):
+        with self._lock:
+            id_ = self._last[kind] + 1
+            row = {**row, "id": id_}
+            with self._db:
+                self._db.execute("BEGIN")
+                self._db.execute("INSERT OR REPLACE INTO counters (kind, last_id) VALUES (?, ?)", (kind, id_))
+                self._db.execute("INSERT INTO records (kind, id, data) VALUES (?, ?, ?)", (kind, id_, json.dumps(row, default=str)))
+            self._last[kind] = id_
+            self._rows[kind][id_] = row
+            return row
+
+    def save(self, kind, row):
+        # rows are updated in place; this persists the change
+        with self._lock:
+            self._db.execute("UPDATE records SET data = ? WHERE kind = ? AND id = ?", (json.dumps(row, default=str), kind, row["id"]))
+
+    def delete(self, kind, id_):
+        with self._lock:
+            if self._rows[kind].pop(id_, None) is None:
+                return False
+            self._db.execute("DELETE FROM records WHERE kind = ? AND id = ?", (kind, id_))
+            return True
+
+@st.cache_resource
+def store():
+    return LocalStore(STORE_PATH)
+
+# ── Deal scoring ──
+# Win probabilities are computed by a background thread and stored on the deal;
+# pages only read them, so reruns never evaluate the model.
+SCORE_INTERVAL = 30  # seconds between scoring passes
+WIN_THRESHOLD = 0.5
+
+def score_deals(db):
+    """Score deals whose inputs changed since their stored score, in one model call.
+
+    Notifies once when a deal's predicted outcome turns into a win.
+    """
+    from app.services.deal_ml import stage_index, win_probabilities
+    from app.services.mailer import send_prediction_email
+
+    names = {c["id"]: c.get("name") or "" for c in db.all("companies")}
+    stale = []
+    for d in db.all("deals"):
+        inputs = [d.get("value") or 0, d.get("stage"), d.get("company_id")]
+        if d.get("scored_inputs") != inputs:
+            stale.append((d, inputs))
+    if not stale:
+        return 0
+    probs = win_probabilities([
+        {"amount": float(value), "stage": stage_index(stage), "company_size": names.get(company_id, "").count(" ") + 1}
+        for _, (value, stage, company_id) in stale
+    ])
+    now = datetime.now().isoformat(timespec="seconds")
+    for (d, inputs), p in zip(stale, probs):
+        old = d.get("win_probability")
+        d.update(win_probability=p, scored_at=now, scored_inputs=inputs)
+        db.save("deals", d)
+        if p >= WIN_THRESHOLD and (old is None or old < WIN_THRESHOLD):
+            send_prediction_email(d["id"], 1)
+    return len(stale)
+
+@st.cache_resource
+def start_scorer(_db):
+    def loop():
+        while True:
+            try:
+                score_deals(_db)
+            except Exception:
+                logging.getLogger(__name__).exception("deal scoring pass failed")
+            time.sleep(SCORE_INTERVAL)
+    t = threading.Thread(target=loop, name="deal-scorer", daemon=True)
+    t.start()
+    return t
+
 def api_post(endpoint, payload):
-    # Simulate POST: add to session state
-    if endpoint == "/companies":
-        companies = st.session_state.companies
-        new_id = max([c.get("id", 0) for c in companies] or [0]) + 1
-        payload = dict(payload)
-        payload["id"] = new_id
-        companies.append(payload)
-        return DummyResponse(payload)
-    if endpoint == "/contacts":
-        contacts = st.session_state.contacts
-        new_id = max([c.get("id", 0) for c in contacts] or [0]) + 1
-        payload = dict(payload)
-        payload["id"] = new_id
-        contacts.append(payload)
-        return DummyResponse(payload)
-    if endpoint == "/deals":
-        deals = st.session_state.deals
-        new_id = max([d.get("id", 0) for d in deals] or [0]) + 1
-        payload = dict(payload)
-        payload["id"] = new_id
-        deals.append(payload)
-        return DummyResponse(payload)
-    if endpoint == "/activities":
-        activities = st.session_state.activities
-        new_id = max([a.get("id", 0) for a in activities] or [0]) + 1
-        payload = dict(payload)
-        payload["id"] = new_id
-        activities.append(payload)
-        return DummyResponse(payload)
-    if endpoint == "/items":
-        items = st.session_state.pos
-        new_id = max([i.get("id", 0) for i in items] or [0]) + 1
-        payload = dict(payload)
-        payload["id"] = new_id
-        items.append(payload)
-        return DummyResponse(payload)
-    if endpoint == "/quotes":
-        quotes = st.session_state.quotes
-        new_id = max([q.get("id", 0) for q in quotes] or [0]) + 1
-        payload = dict(payload)
-        payload["id"] = new_id
-        quotes.append(payload)
-        return DummyResponse(payload)
-    if endpoint == "/purchase-orders":
-        pos = st.session_state.pos
-        new_id = max([p.get("id", 0) for p in pos] or [0]) + 1
-        payload = dict(payload)
-        payload["id"] = new_id
-        pos.append(payload)
-        return DummyResponse(payload)
-    if endpoint == "/pricelists":
-        if "pricelists" not in st.session_state:
-            st.session_state.pricelists = []
-        pls = st.session_state.pricelists
-        new_id = max([p.get("id", 0) for p in pls] or [0]) + 1
+    # Simulate POST: add to the local store
+    if endpoint in ENDPOINT_KINDS:
         payload = dict(payload)
-        payload["id"] = new_id
-        payload["lines"] = []
-        pls.append(payload)
-        return DummyResponse(payload)
+        if endpoint == "/pricelists":
+            payload["lines"] = []
+        return DummyResponse(store().insert(ENDPOINT_KINDS[endpoint], payload))
     if endpoint == "/emails/send":
-        if "emails" not in st.session_state:
-            st.session_state.emails = []
-        emails = st.session_state.emails
-        new_id = max([e.get("id", 0) for e in emails] or [0]) + 1
-        payload = dict(payload)
-        payload["id"] = new_id
-        payload["direction"] = "out"
-        emails.append(payload)
-        return DummyResponse(payload)
+        return DummyResponse(store().insert("emails", {**payload, "direction": "out"}))
     return DummyResponse({}, 404, "Not implemented")
 
+def _page(rows, params):
+    # List endpoints filter, sort and page before returning:
+    # q (substring of any text field), stage, sort ("field" or "-field"), offset, limit
+    if not params or "limit" not in params:
+        return rows
+    q = (params.get("q") or "").strip().lower()
+    if q:
+        rows = [r for r in rows if any(isinstance(v, str) and q in v.lower() for v in r.values())]
+    if params.get("stage"):
+        rows = [r for r in rows if r.get("stage") == params["stage"]]
+    sort = params.get("sort")
+    if sort:
+        field = sort.lstrip("-")
+        rows = sorted(rows, key=lambda r: (r.get(field) is None, r.get(field) if r.get(field) is not None else 0),
+                      reverse=sort.startswith("-"))
+    offset = int(params.get("offset") or 0)
+    return rows[offset:offset + int(params["limit"])]
+
 def api_get(endpoint, params=None):
-    # Simulate GET: fetch from session state
+    # Simulate GET: read from the local store
     if endpoint == "/companies":
-        companies = st.session_state.companies
+        companies = store().all("companies")
         if params:
             if params.get("is_customer"):
                 companies = [c for c in companies if c.get("is_customer")]
             if params.get("is_supplier"):
                 companies = [c for c in companies if c.get("is_supplier")]
         return DummyResponse(companies)
-    if endpoint == "/contacts":
-        return DummyResponse(st.session_state.contacts)
-    if endpoint == "/deals":
-        return DummyResponse(st.session_state.deals)
-    if endpoint == "/activities":
-        return DummyResponse(st.session_state.activities)
-    if endpoint == "/items":
-        return DummyResponse(st.session_state.pos)
-    if endpoint == "/quotes":
-        return DummyResponse(st.session_state.quotes)
-    if endpoint == "/purchase-orders":
-        return DummyResponse(st.session_state.pos)
-    if endpoint == "/pricelists":
-        return DummyResponse(getattr(st.session_state, "pricelists", []))
+    if endpoint in ("/deals", "/quotes"):
+        return DummyResponse(_page(store().all(ENDPOINT_KINDS[endpoint]), params))
+    if endpoint in ENDPOINT_KINDS:
+        return DummyResponse(store().all(ENDPOINT_KINDS[endpoint]))
     if endpoint == "/emails":
-        return DummyResponse(getattr(st.session_state, "emails", []))
+        return DummyResponse(store().all("emails"))
     if endpoint.startswith("/pricelists/") and endpoint.endswith("/lines"):
-        pl_id = int(endpoint.split("/")[2])
-        pls = getattr(st.session_state, "pricelists", [])
-        for pl in pls:
-            if pl["id"] == pl_id:
-                return DummyResponse(pl.get("lines", []))
-        return DummyResponse([])
+        pl = store().get("pricelists", int(endpoint.split("/")[2]))
+        return DummyResponse(pl.get("lines", []) if pl else [])
     return DummyResponse({}, 404, "Not implemented")
 
 def api_delete(endpoint):
-    # Simulate DELETE: remove from session state
-    if endpoint.startswith("/companies/"):
-        cid = int(endpoint.split("/")[2])
-        st.session_state.companies = [c for c in st.session_state.companies if c["id"] != cid]
-        return DummyResponse({}, 200)
-    if endpoint.startswith("/contacts/"):
-        cid = int(endpoint.split("/")[2])
-        st.session_state.contacts = [c for c in st.session_state.contacts if c["id"] != cid]
-        return DummyResponse({}, 200)
-    if endpoint.startswith("/deals/"):
-        did = int(endpoint.split("/")[2])
-        st.session_state.deals = [d for d in st.session_state.deals if d["id"] != did]
-        return DummyResponse({}, 200)
-    if endpoint.startswith("/items/"):
-        iid = int(endpoint.split("/")[2])
-        st.session_state.pos = [i for i in st.session_state.pos if i["id"] != iid]
-        return DummyResponse({}, 200)
-    if endpoint.startswith("/pricelists/"):
-        plid = int(endpoint.split("/")[2])
-        pls = getattr(st.session_state, "pricelists", [])
-        st.session_state.pricelists = [pl for pl in pls if pl["id"] != plid]
-        return DummyResponse({}, 200)
+    # Simulate DELETE: remove from the local store
+    kind = ENDPOINT_KINDS.get("/" + endpoint.split("/")[1])
+    if kind in ("companies", "contacts", "deals", "items", "pricelists"):
+        if store().delete(kind, int(endpoint.split("/")[2])):
+            return DummyResponse({}, 200)
+        return DummyResponse({}, 404, "Not found")
     return DummyResponse({}, 404, "Not implemented")
 
 def api_patch(endpoint, payload=None):
-    # Simulate PATCH: update in session state
-    if endpoint.startswith("/deals/") and endpoint.endswith("/stage"):
-        did = int(endpoint.split("/")[2])
-        for d in st.session_state.deals:
-            if d["id"] == did:
+    # Simulate PATCH: update in the local store
+    db = store()
+    if endpoint == "/deals/stage:bulk":
+        moved = 0
+        for did in set(payload["deal_ids"]):
+            d = db.get("deals", did)
+            if d is not None and d.get("stage") != payload["stage"]:
                 d["stage"] = payload["stage"]
-                return DummyResponse(d)
-        return DummyResponse({}, 404, "Not found")
+                db.save("deals", d)
+                moved += 1
+        pipeline = {}
+        for d in db.all("deals"):
+            p = pipeline.setdefault(d.get("stage"), {"stage": d.get("stage"), "count": 0, "value": 0.0})
+            p["count"] += 1
+            p["value"] += d.get("value") or 0
+        return DummyResponse({"moved": moved, "pipeline": list(pipeline.values())})
+    if endpoint.startswith("/deals/") and endpoint.endswith("/stage"):
+        d = db.get("deals", int(endpoint.split("/")[2]))
+        if d is None:
+            return DummyResponse({}, 404, "Not found")
+        d["stage"] = payload["stage"]
+        db.save("deals", d)
+        return DummyResponse(d)
     if endpoint.startswith("/activities/") and endpoint.endswith("/complete"):
-        aid = int(endpoint.split("/")[2])
-        for a in st.session_state.activities:
-            if a["id"] == aid:
-                a["completed_at"] = datetime.now().isoformat()
-                return DummyResponse(a)
-        return DummyResponse({}, 404, "Not found")
+        a = db.get("activities", int(endpoint.split("/")[2]))
+        if a is None:
+            return DummyResponse({}, 404, "Not found")
+        a["completed_at"] = datetime.now().isoformat()
+        db.save("activities", a)
+        return DummyResponse(a)
     return DummyResponse({}, 404, "Not implemented")
 
 def api_headers():
@@ -232,23 +292,43 @@ if "user_email" not in st.session_state:
 
 
 
-if "companies" not in st.session_state:
-    st.session_state.companies = []
-if "contacts" not in st.session_state:
-    st.session_state.contacts = []
-if "deals" not in st.session_state:
-    st.session_state.deals = []
-if "activities" not in st.session_state:
-    st.session_state.activities = []
-if "quotes" not in st.session_state:
-    st.session_state.quotes = []
-if "pos" not in st.session_state:
-    st.session_state.pos = []
+def auth_screen():
+    pass  # Login/registration removed; app is fully local now.
 
 
+PAGE_SIZE = 25
+BOARD_CARDS = 10  # deals shown per pipeline column; the rest are counted
 
-def auth_screen():
-    pass  # Login/registration removed; app is fully local now.
+
+def _turn(key, step):
+    st.session_state[f"{key}_page"] += step
+
+
+def paged(key, endpoint, params, sort_fields):
+    """One page of *endpoint* with sort and prev/next controls; returns the page rows.
+
+    Only PAGE_SIZE rows are fetched and rendered, whatever the list size.
+    """
+    sort = st.selectbox("Sort by", sort_fields, key=f"{key}_sort",
+                        format_func=lambda f: f"{f.lstrip('-')} {'↓' if f.startswith('-') else '↑'}")
+    # a new filter or sort starts over at the first page
+    view = repr((sorted(params.items()), sort))
+    if st.session_state.get(f"{key}_view") != view:
+        st.session_state[f"{key}_view"] = view
+        st.session_state[f"{key}_page"] = 0
+    page = st.session_state[f"{key}_page"]
+
+    # one extra row tells whether there is a next page
+    r = api_get(endpoint, {**params, "sort": sort, "offset": page * PAGE_SIZE, "limit": PAGE_SIZE + 1})
+    rows = r.json() if r and r.status_code == 200 else []
+    has_next = len(rows) > PAGE_SIZE
+    rows = rows[:PAGE_SIZE]
+
+    p1, p2, p3 = st.columns([1, 1, 4])
+    p1.button("‹ Prev", key=f"{key}_prev", disabled=page == 0, on_click=_turn, args=(key, -1))
+    p2.button("Next ›", key=f"{key}_next", disabled=not has_next, on_click=_turn, args=(key, 1))
+    p3.caption(f"Page {page + 1}")
+    return rows
 
 
 # ══════════════════════════════════════════════════════════════
@@ -257,12 +337,13 @@ def auth_screen():
 def page_dashboard():
     st.markdown("## 📊 Dashboard")
 
-    companies = st.session_state.companies
-    contacts = st.session_state.contacts
-    deals = st.session_state.deals
-    activities = st.session_state.activities
-    quotes = st.session_state.quotes
-    pos = st.session_state.pos
+    db = store()
+    companies = db.all("companies")
+    contacts = db.all("contacts")
+    deals = db.all("deals")
+    activities = db.all("activities")
+    quotes = db.all("quotes")
+    pos = db.all("pos")
 
     c1, c2, c3, c4, c5, c6 = st.columns(6)
     with c1:
@@ -503,6 +584,26 @@ def page_deals():
         if not deals:
             st.info("No deals yet.")
         else:
+            # the board shows the largest deals of each stage; the List tab pages through all
+            board = {
+                stage: sorted((d for d in deals if d.get("stage") == stage),
+                              key=lambda d: d.get("value") or 0, reverse=True)[:BOARD_CARDS]
+                for stage in STAGES
+            }
+            board_titles = {d["id"]: d["title"] for cards in board.values() for d in cards}
+            with st.form("bulk_move_deals"):
+                bc1, bc2 = st.columns([3, 1])
+                with bc1:
+                    bulk_ids = st.multiselect(
+                        "Deals", list(board_titles),
+                        format_func=lambda i: board_titles[i],
+                    )
+                with bc2:
+                    bulk_stage = st.selectbox("Move selected to", STAGES)
+                if st.form_submit_button("Move") and bulk_ids:
+                    pr = api_patch("/deals/stage:bulk", {"deal_ids": bulk_ids, "stage": bulk_stage})
+                    if pr and pr.status_code == 200:
+                        st.rerun()
             cols = st.columns(len(STAGES))
             for i, stage in enumerate(STAGES):
                 with cols[i]:
@@ -511,7 +612,7 @@ def page_deals():
                     st.markdown(f"### {stage.upper()}")
                     st.caption(f"{len(stage_deals)} deals · €{total:,.0f}")
                     st.markdown("---")
-                    for d in stage_deals:
+                    for d in board[stage]:
                         co_name = co_map.get(d.get("company_id"), "")
                         st.markdown(f"**{d['title']}**")
                         st.caption(f"{co_name} · €{d.get('value') or 0:,.0f}")
@@ -522,33 +623,29 @@ def page_deals():
                             if pr and pr.status_code == 200:
                                 st.rerun()
                         st.markdown("---")
+                    if len(stage_deals) > BOARD_CARDS:
+                        st.caption(f"+{len(stage_deals) - BOARD_CARDS} more in the List tab")
 
     with tab_list:
         if not deals:
             st.info("No deals yet.")
         else:
-            from app.services.deal_ml import predict_deal
-            from app.services.mailer import send_prediction_email
-            for d in deals:
+            lc1, lc2 = st.columns(2)
+            list_q = lc1.text_input("Search deals", key="deals_q")
+            list_stage = lc2.selectbox("Stage", ["all", *STAGES], key="deals_stage")
+            params = {"q": list_q}
+            if list_stage != "all":
+                params["stage"] = list_stage
+            for d in paged("deals", "/deals", params, ["-id", "id", "title", "-title", "-value", "value", "stage", "-win_probability"]):
                 co_name = co_map.get(d.get("company_id"), "—")
                 with st.expander(f"**{d['title']}** — {d['stage'].upper()} · €{d.get('value') or 0:,.0f} · {co_name}"):
                     st.write(f"Expected close: {d.get('expected_close', '-')}")
                     st.write(f"Notes: {d.get('notes', '-')}")
-                    # ML prediction
-                    try:
-                        pred = predict_deal(
-                            d.get("value", 0),
-                            PIPELINE_STAGES.index(d.get("stage", "Lead")) if d.get("stage", "Lead") in PIPELINE_STAGES else 0,
-                            co_name.count(" ")+1,
-                            2,
-                            10,
-                            5
-                        )
-                        st.write(f"ML Prediction: {pred}")
-                        if pred == 1:
-                            send_prediction_email(d.get("id", 0), pred)
-                    except Exception as e:
-                        st.write("ML Prediction: N/A")
+                    # stored by the background scorer
+                    if d.get("win_probability") is not None:
+                        st.write(f"Win probability: {d['win_probability']:.0%} (scored {d['scored_at']})")
+                    else:
+                        st.write("Win probability: not scored yet")
                     if st.button("🗑️ Delete", key=f"del_deal_{d['id']}"):
                         dr = api_delete(f"/deals/{d['id']}")
                         if dr and dr.status_code == 200:
@@ -739,29 +836,29 @@ def page_quotes():
                             st.error(r.text)
 
     with tab_list:
-        r = api_get("/quotes")
-        if r and r.status_code == 200:
-            quotes = r.json()
-            co_map = {c["id"]: c["name"] for c in customers}
-            if not quotes:
-                st.info("No quotes yet.")
-            else:
-                for q in quotes:
-                    co_name = co_map.get(q.get("customer_id"), "—")
-                    with st.expander(f"**{q['quote_number']}** — {co_name} · {q['quote_date']} · {q.get('status', 'draft')}"):
-                        st.write(f"Currency: {q['currency']} | Notes: {q.get('notes', '-')}")
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            if st.button("📥 Download PDF", key=f"pdf_q_{q['id']}"):
-                                pdf_r = requests.get(f"{API}/quotes/{q['id']}/pdf",
-                                                     headers=api_headers(), timeout=30)
-                                if pdf_r.status_code == 200:
-                                    st.download_button("💾 Save PDF", pdf_r.content,
-                                                       f"Quote_{q['quote_number']}.pdf",
-                                                       mime="application/pdf",
-                                                       key=f"dl_q_{q['id']}")
-                                else:
-                                    st.error("PDF generation failed")
+        list_q = st.text_input("Search quotes", key="quotes_q")
+        co_map = {c["id"]: c["name"] for c in customers}
+        quotes = paged("quotes", "/quotes", {"q": list_q},
+                       ["-quote_date", "quote_date", "quote_number", "-quote_number", "status"])
+        if not quotes:
+            st.info("No matching quotes." if list_q else "No quotes yet.")
+        else:
+            for q in quotes:
+                co_name = co_map.get(q.get("customer_id"), "—")
+                with st.expander(f"**{q['quote_number']}** — {co_name} · {q['quote_date']} · {q.get('status', 'draft')}"):
+                    st.write(f"Currency: {q['currency']} | Notes: {q.get('notes', '-')}")
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        if st.button("📥 Download PDF", key=f"pdf_q_{q['id']}"):
+                            pdf_r = requests.get(f"{API}/quotes/{q['id']}/pdf",
+                                                 headers=api_headers(), timeout=30)
+                            if pdf_r.status_code == 200:
+                                st.download_button("💾 Save PDF", pdf_r.content,
+                                                   f"Quote_{q['quote_number']}.pdf",
+                                                   mime="application/pdf",
+                                                   key=f"dl_q_{q['id']}")
+                            else:
+                                st.error("PDF generation failed")
 
 
 # ══════════════════════════════════════════════════════════════
@@ -942,6 +1039,8 @@ def page_emails():
 # ══════════════════════════════════════════════════════════════
 # MAIN APP
 # ══════════════════════════════════════════════════════════════
+start_scorer(store())
+
 if st.session_state.token is None:
     auth_screen()
 else: